@@ -0,0 +1,37 @@
+"""Add the (created_at, id) index used by keyset pagination
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0001"
+down_revision: str | None = None
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Build without blocking writes on large tables
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_expenses_created_at_id",
+            "expenses",
+            ["created_at", "id"],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_expenses_created_at_id",
+            table_name="expenses",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,54 @@
+"""Add composite indexes for filtered and sorted expense listings
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0002"
+down_revision: str | None = "0001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+INDEXES = {
+    "ix_expenses_expense_date_id": ["expense_date", "id"],
+    "ix_expenses_amount_id": ["amount", "id"],
+    "ix_expenses_category_created_at_id": ["category", "created_at", "id"],
+    "ix_expenses_category_expense_date_id": ["category", "expense_date", "id"],
+    "ix_expenses_category_amount_id": ["category", "amount", "id"],
+}
+
+
+def upgrade() -> None:
+    is_postgresql = op.get_bind().dialect.name == "postgresql"
+    # Build without blocking writes on large tables
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.create_index(
+                name, "expenses", columns, if_not_exists=True, postgresql_concurrently=True
+            )
+        if is_postgresql:
+            op.create_index(
+                "ix_expenses_title_pattern",
+                "expenses",
+                ["title"],
+                if_not_exists=True,
+                postgresql_concurrently=True,
+                postgresql_ops={"title": "text_pattern_ops"},
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_expenses_title_pattern",
+            table_name="expenses",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
+        for name in INDEXES:
+            op.drop_index(name, table_name="expenses", if_exists=True, postgresql_concurrently=True)
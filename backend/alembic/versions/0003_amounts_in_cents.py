@@ -0,0 +1,116 @@
+"""Store expense amounts and rollup totals as integer cents
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import context, op
+from app.money import to_cents
+
+revision: str = "0003"
+down_revision: str | None = "0002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Rows converted per statement on SQLite
+BATCH_SIZE = 10_000
+
+# (table, column) pairs holding money amounts
+COLUMNS = [
+    ("expenses", "amount"),
+    ("expense_category_rollups", "total"),
+    ("expense_monthly_rollups", "total"),
+]
+
+
+def _columns_of_type(type_: type[sa.types.TypeEngine]) -> list[tuple[str, str]]:
+    """
+    The money columns currently declared with ``type_`` (startup may have
+    converted them). Rollup tables that do not exist yet are skipped; they
+    are created with cents columns by a later revision.
+    """
+    if context.is_offline_mode():
+        # No database to inspect when only emitting SQL
+        return list(COLUMNS)
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    found = []
+    for table, column in COLUMNS:
+        if table not in tables:
+            continue
+        types = {info["name"]: info["type"] for info in inspector.get_columns(table)}
+        if isinstance(types[column], type_):
+            found.append((table, column))
+    return found
+
+
+def _convert_in_python(table: str, column: str) -> None:
+    """
+    Convert ``column`` to cents with ``to_cents``, as the app and PostgreSQL's
+    numeric path round, rather than SQLite's binary ROUND (1.005 -> 100).
+    """
+    bind = op.get_bind()
+    last = -1
+    while True:
+        rows = bind.execute(
+            sa.text(
+                f"SELECT rowid, {column} FROM {table} WHERE rowid > :last ORDER BY rowid LIMIT :n"
+            ),
+            {"last": last, "n": BATCH_SIZE},
+        ).all()
+        if not rows:
+            return
+        bind.execute(
+            sa.text(f"UPDATE {table} SET {column} = :cents WHERE rowid = :rowid"),
+            [
+                {"rowid": rowid, "cents": None if amount is None else to_cents(amount)}
+                for rowid, amount in rows
+            ],
+        )
+        last = rows[-1][0]
+
+
+def upgrade() -> None:
+    # Tables created by startup on this version already hold integer cents
+    columns = _columns_of_type(sa.Float)
+    if op.get_bind().dialect.name == "postgresql":
+        for table, column in columns:
+            # Via numeric so half-cents round away from zero on the decimal value
+            op.alter_column(
+                table,
+                column,
+                type_=sa.BigInteger(),
+                postgresql_using=f"round({column}::numeric * 100)::bigint",
+            )
+        return
+
+    if context.is_offline_mode():
+        raise RuntimeError("SQLite amounts are converted in Python; run this revision online")
+    # SQLite cannot change a column type in place; batch mode rebuilds the table
+    for table, column in columns:
+        _convert_in_python(table, column)
+        with op.batch_alter_table(table) as batch:
+            batch.alter_column(column, type_=sa.BigInteger(), existing_nullable=False)
+
+
+def downgrade() -> None:
+    columns = _columns_of_type(sa.Integer)
+    if op.get_bind().dialect.name == "postgresql":
+        for table, column in columns:
+            op.alter_column(
+                table,
+                column,
+                type_=sa.Float(),
+                postgresql_using=f"{column} / 100.0",
+            )
+        return
+
+    for table, column in columns:
+        with op.batch_alter_table(table) as batch:
+            batch.alter_column(column, type_=sa.Float(), existing_nullable=False)
+        op.execute(f"UPDATE {table} SET {column} = {column} / 100.0")
@@ -0,0 +1,101 @@
+"""Add recurring expense rules and link materialized expenses to them
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import context, op
+from app.money import Cents
+
+revision: str = "0004"
+down_revision: str | None = "0003"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+CATEGORIES = (
+    "FOOD",
+    "TRANSPORT",
+    "ENTERTAINMENT",
+    "SHOPPING",
+    "BILLS",
+    "HEALTH",
+    "EDUCATION",
+    "OTHER",
+)
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+
+
+def _existing(table: str | None = None) -> set[str]:
+    """Existing table names, or column names of ``table`` (startup may have created them)."""
+    if context.is_offline_mode():
+        return set()
+    inspector = sa.inspect(op.get_bind())
+    if table is None:
+        return set(inspector.get_table_names())
+    return {column["name"] for column in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    if "recurring_expenses" not in _existing():
+        op.create_table(
+            "recurring_expenses",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("title", sa.String(), nullable=False),
+            sa.Column("amount", Cents(), nullable=False),
+            # The expenses table already created this enum type on PostgreSQL
+            sa.Column(
+                "category",
+                postgresql.ENUM(*CATEGORIES, name="expensecategory", create_type=False),
+                nullable=False,
+            ),
+            sa.Column("description", sa.String(), nullable=True),
+            sa.Column(
+                "frequency", sa.Enum(*FREQUENCIES, name="recurrencefrequency"), nullable=False
+            ),
+            sa.Column("interval", sa.Integer(), nullable=False),
+            sa.Column("start_date", sa.Date(), nullable=False),
+            sa.Column("end_date", sa.Date(), nullable=True),
+            sa.Column("count", sa.Integer(), nullable=True),
+            sa.Column("next_index", sa.Integer(), nullable=False),
+            sa.Column("next_date", sa.Date(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+        op.create_index("ix_recurring_expenses_id", "recurring_expenses", ["id"])
+        op.create_index("ix_recurring_expenses_next_date", "recurring_expenses", ["next_date"])
+
+    if "recurring_expense_id" not in _existing("expenses"):
+        # Batch mode, as SQLite cannot add a foreign key to an existing table in place
+        with op.batch_alter_table("expenses") as batch:
+            batch.add_column(sa.Column("recurring_expense_id", sa.Integer(), nullable=True))
+            batch.create_foreign_key(
+                "fk_expenses_recurring_expense_id",
+                "recurring_expenses",
+                ["recurring_expense_id"],
+                ["id"],
+                ondelete="SET NULL",
+            )
+    op.create_index(
+        "uq_expenses_recurring_expense_id_expense_date",
+        "expenses",
+        ["recurring_expense_id", "expense_date"],
+        unique=True,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "uq_expenses_recurring_expense_id_expense_date", table_name="expenses", if_exists=True
+    )
+    with op.batch_alter_table("expenses") as batch:
+        batch.drop_constraint("fk_expenses_recurring_expense_id", type_="foreignkey")
+        batch.drop_column("recurring_expense_id")
+    op.drop_table("recurring_expenses")
+    if op.get_context().dialect.name == "postgresql":
+        op.execute("DROP TYPE IF EXISTS recurrencefrequency")
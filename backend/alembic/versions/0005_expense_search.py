@@ -0,0 +1,56 @@
+"""Add full-text search over expense titles and descriptions
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+from app.models import POSTGRESQL_SEARCH_DDL, SQLITE_SEARCH_DDL
+
+revision: str = "0005"
+down_revision: str | None = "0004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        add_column, _ = POSTGRESQL_SEARCH_DDL
+        # Computing the stored column rewrites the table once
+        op.execute(add_column)
+        # Build without blocking writes on large tables
+        with op.get_context().autocommit_block():
+            op.create_index(
+                "ix_expenses_search_vector",
+                "expenses",
+                ["search_vector"],
+                if_not_exists=True,
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+            )
+        return
+
+    for statement in SQLITE_SEARCH_DDL:
+        op.execute(statement)
+    # Index the rows that predate the triggers
+    op.execute("INSERT INTO expenses_fts (expenses_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.drop_index(
+                "ix_expenses_search_vector",
+                table_name="expenses",
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
+        op.execute("ALTER TABLE expenses DROP COLUMN IF EXISTS search_vector")
+        return
+
+    for trigger in ("expenses_fts_insert", "expenses_fts_delete", "expenses_fts_update"):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS expenses_fts")
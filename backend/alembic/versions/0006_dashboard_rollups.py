@@ -0,0 +1,89 @@
+"""Add the dashboard rollup and data version tables, filled from existing expenses
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import context, op
+from app import rollups
+
+revision: str = "0006"
+down_revision: str | None = "0005"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+CATEGORIES = (
+    "FOOD",
+    "TRANSPORT",
+    "ENTERTAINMENT",
+    "SHOPPING",
+    "BILLS",
+    "HEALTH",
+    "EDUCATION",
+    "OTHER",
+)
+
+
+def _existing() -> set[str]:
+    """Existing table names (startup may have created the tables, empty)."""
+    if context.is_offline_mode():
+        return set()
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _category() -> sa.Column:
+    # The expenses table already created this enum type on PostgreSQL
+    return sa.Column(
+        "category",
+        postgresql.ENUM(*CATEGORIES, name="expensecategory", create_type=False),
+        primary_key=True,
+    )
+
+
+def upgrade() -> None:
+    existing = _existing()
+    if "expense_category_rollups" not in existing:
+        op.create_table(
+            "expense_category_rollups",
+            _category(),
+            sa.Column("total", sa.BigInteger(), nullable=False),
+            sa.Column("count", sa.Integer(), nullable=False),
+        )
+    if "expense_monthly_rollups" not in existing:
+        op.create_table(
+            "expense_monthly_rollups",
+            sa.Column("year", sa.Integer(), primary_key=True),
+            sa.Column("month", sa.Integer(), primary_key=True),
+            _category(),
+            sa.Column("total", sa.BigInteger(), nullable=False),
+            sa.Column("count", sa.Integer(), nullable=False),
+        )
+    if "data_versions" not in existing:
+        op.create_table(
+            "data_versions",
+            sa.Column("name", sa.String(), primary_key=True),
+            sa.Column("version", sa.Integer(), nullable=False),
+        )
+    op.execute(
+        "INSERT INTO data_versions (name, version) SELECT 'expenses', 0 "
+        "WHERE NOT EXISTS (SELECT 1 FROM data_versions WHERE name = 'expenses')"
+    )
+
+    # Fill the rollups from the expenses already there; empty rollups would
+    # make the dashboard report zeros until a manual rebuild
+    for statement in rollups.rebuild_statements(op.get_context().dialect.name):
+        op.execute(statement)
+    # Dashboards tagged before the rebuild are stale
+    op.execute("UPDATE data_versions SET version = version + 1 WHERE name = 'expenses'")
+
+
+def downgrade() -> None:
+    op.drop_table("data_versions", if_exists=True)
+    op.drop_table("expense_monthly_rollups", if_exists=True)
+    op.drop_table("expense_category_rollups", if_exists=True)
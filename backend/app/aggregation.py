@@ -0,0 +1,206 @@
+from datetime import date, timedelta
+from typing import Literal
+
+from sqlalchemy import Date, DateTime, Integer, cast, func, literal_column, tuple_, type_coerce
+from sqlalchemy.orm import Session
+
+from app import models, money, schemas
+
+# Monthly trends cover the last ~6 months
+TREND_WINDOW_DAYS = 180
+
+Granularity = Literal["day", "week", "month", "quarter", "year"]
+
+# Months per bucket for the calendar granularities
+_MONTHS = {"month": 1, "quarter": 3, "year": 12}
+
+
+def _first_of_next_month(day: date) -> date:
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def compute_dashboard_stats(db: Session, today: date | None = None) -> schemas.DashboardStats:
+    """
+    Compute dashboard statistics from the rollup tables.
+
+    Totals and the category breakdown come from one row per category and the
+    monthly trends from one row per (month, category), so the cost is
+    O(categories x months) regardless of how many expenses exist. Only the
+    partial month at the start of the trend window is read from the raw rows,
+    as an index range scan over at most one month of ``expense_date``.
+    """
+    cutoff: date = (today or date.today()) - timedelta(days=TREND_WINDOW_DAYS)
+
+    category_results = (
+        db.query(
+            models.CategoryRollup.category, models.CategoryRollup.total, models.CategoryRollup.count
+        )
+        .filter(models.CategoryRollup.count > 0)
+        .all()
+    )
+    # Totals are summed as integer cents and converted to amounts once at the end
+    category_breakdown: dict[str, float] = {
+        category.value: money.from_cents(total) for category, total, _ in category_results
+    }
+    total_cents = sum(total for _, total, _ in category_results)
+    total_count = sum(count for _, _, count in category_results)
+
+    # Whole months after the cutoff month come straight from the rollups
+    first_full_month = cutoff if cutoff.day == 1 else _first_of_next_month(cutoff)
+    monthly_results = (
+        db.query(
+            models.MonthlyRollup.year,
+            models.MonthlyRollup.month,
+            func.sum(models.MonthlyRollup.total),
+            func.sum(models.MonthlyRollup.count),
+        )
+        .filter(
+            tuple_(models.MonthlyRollup.year, models.MonthlyRollup.month)
+            >= tuple_(first_full_month.year, first_full_month.month),
+        )
+        .group_by(models.MonthlyRollup.year, models.MonthlyRollup.month)
+        .having(func.sum(models.MonthlyRollup.count) > 0)
+        .order_by(models.MonthlyRollup.year, models.MonthlyRollup.month)
+        .all()
+    )
+    monthly_trends: list[schemas.MonthlyTrend] = [
+        schemas.MonthlyTrend(
+            year=year, month=month, total=money.from_cents(int(total)), count=int(count)
+        )
+        for year, month, total, count in monthly_results
+    ]
+
+    # The cutoff month only partially overlaps the window; read it from raw rows
+    if cutoff != first_full_month:
+        partial_total, partial_count = (
+            db.query(func.sum(money.raw(models.Expense.amount)), func.count(models.Expense.id))
+            .filter(
+                models.Expense.expense_date >= cutoff,
+                models.Expense.expense_date < first_full_month,
+            )
+            .one()
+        )
+        if partial_count:
+            monthly_trends.insert(
+                0,
+                schemas.MonthlyTrend(
+                    year=cutoff.year,
+                    month=cutoff.month,
+                    total=money.from_cents(int(partial_total)),
+                    count=partial_count,
+                ),
+            )
+
+    return schemas.DashboardStats(
+        total_expenses=money.from_cents(total_cents),
+        category_breakdown=category_breakdown,
+        monthly_trends=monthly_trends,
+        average_expense=money.from_cents(total_cents) / total_count if total_count else 0.0,
+        total_count=total_count,
+    )
+
+
+def bucket_start(day: date, granularity: Granularity) -> date:
+    """First day of the bucket holding ``day``; weeks start on Monday, as in ``date_trunc``."""
+    if granularity == "day":
+        return day
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    months = _MONTHS[granularity]
+    return date(day.year, (day.month - 1) // months * months + 1, 1)
+
+
+def _month_index(day: date) -> int:
+    return day.year * 12 + day.month - 1
+
+
+def _month_start(index: int) -> date:
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def bucket_count(date_from: date, date_to: date, granularity: Granularity) -> int:
+    """Number of buckets covering ``date_from`` through ``date_to`` (inclusive)."""
+    first, last = bucket_start(date_from, granularity), bucket_start(date_to, granularity)
+    if granularity == "day":
+        return (last - first).days + 1
+    if granularity == "week":
+        return (last - first).days // 7 + 1
+    return (_month_index(last) - _month_index(first)) // _MONTHS[granularity] + 1
+
+
+def _bucket_starts(date_from: date, date_to: date, granularity: Granularity) -> list[date]:
+    first = bucket_start(date_from, granularity)
+    buckets = range(bucket_count(date_from, date_to, granularity))
+    if granularity == "day":
+        return [first + timedelta(days=i) for i in buckets]
+    if granularity == "week":
+        return [first + timedelta(weeks=i) for i in buckets]
+    months = _MONTHS[granularity]
+    return [_month_start(_month_index(first) + months * i) for i in buckets]
+
+
+def _bucket_expression(dialect: str, granularity: Granularity):
+    """SQL for the first day of each expense's bucket, matching ``bucket_start``."""
+    column = models.Expense.expense_date
+    if dialect == "postgresql":
+        # Inlined rather than bound, so GROUP BY matches the selected expression
+        unit = literal_column(f"'{granularity}'")
+        return cast(func.date_trunc(unit, cast(column, DateTime)), Date)
+    # SQLite stores dates as ISO text, which its date() modifiers operate on
+    if granularity == "day":
+        return column
+    if granularity == "week":
+        # Forward to Sunday (or stay on it), then back to that week's Monday
+        truncated = func.date(column, "weekday 0", "-6 days")
+    elif granularity == "quarter":
+        months_into_quarter = (cast(func.strftime("%m", column), Integer) - 1) % 3
+        truncated = func.date(
+            column, "start of month", func.printf("-%d months", months_into_quarter)
+        )
+    else:
+        truncated = func.date(column, f"start of {granularity}")
+    return type_coerce(truncated, Date)
+
+
+def compute_trends(
+    db: Session,
+    granularity: Granularity,
+    date_from: date,
+    date_to: date,
+    categories: list[models.ExpenseCategory],
+) -> schemas.ExpenseTrends:
+    """
+    Expense totals per ``granularity`` bucket between two dates (inclusive).
+
+    The dates become a plain range predicate on ``expense_date`` (rather than
+    expressions over the column), so the rows are found by an index range
+    scan and only then truncated to buckets with ``date_trunc`` (or SQLite's
+    date modifiers). Every bucket in the range is returned, in order, with
+    zero totals where nothing was spent; the first and last buckets only
+    count expenses inside the range.
+    """
+    bucket = _bucket_expression(db.get_bind().dialect.name, granularity).label("bucket")
+    query = (
+        db.query(bucket, func.sum(money.raw(models.Expense.amount)), func.count(models.Expense.id))
+        .filter(
+            models.Expense.expense_date >= date_from,
+            models.Expense.expense_date <= date_to,
+        )
+        .group_by(bucket)
+    )
+    if categories:
+        query = query.filter(models.Expense.category.in_(categories))
+    totals = {start: (int(total), count) for start, total, count in query.all()}
+
+    buckets = []
+    for start in _bucket_starts(date_from, date_to, granularity):
+        total, count = totals.get(start, (0, 0))
+        buckets.append(schemas.TrendBucket(start=start, total=money.from_cents(total), count=count))
+
+    return schemas.ExpenseTrends(
+        granularity=granularity,
+        date_from=date_from,
+        date_to=date_to,
+        categories=categories,
+        buckets=buckets,
+    )
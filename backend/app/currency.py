@@ -0,0 +1,78 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from app import schemas
+
+
+@dataclass(frozen=True)
+class RateSnapshot:
+    """
+    One upstream rate table, held in memory and used for every currency pair.
+
+    ``rates`` maps currency code to units per one unit of ``base``. Any pair is
+    derived by triangulating through the base: rate(A->B) = rate(base->B) /
+    rate(base->A), so a single upstream fetch serves all conversions.
+    """
+
+    base: str
+    date: str | None
+    rates: dict[str, float]
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any], base: str) -> "RateSnapshot":
+        """Build a snapshot from an upstream response; raises ValueError on bad rates."""
+        base = str(payload.get("base") or base).upper()
+        rates = {code.upper(): float(rate) for code, rate in payload.get("rates", {}).items()}
+        rates[base] = 1.0
+        if any(rate <= 0 for rate in rates.values()):
+            raise ValueError("exchange rates must be positive")
+        return cls(base=base, date=payload.get("date"), rates=rates)
+
+    def __contains__(self, currency: str) -> bool:
+        return currency.upper() in self.rates
+
+    def rate(self, from_currency: str, to_currency: str) -> float:
+        """Units of ``to_currency`` per one ``from_currency``; KeyError if either is unknown."""
+        return self.rates[to_currency.upper()] / self.rates[from_currency.upper()]
+
+    def table(self, base: str) -> dict[str, float]:
+        """Rates for every known currency relative to ``base``; KeyError if it is unknown."""
+        base_rate = self.rates[base.upper()]
+        return {code: rate / base_rate for code, rate in self.rates.items()}
+
+    def convert_many(
+        self, conversions: Iterable[tuple[float, str, str]]
+    ) -> list[tuple[float, float]]:
+        """
+        Convert many (amount, from, to) triples in one pass over the snapshot.
+
+        Each distinct currency pair's rate is computed once. Returns
+        (rate, converted amount rounded to cents) per triple; KeyError if a
+        currency is unknown.
+        """
+        pair_rates: dict[tuple[str, str], float] = {}
+        results = []
+        for amount, from_currency, to_currency in conversions:
+            pair = (from_currency.upper(), to_currency.upper())
+            rate = pair_rates.get(pair)
+            if rate is None:
+                rate = pair_rates[pair] = self.rate(*pair)
+            results.append((rate, round(amount * rate, 2)))
+        return results
+
+
+def convert_dashboard_stats(stats: schemas.DashboardStats, rate: float) -> schemas.DashboardStats:
+    """Return a copy of ``stats`` with every monetary value multiplied by ``rate``."""
+    return schemas.DashboardStats(
+        total_expenses=round(stats.total_expenses * rate, 2),
+        category_breakdown={
+            category: round(total * rate, 2) for category, total in stats.category_breakdown.items()
+        },
+        monthly_trends=[
+            trend.model_copy(update={"total": round(trend.total * rate, 2)})
+            for trend in stats.monthly_trends
+        ],
+        average_expense=round(stats.average_expense * rate, 2),
+        total_count=stats.total_count,
+    )
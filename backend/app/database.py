@@ -1,17 +1,64 @@
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from typing import Any, TypeVar
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.concurrency import run_in_threadpool
 
+from app import diagnostics
 from app.config import settings
+from app.pool_metrics import PoolMetrics
+from app.request_metrics import instrument_engine
+
+T = TypeVar("T")
+
+
+def _pool_options() -> dict[str, Any]:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,  # Verify connections before using
+        "pool_use_lifo": settings.DB_POOL_USE_LIFO,  # LIFO lets idle surplus connections expire
+    }
+
 
 # Create engine with connection pooling and lazy connection
+pool_metrics = {"sync": PoolMetrics()}
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,  # Verify connections before using
-    pool_recycle=300,  # Recycle connections after 5 minutes
+    poolclass=pool_metrics["sync"].poolclass(QueuePool),
     connect_args={"connect_timeout": 10},  # 10 second connection timeout
+    **_pool_options(),
 )
+pool_metrics["sync"].attach(engine)
+instrument_engine(engine)
+if settings.DIAGNOSTICS_ENABLED:
+    diagnostics.instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Asyncio engine (asyncpg) for the request handlers; requests waiting on the
+# database then only hold the event loop, not a threadpool worker
+async_engine = None
+AsyncSessionLocal = None
+if settings.DATABASE_ASYNC:
+    pool_metrics["async"] = PoolMetrics()
+    async_engine = create_async_engine(
+        settings.async_database_url,
+        poolclass=pool_metrics["async"].poolclass(AsyncAdaptedQueuePool),
+        connect_args={"timeout": 10},
+        **_pool_options(),
+    )
+    pool_metrics["async"].attach(async_engine.sync_engine)
+    instrument_engine(async_engine.sync_engine)
+    if settings.DIAGNOSTICS_ENABLED:
+        diagnostics.instrument_engine(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
@@ -21,3 +68,53 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+SessionFactory = Callable[[], AbstractAsyncContextManager[AsyncSession | Session]]
+
+
+@asynccontextmanager
+async def async_session() -> AsyncIterator[AsyncSession | Session]:
+    """
+    Session for async handlers: an ``AsyncSession`` when DATABASE_ASYNC is on,
+    otherwise a plain ``Session`` (e.g. for the SQLite test engine).
+
+    Handlers pass it to ``run_sync`` rather than using it directly.
+    """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+    else:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            await run_in_threadpool(db.close)
+
+
+async def get_async_db():
+    """The request's ``async_session``, closed once the response is sent."""
+    async with async_session() as db:
+        yield db
+
+
+def get_session_factory() -> SessionFactory:
+    """
+    Opens sessions of their own, for work that can outlive the request that
+    started it (e.g. a computation other requests share).
+    """
+    return async_session
+
+
+async def run_sync(db: AsyncSession | Session, fn: Callable[..., T], *args: Any) -> T:
+    """
+    Call ``fn(session, *args)`` with a sync ``Session`` from an async handler.
+
+    On an ``AsyncSession`` the function runs in a greenlet on the event loop
+    and every query awaits the asyncio driver, so no thread is held while the
+    database works. A plain ``Session`` falls back to the threadpool, exactly
+    like a sync ``def`` handler.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args)
+    return await run_in_threadpool(fn, db, *args)
@@ -0,0 +1,182 @@
+"""
+Optional slow-query and N+1 diagnostics (``DIAGNOSTICS_ENABLED``).
+
+When enabled, every statement slower than ``DIAGNOSTICS_SLOW_QUERY_MS`` and
+every request issuing more than ``DIAGNOSTICS_MAX_QUERIES_PER_REQUEST``
+statements is logged as a JSON line on the ``app.diagnostics`` logger, with
+the route that issued it. Requests whose statements repeat are the usual
+N+1 shape; the repeated statements are listed with their counts.
+
+Aggregates per (route, statement) and per route are kept in memory and served,
+worst first, from ``GET /metrics/diagnostics``.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
+from app.request_metrics import UNMATCHED_ROUTE
+
+logger = logging.getLogger(__name__)
+
+# Bounds memory used by the aggregates; new keys beyond it are logged but not kept
+MAX_TRACKED_OFFENDERS = 500
+MAX_LOGGED_PARAMETERS_CHARS = 500
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class _RequestQueries:
+    scope: Scope
+    statements: list[str] = field(default_factory=list)
+
+
+_current_request: ContextVar[_RequestQueries | None] = ContextVar(
+    "diagnostics_request", default=None
+)
+_lock = threading.Lock()
+_slow_queries: dict[tuple[str, str], dict[str, Any]] = {}
+_chatty_routes: dict[str, dict[str, Any]] = {}
+
+
+def _route(scope: Scope | None) -> str | None:
+    if scope is None:
+        return None
+    return getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+
+
+def _log(event_name: str, **fields: Any) -> None:
+    logger.warning(json.dumps({"event": event_name, **fields}, default=str))
+
+
+class DiagnosticsMiddleware:
+    """Pure ASGI middleware collecting the statements each request issues."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = _RequestQueries(scope)
+        token = _current_request.set(queries)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_request.reset(token)
+            if len(queries.statements) > settings.DIAGNOSTICS_MAX_QUERIES_PER_REQUEST:
+                _record_chatty_request(_route(scope), scope["method"], queries.statements)
+
+
+def _record_chatty_request(route: str, method: str, statements: list[str]) -> None:
+    repeated = {
+        statement: count for statement, count in Counter(statements).most_common() if count > 1
+    }
+    _log(
+        "too_many_queries",
+        route=route,
+        method=method,
+        queries=len(statements),
+        threshold=settings.DIAGNOSTICS_MAX_QUERIES_PER_REQUEST,
+        repeated_statements=repeated,
+    )
+    with _lock:
+        entry = _chatty_routes.get(route)
+        if entry is None:
+            if len(_chatty_routes) >= MAX_TRACKED_OFFENDERS:
+                return
+            entry = _chatty_routes[route] = {
+                "route": route,
+                "requests": 0,
+                "max_queries": 0,
+                "total_queries": 0,
+                "repeated_statements": {},
+            }
+        entry["requests"] += 1
+        entry["total_queries"] += len(statements)
+        if len(statements) >= entry["max_queries"]:
+            entry["max_queries"] = len(statements)
+            entry["repeated_statements"] = repeated
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    context._diagnostics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed_ms = (time.perf_counter() - context._diagnostics_started) * 1000
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    queries = _current_request.get()
+    if queries is not None:
+        queries.statements.append(statement)
+    if elapsed_ms < settings.DIAGNOSTICS_SLOW_QUERY_MS:
+        return
+
+    route = _route(queries.scope if queries is not None else None)
+    logged_parameters = repr(parameters)[:MAX_LOGGED_PARAMETERS_CHARS]
+    _log(
+        "slow_query",
+        route=route,
+        duration_ms=round(elapsed_ms, 3),
+        statement=statement,
+        parameters=logged_parameters,
+    )
+    with _lock:
+        entry = _slow_queries.get((route, statement))
+        if entry is None:
+            if len(_slow_queries) >= MAX_TRACKED_OFFENDERS:
+                return
+            entry = _slow_queries[(route, statement)] = {
+                "route": route,
+                "statement": statement,
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+            }
+        entry["count"] += 1
+        entry["total_ms"] += elapsed_ms
+        entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+        entry["last_parameters"] = logged_parameters
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time the statements executed on ``engine`` and attribute them to the current request."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def top_offenders(limit: int = 10) -> dict[str, Any]:
+    """Slowest statements by total time and chattiest routes by peak query count."""
+    with _lock:
+        slow = sorted(_slow_queries.values(), key=lambda entry: entry["total_ms"], reverse=True)
+        chatty = sorted(
+            _chatty_routes.values(), key=lambda entry: entry["max_queries"], reverse=True
+        )
+        return {
+            "enabled": settings.DIAGNOSTICS_ENABLED,
+            "slow_query_ms": settings.DIAGNOSTICS_SLOW_QUERY_MS,
+            "max_queries_per_request": settings.DIAGNOSTICS_MAX_QUERIES_PER_REQUEST,
+            "slow_queries": [dict(entry) for entry in slow[:limit]],
+            "chatty_routes": [dict(entry) for entry in chatty[:limit]],
+        }
+
+
+def reset() -> None:
+    """Drop the recorded offenders."""
+    with _lock:
+        _slow_queries.clear()
+        _chatty_routes.clear()
@@ -0,0 +1,84 @@
+import csv
+import enum
+import io
+import json
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import date
+from typing import Any
+
+from sqlalchemy import Row, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+
+EXPORT_COLUMNS = (
+    models.Expense.id,
+    models.Expense.title,
+    models.Expense.amount,
+    models.Expense.category,
+    models.Expense.description,
+    models.Expense.expense_date,
+    models.Expense.created_at,
+    models.Expense.updated_at,
+)
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def stream_rows(db: Session, conditions: Iterable = ()) -> Iterator[Sequence[Row]]:
+    """
+    Yield batches of plain column tuples for every matching expense.
+
+    Rows come through a server-side cursor (``yield_per`` implies
+    ``stream_results``) ``EXPORT_BATCH_SIZE`` at a time, and no ORM objects are
+    built, so memory stays constant however many rows are exported.
+    """
+    result = db.execute(
+        select(*EXPORT_COLUMNS)
+        .where(*conditions)
+        .order_by(models.Expense.id)
+        .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+    )
+    yield from result.partitions()
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def write_csv(batches: Iterable[Sequence[Row]]) -> Iterator[str]:
+    """Encode row batches as CSV text, one chunk per batch, header first."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for batch in batches:
+        writer.writerows([_plain(value) for value in row] for row in batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def write_ndjson(batches: Iterable[Sequence[Row]]) -> Iterator[str]:
+    """Encode row batches as newline-delimited JSON objects, one chunk per batch."""
+    for batch in batches:
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_FIELDS, map(_plain, row), strict=True))) + "\n"
+            for row in batch
+        )
+
+
+WRITERS = {
+    "csv": write_csv,
+    "ndjson": write_ndjson,
+}
@@ -0,0 +1,48 @@
+"""
+Fast JSON rendering of expense rows for ``GET /api/expenses``.
+
+The list endpoint selects plain column tuples and renders them with orjson
+instead of building ORM objects, validating each into
+``schemas.ExpenseResponse`` and running the result through
+``jsonable_encoder``. The bytes are the ones the standard path produces:
+fields in the schema's order, ISO dates, ``Z`` for UTC datetimes and
+unescaped UTF-8 text.
+
+orjson spells floats that need an exponent differently from ``repr``
+(``1e16`` vs ``1e+16``), so the rare page holding such an amount is rendered
+through the standard path instead.
+"""
+
+from collections.abc import Sequence
+
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy import Row
+from starlette.responses import JSONResponse
+
+from app import models, schemas
+
+EXPENSE_FIELDS = tuple(schemas.ExpenseResponse.model_fields)
+EXPENSE_COLUMNS = tuple(models.Expense.__table__.c[name] for name in EXPENSE_FIELDS)
+
+# Floats in this range print without an exponent, where orjson and repr() agree
+_PLAIN_FLOAT_MIN = 1e-4
+_PLAIN_FLOAT_MAX = 1e16
+
+_expense_list = TypeAdapter(list[schemas.ExpenseResponse])
+
+
+class ExpenseRowsResponse(JSONResponse):
+    """
+    JSON list of ``ExpenseResponse`` objects rendered from rows of ``EXPENSE_COLUMNS``.
+
+    Rows may carry extra trailing columns (e.g. a search rank); they are not rendered.
+    """
+
+    def render(self, content: Sequence[Row]) -> bytes:
+        objects = [dict(zip(EXPENSE_FIELDS, row)) for row in content]
+        if all(_PLAIN_FLOAT_MIN <= row.amount < _PLAIN_FLOAT_MAX for row in content):
+            return orjson.dumps(objects, option=orjson.OPT_UTC_Z)
+        return super().render(
+            _expense_list.dump_python(_expense_list.validate_python(objects), mode="json")
+        )
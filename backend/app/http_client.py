@@ -0,0 +1,61 @@
+"""
+Shared, pooled ``httpx.AsyncClient`` for upstream API calls.
+
+The client is opened by the app's lifespan handler and reused by every request
+so upstream calls get keep-alive connection reuse (and HTTP/2 multiplexing)
+instead of a fresh TCP/TLS handshake each time.
+"""
+
+import importlib.util
+
+import httpx
+
+from app.config import settings
+
+_client: httpx.AsyncClient | None = None
+
+
+def create_client() -> httpx.AsyncClient:
+    """Build an AsyncClient with pool limits and per-phase timeouts from settings."""
+    # HTTP/2 needs the optional h2 package (httpx[http2]); fall back to HTTP/1.1 without it
+    http2 = settings.HTTP_CLIENT_HTTP2 and importlib.util.find_spec("h2") is not None
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            connect=settings.HTTP_CLIENT_CONNECT_TIMEOUT,
+            read=settings.HTTP_CLIENT_READ_TIMEOUT,
+            write=settings.HTTP_CLIENT_WRITE_TIMEOUT,
+            pool=settings.HTTP_CLIENT_POOL_TIMEOUT,
+        ),
+    )
+
+
+def open_client() -> httpx.AsyncClient:
+    """Create the shared client. Called on app startup."""
+    global _client
+    if _client is None:
+        _client = create_client()
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared client and its pooled connections. Called on app shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Return the shared client.
+
+    Falls back to creating it on first use when the lifespan handler did not
+    run (e.g. under Mangum with ``lifespan="off"``).
+    """
+    return _client if _client is not None else open_client()
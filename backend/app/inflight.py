@@ -0,0 +1,45 @@
+"""
+One shared computation per key for concurrent callers in a process.
+
+``RateCache`` and ``ResponseCache`` both coalesce misses: the first caller
+for a key starts a task, later callers for the same key await that task
+instead of starting their own, and the key is free again once it finishes.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+
+class InflightTasks:
+    """Tasks in flight by key."""
+
+    def __init__(self):
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._tasks
+
+    def get(self, key: str) -> asyncio.Task | None:
+        return self._tasks.get(key)
+
+    def tasks(self) -> list[asyncio.Task]:
+        return list(self._tasks.values())
+
+    def start(self, key: str, run: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """Run ``run()`` as the task in flight for ``key`` until it finishes."""
+        task = asyncio.ensure_future(run())
+        self._tasks[key] = task
+        task.add_done_callback(lambda _: self._forget(key, task))
+        return task
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        # Only if no newer task has taken the key since
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+    @staticmethod
+    async def join(task: asyncio.Task) -> Any:
+        """Await a shared task's result."""
+        # Shield the shared task so one cancelled caller does not cancel it for the others
+        return await asyncio.shield(task)
@@ -0,0 +1,231 @@
+import csv
+import io
+import json
+import re
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime
+from itertools import islice
+from typing import Any, BinaryIO
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app import models, rollups, schemas, versioning
+from app.config import settings
+
+# Only the first rejected rows of an import are kept, so memory stays bounded
+MAX_REPORTED_ERRORS = 100
+# Finished imports kept around for GET /api/expenses/import/{id}
+MAX_TRACKED_IMPORTS = 100
+
+_imports: OrderedDict[str, schemas.ImportProgress] = OrderedDict()
+
+# What the surrogateescape error handler turns undecodable bytes into
+_ESCAPED_BYTE = re.compile("[\udc80-\udcff]")
+
+
+def _validate(index: int, item: Any) -> schemas.ExpenseCreate | schemas.BulkItemError:
+    if isinstance(item, schemas.BulkItemError):
+        return item
+    try:
+        return schemas.ExpenseCreate.model_validate(item)
+    except ValidationError as e:
+        return schemas.BulkItemError(
+            index=index,
+            errors=e.errors(include_url=False, include_context=False, include_input=False),
+        )
+
+
+def validate_items(
+    items: Iterable[Any],
+) -> tuple[list[schemas.ExpenseCreate], list[schemas.BulkItemError]]:
+    """
+    Validate raw items against ``schemas.ExpenseCreate`` in a single pass.
+
+    Returns the valid expenses in input order and one error entry per invalid
+    item, so callers can report failures without rejecting the whole batch.
+    """
+    valid: list[schemas.ExpenseCreate] = []
+    errors: list[schemas.BulkItemError] = []
+    for index, item in enumerate(items):
+        result = _validate(index, item)
+        if isinstance(result, schemas.BulkItemError):
+            errors.append(result)
+        else:
+            valid.append(result)
+    return valid, errors
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def insert_expenses(
+    db: Session,
+    expenses: Iterable[schemas.ExpenseCreate],
+    chunk_size: int | None = None,
+) -> list[int]:
+    """
+    Insert expenses with multi-row INSERT ... RETURNING statements (caller commits).
+
+    Each chunk is one statement and one round trip. Rollups are folded in
+    once, after the last chunk, so the transaction locks rollup rows in one
+    sorted order (see ``rollups.apply_changes``). Returned ids follow the
+    input order (``sort_by_parameter_order``). SQLite cannot match RETURNING
+    rows to their parameters within one statement, so there SQLAlchemy
+    inserts row by row.
+    """
+    chunk_size = chunk_size or settings.BULK_INSERT_CHUNK_SIZE
+    ids: list[int] = []
+    changes: list[rollups.RollupChange] = []
+    statement = (
+        insert(models.Expense)
+        .returning(models.Expense.id, sort_by_parameter_order=True)
+        .execution_options(insertmanyvalues_page_size=chunk_size)
+    )
+    for chunk in _chunks(expenses, chunk_size):
+        ids.extend(db.scalars(statement, [expense.model_dump() for expense in chunk]))
+        changes.extend(rollups.change_for(expense) for expense in chunk)
+    if ids:
+        rollups.apply_changes(db, changes)
+        versioning.bump(db)
+    return ids
+
+
+def _parse_error(index: int, message: str) -> schemas.BulkItemError:
+    return schemas.BulkItemError(
+        index=index, errors=[{"loc": [], "msg": message, "type": "parse_error"}]
+    )
+
+
+def _cells(row: dict) -> Iterator[str]:
+    for key, value in row.items():
+        yield key or ""
+        # Short rows fill in None; extra cells are collected in a list
+        yield from value if isinstance(value, list) else [value or ""]
+
+
+def _undecodable(row: dict) -> bool:
+    """Whether a row holds bytes that were not UTF-8 (escaped as lone surrogates)."""
+    return any(_ESCAPED_BYTE.search(cell) for cell in _cells(row))
+
+
+def parse_csv(stream: BinaryIO) -> Iterator[Any]:
+    """
+    Yield one dict per CSV data row; the header row names the expense fields.
+
+    Rows that are not valid UTF-8 or not valid CSV yield parse errors naming
+    their line, and reading carries on with the next one.
+    """
+    # Invalid bytes decode to lone surrogates instead of failing the whole stream
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", errors="surrogateescape", newline="")
+    reader = csv.DictReader(text)
+    index = 0
+    try:
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                # DictReader only updates its own line_num after a good row
+                yield _parse_error(index, f"Invalid CSV on line {reader.reader.line_num}: {e}")
+            else:
+                if _undecodable(row):
+                    yield _parse_error(index, f"Invalid UTF-8 on line {reader.line_num}")
+                else:
+                    # Empty cells mean "not provided" (e.g. no description)
+                    yield {key: value for key, value in row.items() if value != ""}
+            index += 1
+    finally:
+        # Leave closing the underlying upload to its owner
+        text.detach()
+
+
+def parse_ndjson(stream: BinaryIO) -> Iterator[Any]:
+    """Yield one parsed value per non-blank line; malformed lines yield parse errors."""
+    index = 0
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            yield _parse_error(index, f"Invalid JSON: {e}")
+        index += 1
+
+
+PARSERS = {
+    "csv": parse_csv,
+    "ndjson": parse_ndjson,
+}
+
+
+def start_import(import_format: str, import_id: str | None = None) -> schemas.ImportProgress:
+    """Register a new import so its counters can be polled while it runs."""
+    progress = schemas.ImportProgress(
+        id=import_id or uuid.uuid4().hex,
+        format=import_format,
+        started_at=datetime.now(UTC),
+    )
+    _imports[progress.id] = progress
+    while len(_imports) > MAX_TRACKED_IMPORTS:
+        _imports.popitem(last=False)
+    return progress
+
+
+def get_import(import_id: str) -> schemas.ImportProgress | None:
+    return _imports.get(import_id)
+
+
+def run_import(
+    db: Session,
+    stream: BinaryIO,
+    progress: schemas.ImportProgress,
+    batch_size: int | None = None,
+) -> schemas.ImportProgress:
+    """
+    Stream rows from ``stream`` into the expenses table.
+
+    Parsing, validation and insertion form a generator pipeline; at most one
+    batch of validated rows is held in memory and each batch is committed
+    once flushed, so memory stays flat regardless of file size. A failure
+    stops the import but keeps the batches committed before it.
+    """
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    batch: list[schemas.ExpenseCreate] = []
+
+    def flush() -> None:
+        insert_expenses(db, batch)
+        db.commit()
+        progress.accepted += len(batch)
+        batch.clear()
+
+    try:
+        for index, item in enumerate(PARSERS[progress.format](stream)):
+            progress.rows_read += 1
+            result = _validate(index, item)
+            if isinstance(result, schemas.BulkItemError):
+                progress.rejected += 1
+                if len(progress.errors) < MAX_REPORTED_ERRORS:
+                    progress.errors.append(result)
+                continue
+            batch.append(result)
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+    except Exception:
+        db.rollback()
+        progress.status = "failed"
+        raise
+    else:
+        progress.status = "completed"
+    finally:
+        progress.finished_at = datetime.now(UTC)
+    return progress
@@ -1,11 +1,14 @@
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from app import diagnostics, http_client, models, partitioning, readiness, recurring
 from app.config import settings
-from app.database import Base, engine
-from app.routers import dashboard, exchange_rate, expenses
+from app.database import Base, async_engine, engine
+from app.request_metrics import MetricsMiddleware
+from app.routers import dashboard, exchange_rate, expenses, metrics, recurring_expenses
 
 
 # Create database tables only when running the app (not during imports)
@@ -25,13 +28,72 @@ def create_tables():
         print("   Make sure PostgreSQL is running and DATABASE_URL is correct.")
 
 
+# Money columns that Alembic revision 0003 converts from floats to integer cents
+CENTS_COLUMNS = [
+    ("expenses", "amount"),
+    ("expense_category_rollups", "total"),
+    ("expense_monthly_rollups", "total"),
+]
+
+
+def check_cents_columns(bind=engine):
+    """
+    Refuse to start against money columns still holding float amounts.
+
+    Startup does not alter existing columns, and writing cents into them
+    before ``alembic upgrade`` ran would make the migration convert those
+    rows a second time.
+    """
+    from sqlalchemy import Float, inspect
+
+    try:
+        inspector = inspect(bind)
+        unconverted = [
+            f"{table}.{column['name']}"
+            for table, name in CENTS_COLUMNS
+            for column in inspector.get_columns(table)
+            if column["name"] == name and isinstance(column["type"], Float)
+        ]
+    except Exception:
+        # Unreachable database; create_tables() already warned about it
+        return
+    if unconverted:
+        raise RuntimeError(
+            f"{', '.join(unconverted)} still hold float amounts; "
+            "run `alembic upgrade head`, then start this version again"
+        )
+
+
+def create_partitions():
+    """Create the current and upcoming expense partitions. Called on app startup."""
+    try:
+        created = partitioning.ensure_partitions(engine)
+        if created:
+            print(f"✅ Created expense partitions: {', '.join(created)}")
+    except Exception as e:
+        print(f"⚠️  Warning: Could not create expense partitions: {e}")
+        print("   New expenses land in the default partition until they are created.")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events."""
     # Startup
     create_tables()
+    check_cents_columns()
+    if models.PARTITION_INTERVAL:
+        create_partitions()
+    http_client.open_client()
+    readiness.probe.start()
+    if settings.RECURRING_SCHEDULER_ENABLED:
+        recurring.scheduler.start()
     yield
-    # Shutdown (if needed)
+    # Shutdown
+    await recurring.scheduler.stop()
+    await readiness.probe.stop()
+    await http_client.close_client()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 
 app = FastAPI(
@@ -49,12 +111,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[expenses.NEXT_CURSOR_HEADER, "ETag"],
 )
 
+if settings.DIAGNOSTICS_ENABLED:
+    app.add_middleware(diagnostics.DiagnosticsMiddleware)
+
+# Outermost, so recorded latency covers the whole middleware stack
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(expenses.router, prefix="/api/expenses", tags=["expenses"])
+app.include_router(
+    recurring_expenses.router, prefix="/api/recurring-expenses", tags=["recurring expenses"]
+)
 app.include_router(dashboard.router, prefix="/api/dashboard", tags=["dashboard"])
 app.include_router(exchange_rate.router, prefix="/api/exchange", tags=["exchange"])
+app.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
 
 
 @app.get("/")
@@ -66,3 +139,18 @@ async def root():
 async def health():
     """Health check endpoint for uptime monitoring."""
     return {"status": "healthy", "service": "expense-tracker-api"}
+
+
+@app.get("/ready")
+async def ready() -> JSONResponse:
+    """
+    Readiness check for load balancers.
+
+    Reports the latest background probes of the database, pool headroom and
+    exchange rate upstream; 503 when a required dependency is failing.
+    """
+    is_ready, body = await readiness.probe.status()
+    return JSONResponse(
+        body,
+        status_code=status.HTTP_200_OK if is_ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
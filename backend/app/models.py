@@ -1,12 +1,27 @@
 import enum
 
-from sqlalchemy import Column, Date, DateTime, Enum, Float, Integer, String
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    Column,
+    Date,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    event,
+)
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.sql import func
 
-from app.database import Base
+from app.config import settings
+from app.database import Base, engine
+from app.money import Cents
 
 
-class ExpenseCategory(str, enum.Enum):
+class ExpenseCategory(enum.StrEnum):
     FOOD = "food"
     TRANSPORT = "transport"
     ENTERTAINMENT = "entertainment"
@@ -17,14 +32,190 @@ class ExpenseCategory(str, enum.Enum):
     OTHER = "other"
 
 
+# SQLite's CURRENT_TIMESTAMP has second resolution; store bound datetimes the same
+# way so keyset comparisons against server-generated timestamps stay consistent.
+Timestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+    ),
+    "sqlite",
+)
+
+
+# Month or year when expenses is range-partitioned by expense_date (PostgreSQL
+# only, see app.partitioning); None for a plain table
+PARTITION_INTERVAL = (
+    settings.EXPENSE_PARTITION_INTERVAL
+    if settings.EXPENSE_PARTITION_INTERVAL != "none" and engine.dialect.name == "postgresql"
+    else None
+)
+DEFAULT_PARTITION = "expenses_default"
+
+
 class Expense(Base):
     __tablename__ = "expenses"
+    __table_args__ = (
+        # Keyset pagination order for GET /api/expenses
+        Index("ix_expenses_created_at_id", "created_at", "id"),
+        # Filter/sort access paths for GET /api/expenses; the trailing id keeps
+        # keyset cursors and tie-breaks on the index
+        Index("ix_expenses_expense_date_id", "expense_date", "id"),
+        Index("ix_expenses_amount_id", "amount", "id"),
+        Index("ix_expenses_category_created_at_id", "category", "created_at", "id"),
+        Index("ix_expenses_category_expense_date_id", "category", "expense_date", "id"),
+        Index("ix_expenses_category_amount_id", "category", "amount", "id"),
+        # Title prefix (LIKE 'x%') lookups under non-C collations on PostgreSQL
+        Index(
+            "ix_expenses_title_pattern",
+            "title",
+            postgresql_ops={"title": "text_pattern_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # One occurrence per rule and date, so materializing recurring expenses is idempotent
+        Index(
+            "uq_expenses_recurring_expense_id_expense_date",
+            "recurring_expense_id",
+            "expense_date",
+            unique=True,
+        ),
+        {"postgresql_partition_by": "RANGE (expense_date)"} if PARTITION_INTERVAL else {},
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     title = Column(String, nullable=False, index=True)
-    amount = Column(Float, nullable=False)
+    amount = Column(Cents, nullable=False)
     category = Column(Enum(ExpenseCategory), nullable=False, index=True)
     description = Column(String, nullable=True)
-    expense_date = Column(Date, nullable=False, index=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # A partitioned table's primary key must include the partition key
+    expense_date = Column(Date, nullable=False, index=True, primary_key=bool(PARTITION_INTERVAL))
+    created_at = Column(Timestamp, server_default=func.now())
+    updated_at = Column(Timestamp, onupdate=func.now())
+    # Set on occurrences materialized from a recurring expense rule
+    recurring_expense_id = Column(
+        Integer, ForeignKey("recurring_expenses.id", ondelete="SET NULL"), nullable=True
+    )
+
+    # Rows are identified by id alone, also when the table's key includes expense_date
+    __mapper_args__ = {"primary_key": [id]}
+
+
+class RecurrenceFrequency(enum.StrEnum):
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+    YEARLY = "yearly"
+
+
+class RecurringExpense(Base):
+    """
+    Rule posting an expense every ``interval`` periods from ``start_date``.
+
+    Mirrors the RRULE ``FREQ``/``INTERVAL``/``UNTIL``/``COUNT`` parts.
+    ``next_index`` and ``next_date`` point at the first occurrence not yet
+    materialized (``next_date`` is NULL once the rule is exhausted), so due
+    rules are an index range scan on ``next_date``.
+    """
+
+    __tablename__ = "recurring_expenses"
+
+    id = Column(Integer, primary_key=True, index=True)
+    title = Column(String, nullable=False)
+    amount = Column(Cents, nullable=False)
+    category = Column(Enum(ExpenseCategory), nullable=False)
+    description = Column(String, nullable=True)
+    frequency = Column(Enum(RecurrenceFrequency), nullable=False)
+    interval = Column(Integer, nullable=False, default=1)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=True)
+    count = Column(Integer, nullable=True)
+    next_index = Column(Integer, nullable=False, default=0)
+    next_date = Column(Date, nullable=True, index=True)
+    created_at = Column(Timestamp, server_default=func.now())
+
+
+class CategoryRollup(Base):
+    """Running totals per category, maintained by the expense write path."""
+
+    __tablename__ = "expense_category_rollups"
+
+    category = Column(Enum(ExpenseCategory), primary_key=True)
+    # Integer cents, summed exactly
+    total = Column(BigInteger, nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class MonthlyRollup(Base):
+    """Running totals per (year, month, category), maintained by the expense write path."""
+
+    __tablename__ = "expense_monthly_rollups"
+
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)
+    category = Column(Enum(ExpenseCategory), primary_key=True)
+    # Integer cents, summed exactly
+    total = Column(BigInteger, nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class DataVersion(Base):
+    """Counter bumped by every write to a dataset; backs the ETags of its read endpoints."""
+
+    __tablename__ = "data_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+event.listen(
+    DataVersion.__table__,
+    "after_create",
+    DDL("INSERT INTO data_versions (name, version) VALUES ('expenses', 0)"),
+)
+
+
+# Full-text search over title and description (see app.search). The search
+# structures live outside the mapped columns, so they are created with DDL.
+SEARCH_CONFIG = "english"
+SEARCH_DOCUMENT_SQL = "coalesce(title, '') || ' ' || coalesce(description, '')"
+
+# PostgreSQL: a stored tsvector column, so ranking reads it instead of re-parsing text
+POSTGRESQL_SEARCH_DDL = (
+    f"ALTER TABLE expenses ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    f"GENERATED ALWAYS AS (to_tsvector('{SEARCH_CONFIG}', {SEARCH_DOCUMENT_SQL})) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_expenses_search_vector ON expenses USING gin (search_vector)",
+)
+
+# SQLite: an FTS5 index over the expenses table, kept in sync by triggers
+SQLITE_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS expenses_fts USING fts5(title, description, "
+    "content='expenses', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS expenses_fts_insert AFTER INSERT ON expenses BEGIN "
+    "INSERT INTO expenses_fts (rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS expenses_fts_delete AFTER DELETE ON expenses BEGIN "
+    "INSERT INTO expenses_fts (expenses_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS expenses_fts_update AFTER UPDATE OF title, description "
+    "ON expenses BEGIN "
+    "INSERT INTO expenses_fts (expenses_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO expenses_fts (rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+)
+
+for statement in POSTGRESQL_SEARCH_DDL:
+    event.listen(Expense.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(Expense.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(
+    Expense.__table__,
+    "after_drop",
+    DDL("DROP TABLE IF EXISTS expenses_fts").execute_if(dialect="sqlite"),
+)
+
+# Catches dates no monthly or yearly partition covers yet (see app.partitioning)
+if PARTITION_INTERVAL:
+    event.listen(
+        Expense.__table__,
+        "after_create",
+        DDL(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF expenses DEFAULT"),
+    )
@@ -0,0 +1,46 @@
+"""
+Money amounts stored as integer cents.
+
+The API speaks in decimal amounts (floats with at most two decimals), while
+the database stores whole cents in ``BIGINT`` columns so sums are exact
+integer arithmetic. ``Cents`` converts at the column boundary; ``raw`` gives
+the integer-cents view of such a column for aggregates.
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+
+from sqlalchemy import BigInteger, type_coerce
+from sqlalchemy.types import TypeDecorator
+
+# Largest accepted amount. Its cents fit a BIGINT with room for totals of
+# thousands of such amounts, which rollups and aggregates sum in BIGINT too.
+MAX_AMOUNT = 10**13
+
+
+def to_cents(amount: float) -> int:
+    """Whole cents of an amount, rounding half-cents up as written (1.005 -> 101)."""
+    # Through the decimal text, as 1.005 * 100 is 100.49999999999999 in binary floats
+    return int((Decimal(str(amount)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents: int) -> float:
+    """Decimal amount of a whole number of cents."""
+    return cents / 100
+
+
+class Cents(TypeDecorator):
+    """Decimal amounts in Python, integer cents in the database."""
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return to_cents(value) if value is not None else None
+
+    def process_result_value(self, value, dialect):
+        return from_cents(value) if value is not None else None
+
+
+def raw(column):
+    """``column`` typed as plain integer cents, e.g. to ``SUM`` without conversion."""
+    return type_coerce(column, BigInteger)
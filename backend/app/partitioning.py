@@ -0,0 +1,223 @@
+"""
+Optional range partitioning of ``expenses`` by ``expense_date`` on PostgreSQL.
+
+With ``EXPENSE_PARTITION_INTERVAL=month`` (or ``year``) the table is created
+``PARTITION BY RANGE (expense_date)`` with one partition per month (or year)
+and a DEFAULT partition for dates no partition covers yet. Listing filters,
+trends, the dashboard's partial month and exports all bound ``expense_date``
+with plain range predicates, so PostgreSQL prunes them to the partitions the
+range overlaps. Lookups by id alone still visit every partition's id index.
+
+Startup creates the partitions for the current period and the
+``EXPENSE_PARTITIONS_AHEAD`` periods after it, and moves rows that landed in
+the default partition into partitions of their own, so it stays small. The
+interval cannot be changed once partitions exist.
+
+    # What startup does (e.g. from cron, for servers that run for months)
+    python -m app.partitioning ensure
+
+    # Convert an existing unpartitioned table; stop the app first, as the
+    # table is locked while every row is copied
+    python -m app.partitioning migrate
+"""
+
+import argparse
+import sys
+from datetime import date
+
+from sqlalchemy import Connection, Engine, text
+
+from app import models
+from app.config import settings
+
+# Serializes partition maintenance across workers starting at the same time
+_LOCK_KEY = 0x65787061  # "expa"
+
+_COLUMNS = ", ".join(column.name for column in models.Expense.__table__.columns)
+
+
+def period_start(day: date, interval: str) -> date:
+    """First day of the month or year holding ``day``."""
+    return date(day.year, day.month if interval == "month" else 1, 1)
+
+
+def next_period(start: date, interval: str) -> date:
+    """First day of the month or year after the one starting on ``start``."""
+    if interval == "year" or start.month == 12:
+        return date(start.year + 1, 1, 1)
+    return date(start.year, start.month + 1, 1)
+
+
+def partition_name(start: date, interval: str) -> str:
+    if interval == "year":
+        return f"expenses_y{start.year}"
+    return f"expenses_y{start.year}m{start.month:02d}"
+
+
+def is_partitioned(conn: Connection) -> bool:
+    return (
+        conn.execute(
+            text("SELECT relkind FROM pg_class WHERE oid = to_regclass('expenses')")
+        ).scalar()
+        == "p"
+    )
+
+
+def _periods_of(conn: Connection, table: str, interval: str) -> set[date]:
+    return set(
+        conn.execute(
+            text(f"SELECT DISTINCT date_trunc('{interval}', expense_date)::date FROM {table}")
+        ).scalars()
+    )
+
+
+def _create_partition(conn: Connection, start: date, interval: str) -> None:
+    end = next_period(start, interval)
+    in_range = f"expense_date >= '{start}' AND expense_date < '{end}'"
+    # PostgreSQL refuses a partition overlapping rows already in the default
+    # partition, so such rows are moved out and back in around it
+    stray = conn.execute(
+        text(f"SELECT EXISTS (SELECT 1 FROM {models.DEFAULT_PARTITION} WHERE {in_range})")
+    ).scalar()
+    if stray:
+        conn.execute(
+            text(
+                f"CREATE TEMPORARY TABLE expenses_moving AS "
+                f"SELECT {_COLUMNS} FROM {models.DEFAULT_PARTITION} WHERE {in_range}"
+            )
+        )
+        conn.execute(text(f"DELETE FROM {models.DEFAULT_PARTITION} WHERE {in_range}"))
+    conn.execute(
+        text(
+            f"CREATE TABLE {partition_name(start, interval)} PARTITION OF expenses "
+            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+        )
+    )
+    if stray:
+        conn.execute(
+            text(f"INSERT INTO expenses ({_COLUMNS}) SELECT {_COLUMNS} FROM expenses_moving")
+        )
+        conn.execute(text("DROP TABLE expenses_moving"))
+
+
+def _create_missing(
+    conn: Connection, periods: set[date], interval: str, today: date, ahead: int
+) -> list[str]:
+    """Create partitions for ``periods`` plus the current and upcoming ones."""
+    start = period_start(today, interval)
+    for _ in range(ahead + 1):
+        periods.add(start)
+        start = next_period(start, interval)
+
+    created = []
+    for start in sorted(periods):
+        name = partition_name(start, interval)
+        if conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is None:
+            _create_partition(conn, start, interval)
+            created.append(name)
+    return created
+
+
+def ensure_partitions(bind: Engine, today: date | None = None) -> list[str]:
+    """
+    Create the current and upcoming partitions, and partitions for any rows
+    in the default partition. Returns the names of the partitions created.
+    """
+    interval = models.PARTITION_INTERVAL
+    if interval is None:
+        return []
+    with bind.begin() as conn:
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY})
+        if not is_partitioned(conn):
+            return []
+        return _create_missing(
+            conn,
+            _periods_of(conn, models.DEFAULT_PARTITION, interval),
+            interval,
+            today or date.today(),
+            settings.EXPENSE_PARTITIONS_AHEAD,
+        )
+
+
+def migrate(bind: Engine, today: date | None = None) -> int | None:
+    """
+    Replace an unpartitioned expenses table by a partitioned copy of it.
+
+    Runs in one transaction: the old table and its indexes and id sequence
+    are renamed out of the way, the partitioned table is created with a
+    partition for every period holding rows, the rows are copied with their
+    ids, and the old table is dropped. Returns the rows copied, or None when
+    the table is already partitioned.
+    """
+    interval = models.PARTITION_INTERVAL
+    if interval is None:
+        raise RuntimeError("Set EXPENSE_PARTITION_INTERVAL and use PostgreSQL to partition")
+    with bind.begin() as conn:
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY})
+        if is_partitioned(conn):
+            return None
+
+        indexes = conn.execute(
+            text(
+                "SELECT indexname FROM pg_indexes "
+                "WHERE schemaname = current_schema() AND tablename = 'expenses'"
+            )
+        ).scalars()
+        for index in list(indexes):
+            conn.execute(text(f'ALTER INDEX "{index}" RENAME TO "{index}_unpartitioned"'))
+        conn.execute(text("ALTER TABLE expenses RENAME TO expenses_unpartitioned"))
+        conn.execute(
+            text("ALTER SEQUENCE IF EXISTS expenses_id_seq RENAME TO expenses_unpartitioned_id_seq")
+        )
+
+        # Creates the default partition and the search column too (see app.models)
+        models.Expense.__table__.create(conn, checkfirst=True)
+        _create_missing(
+            conn,
+            _periods_of(conn, "expenses_unpartitioned", interval),
+            interval,
+            today or date.today(),
+            settings.EXPENSE_PARTITIONS_AHEAD,
+        )
+        copied = conn.execute(
+            text(f"INSERT INTO expenses ({_COLUMNS}) SELECT {_COLUMNS} FROM expenses_unpartitioned")
+        ).rowcount
+        conn.execute(
+            text(
+                "SELECT setval(pg_get_serial_sequence('expenses', 'id'), "
+                "coalesce(max(id), 0) + 1, false) FROM expenses"
+            )
+        )
+        conn.execute(text("DROP TABLE expenses_unpartitioned"))
+    return copied
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Maintain range partitions of expenses.")
+    parser.add_argument("command", choices=["ensure", "migrate"])
+    args = parser.parse_args(argv)
+
+    if models.PARTITION_INTERVAL is None:
+        print("⚠️  Partitioning is off: set EXPENSE_PARTITION_INTERVAL=month|year on PostgreSQL")
+        return 1
+
+    from app.database import Base, engine
+
+    # Creates a partitioned table when there is none yet; an existing one is left as is
+    Base.metadata.create_all(bind=engine)
+    if args.command == "migrate":
+        copied = migrate(engine)
+        if copied is None:
+            print("✅ expenses is already partitioned")
+        else:
+            print(
+                f"✅ Moved {copied} expenses into a table partitioned by {models.PARTITION_INTERVAL}"
+            )
+
+    created = ensure_partitions(engine)
+    print(f"✅ Created {len(created)} partitions" + (f": {', '.join(created)}" if created else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
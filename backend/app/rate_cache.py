@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from app.inflight import InflightTasks
+
+logger = logging.getLogger(__name__)
+
+Fetcher = Callable[[str], Awaitable[Any]]
+
+
+@dataclass
+class _Entry:
+    value: Any
+    fetched_at: float
+
+
+class RateCache:
+    """
+    In-process cache of upstream exchange-rate data, keyed by base currency.
+
+    - Entries younger than ``ttl`` are served directly.
+    - Entries older than ``ttl`` but within ``stale_ttl`` more seconds are
+      served stale while a single background refresh replaces them.
+    - Older entries (or missing ones) are fetched before returning; concurrent
+      misses for the same key share one upstream request.
+    - At most ``max_entries`` bases are kept, evicting the least recently used.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        stale_ttl: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._inflight = InflightTasks()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    async def get(self, key: str, fetch: Fetcher) -> Any:
+        """Return the value for ``key``, calling ``fetch(key)`` upstream only when needed."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = self._clock() - entry.fetched_at
+            if age < self.ttl:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry.value
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                if key not in self._inflight:
+                    self.refreshes += 1
+                    self._start_fetch(key, fetch).add_done_callback(self._log_refresh_failure)
+                return entry.value
+
+        self.misses += 1
+        task = self._inflight.get(key) or self._start_fetch(key, fetch)
+        return await InflightTasks.join(task)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.stale_hits = self.misses = self.refreshes = 0
+
+    def _start_fetch(self, key: str, fetch: Fetcher) -> asyncio.Task:
+        return self._inflight.start(key, lambda: self._fetch_and_store(key, fetch))
+
+    async def _fetch_and_store(self, key: str, fetch: Fetcher) -> Any:
+        value = await fetch(key)
+        self._entries[key] = _Entry(value=value, fetched_at=self._clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    @staticmethod
+    def _log_refresh_failure(task: asyncio.Task) -> None:
+        # Keep serving the stale entry; the next stale hit retries the refresh
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Background exchange rate refresh failed: %s", task.exception())
@@ -0,0 +1,161 @@
+"""
+Dependency probes behind ``GET /ready``.
+
+Probes (database round trip, pool headroom, upstream reachability) run in a
+background task every ``READINESS_PROBE_INTERVAL_SECONDS`` and the latest
+results are kept in memory, so the endpoint answers from that snapshot
+without touching any dependency itself. When no background loop is running
+(e.g. under Mangum with ``lifespan="off"``) or its results have gone stale,
+the next ``/ready`` call refreshes them once for all concurrent callers.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from app import http_client
+from app.config import settings
+from app.database import async_engine, engine, pool_metrics
+
+logger = logging.getLogger(__name__)
+
+# A probe returns details to report and raises when the dependency is unusable
+Check = Callable[[], Awaitable[dict[str, Any]]]
+
+
+class ReadinessProbe:
+    """Runs dependency checks periodically and serves the cached verdict."""
+
+    def __init__(
+        self,
+        checks: dict[str, Check],
+        critical: set[str],
+        interval: float,
+        timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.checks = checks
+        self.critical = critical
+        self.interval = interval
+        self.timeout = timeout
+        self._clock = clock
+        self._results: dict[str, dict[str, Any]] = {}
+        self._checked_at: float | None = None
+        self._refreshing: asyncio.Task | None = None
+        self._loop_task: asyncio.Task | None = None
+
+    async def _run_check(self, name: str, check: Check) -> dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            details = await asyncio.wait_for(check(), self.timeout)
+            result = {"ok": True, **details}
+        except Exception as e:
+            result = {"ok": False, "error": str(e) or type(e).__name__}
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return result
+
+    async def _refresh(self) -> None:
+        names = list(self.checks)
+        results = await asyncio.gather(
+            *(self._run_check(name, self.checks[name]) for name in names)
+        )
+        self._results = dict(zip(names, results, strict=True))
+        self._checked_at = self._clock()
+
+    async def refresh(self) -> None:
+        """Run every check now; concurrent callers share one run."""
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.ensure_future(self._refresh())
+        await asyncio.shield(self._refreshing)
+
+    def _is_stale(self) -> bool:
+        # Allow a couple of missed rounds before distrusting the background loop
+        return self._checked_at is None or self._clock() - self._checked_at > 3 * self.interval
+
+    async def status(self) -> tuple[bool, dict[str, Any]]:
+        """Readiness verdict and per-check details from the latest probe round."""
+        if self._is_stale():
+            await self.refresh()
+        ready = all(self._results[name]["ok"] for name in self.critical if name in self._results)
+        return ready, {
+            "status": "ready" if ready else "not ready",
+            "checked_seconds_ago": round(self._clock() - self._checked_at, 3),
+            "checks": self._results,
+        }
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Readiness probe round failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start probing in the background. Called on app startup."""
+        if self._loop_task is None:
+            self._loop_task = asyncio.ensure_future(self._loop())
+
+    async def stop(self) -> None:
+        """Stop the background probes. Called on app shutdown."""
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+
+
+def _select_one() -> None:
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+async def check_database() -> dict[str, Any]:
+    """Round trip to the database through the engine serving the CRUD handlers."""
+    if async_engine is not None:
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    else:
+        await run_in_threadpool(_select_one)
+    return {}
+
+
+async def check_pool() -> dict[str, Any]:
+    """Fail when every pool is fully checked out, so requests would queue for a connection."""
+    capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    pools = {}
+    for name, metrics in pool_metrics.items():
+        checked_out = metrics.snapshot()["checked_out"]
+        pools[name] = {"checked_out": checked_out, "capacity": capacity}
+        if checked_out >= capacity:
+            raise RuntimeError(f"{name} pool exhausted ({checked_out}/{capacity} in use)")
+    return {"pools": pools}
+
+
+async def check_upstream() -> dict[str, Any]:
+    """HEAD request to the exchange rate API through the shared client."""
+    url = f"{settings.EXCHANGE_RATE_API_URL}/{settings.EXCHANGE_RATE_BASE_CURRENCY}"
+    response = await http_client.get_client().head(url)
+    if response.status_code >= 500:
+        raise RuntimeError(f"upstream returned {response.status_code}")
+    return {"status_code": response.status_code}
+
+
+# Upstream outages degrade conversions only, so by default they do not pull the instance
+_critical_checks = {"database", "pool"}
+if settings.READINESS_REQUIRE_UPSTREAM:
+    _critical_checks.add("upstream")
+
+probe = ReadinessProbe(
+    checks={"database": check_database, "pool": check_pool, "upstream": check_upstream},
+    critical=_critical_checks,
+    interval=settings.READINESS_PROBE_INTERVAL_SECONDS,
+    timeout=settings.READINESS_PROBE_TIMEOUT_SECONDS,
+)
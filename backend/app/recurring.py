@@ -0,0 +1,202 @@
+"""
+Materializing recurring expense rules into expenses.
+
+``materialize_due`` finds the rules with a due occurrence through the index on
+``recurring_expenses.next_date``, walks each one forward over its due
+occurrences only and posts them for a whole batch of rules with one
+multi-row INSERT. The INSERT skips (rule, date) pairs that already exist and
+rules advance in the same transaction as their expenses, so a crash at any
+point is recovered by running again: nothing is posted twice and every
+missed period is caught up in a single pass.
+
+``scheduler`` runs it periodically, started from the app lifespan.
+"""
+
+import asyncio
+import calendar
+import logging
+from collections.abc import Callable, Sequence
+from datetime import date, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app import models, rollups, versioning
+from app.config import settings
+from app.database import SessionLocal
+from app.response_cache import dashboard_cache
+
+logger = logging.getLogger(__name__)
+
+_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+_expenses = models.Expense.__table__
+_Frequency = models.RecurrenceFrequency
+
+
+def _add_months(day: date, months: int) -> date:
+    """``day`` moved by ``months``, clamped to the last day of shorter months."""
+    years, month_index = divmod(day.month - 1 + months, 12)
+    year, month = day.year + years, month_index + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def occurrence_date(rule: models.RecurringExpense, index: int) -> date | None:
+    """
+    Date of occurrence ``index`` (0 is ``start_date``), or None past the rule's end.
+
+    Always counted from ``start_date``, so a rule starting on the 31st posts on
+    the last day of short months and returns to the 31st afterwards.
+    """
+    if rule.count is not None and index >= rule.count:
+        return None
+    step = index * rule.interval
+    if rule.frequency == _Frequency.DAILY:
+        day = rule.start_date + timedelta(days=step)
+    elif rule.frequency == _Frequency.WEEKLY:
+        day = rule.start_date + timedelta(weeks=step)
+    elif rule.frequency == _Frequency.MONTHLY:
+        day = _add_months(rule.start_date, step)
+    else:
+        day = _add_months(rule.start_date, 12 * step)
+    if rule.end_date is not None and day > rule.end_date:
+        return None
+    return day
+
+
+def _due_occurrences(rule: models.RecurringExpense, today: date, limit: int) -> list[dict]:
+    """
+    Expense rows for at most ``limit`` of the rule's occurrences up to ``today``;
+    advances the rule past them.
+    """
+    rows = []
+    index, day = rule.next_index, rule.next_date
+    while day is not None and day <= today and len(rows) < limit:
+        rows.append(
+            {
+                "title": rule.title,
+                "amount": rule.amount,
+                "category": rule.category,
+                "description": rule.description,
+                "expense_date": day,
+                "recurring_expense_id": rule.id,
+            }
+        )
+        index += 1
+        day = occurrence_date(rule, index)
+    rule.next_index, rule.next_date = index, day
+    return rows
+
+
+def materialize_due(
+    db: Session,
+    today: date,
+    rule_ids: Sequence[int] | None = None,
+    batch_size: int | None = None,
+    max_batches: int | None = None,
+) -> int:
+    """
+    Post every occurrence due up to ``today`` and return how many expenses were created.
+
+    Rules are processed ``batch_size`` at a time, each batch committed with its
+    expenses, rollups and data version. A batch posts at most
+    ``RECURRING_MAX_OCCURRENCES`` occurrences per rule; rules with more due
+    stay due and come round again. ``max_batches`` stops early, leaving the
+    rest to a later run. On PostgreSQL rules locked by another instance
+    running concurrently are skipped rather than waited for.
+    """
+    batch_size = batch_size or settings.RECURRING_BATCH_SIZE
+    limit = settings.RECURRING_MAX_OCCURRENCES
+    dialect = db.get_bind().dialect.name
+    created = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        query = (
+            select(models.RecurringExpense)
+            .where(models.RecurringExpense.next_date <= today)
+            .order_by(models.RecurringExpense.id)
+            .limit(batch_size)
+        )
+        if rule_ids is not None:
+            query = query.where(models.RecurringExpense.id.in_(rule_ids))
+        if dialect == "postgresql":
+            query = query.with_for_update(skip_locked=True)
+        rules = db.scalars(query).all()
+        if not rules:
+            return created
+
+        rows = [row for rule in rules for row in _due_occurrences(rule, today, limit)]
+        insert = _INSERTS[dialect]
+        inserted = db.execute(
+            insert(_expenses)
+            .on_conflict_do_nothing(index_elements=["recurring_expense_id", "expense_date"])
+            .returning(_expenses.c.category, _expenses.c.expense_date, _expenses.c.amount)
+            .execution_options(insertmanyvalues_page_size=settings.BULK_INSERT_CHUNK_SIZE),
+            rows,
+        ).all()
+        # Only rows actually inserted count; conflicts were posted by an earlier run
+        if inserted:
+            rollups.apply_changes(db, [rollups.change_for(row) for row in inserted])
+            versioning.bump(db)
+        db.commit()
+        created += len(inserted)
+        batches += 1
+    return created
+
+
+class RecurringScheduler:
+    """Materializes due recurring expenses in the background every ``interval`` seconds."""
+
+    def __init__(
+        self,
+        interval: float,
+        session_factory: Callable[[], Session] = SessionLocal,
+        today: Callable[[], date] = date.today,
+    ):
+        self.interval = interval
+        self._session_factory = session_factory
+        self._today = today
+        self._loop_task: asyncio.Task | None = None
+
+    def _materialize(self) -> int:
+        with self._session_factory() as db:
+            return materialize_due(db, self._today())
+
+    async def run_once(self) -> int:
+        """Materialize everything due now; returns the number of expenses created."""
+        created = await run_in_threadpool(self._materialize)
+        if created:
+            await dashboard_cache.invalidate()
+            logger.info("Materialized %d recurring expenses", created)
+        return created
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Materializing recurring expenses failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start the scheduler in the background. Called on app startup."""
+        if self._loop_task is None:
+            self._loop_task = asyncio.ensure_future(self._loop())
+
+    async def stop(self) -> None:
+        """Stop the scheduler. Called on app shutdown."""
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+
+
+scheduler = RecurringScheduler(settings.RECURRING_SCHEDULER_INTERVAL_SECONDS)
@@ -0,0 +1,281 @@
+"""
+Per-route request and database metrics in the Prometheus text format.
+
+``MetricsMiddleware`` records request counts, latency and response size
+histograms and in-flight requests, labelled by route template (not the raw
+path, so ids do not blow up label cardinality). SQLAlchemy cursor hooks add
+the number of queries and the database time spent by each request to the
+route that issued them. Everything is served from ``GET /metrics``.
+
+Request metrics are recorded on the event loop thread (database hooks write
+into a per-request holder), so they need no locking and the per-request cost
+is a few dictionary updates. Queries outside any request (the recurring
+scheduler, sync readiness probes) run on worker threads too, so their
+``background`` series are updated under a lock, and rendering copies each
+series dict before iterating it.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.pool_metrics import PoolMetrics
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100)
+
+# Label for requests that matched no route (e.g. 404s) and queries outside requests
+UNMATCHED_ROUTE = "unmatched"
+BACKGROUND_ROUTE = "background"
+
+# Serializes updates of the background series from worker threads and the loop
+_background_lock = threading.Lock()
+
+Labels = tuple[str, ...]
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.values: dict[Labels, float] = {}
+
+    def inc(self, labels: Labels, amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} counter"
+        # Copied first, as a worker thread may add a series meanwhile
+        for labels, value in sorted(self.values.copy().items()):
+            yield f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Sequence[str],
+        buckets: Sequence[float],
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last one is +Inf), sum]
+        self.values: dict[Labels, list] = {}
+
+    def observe(self, labels: Labels, value: float) -> None:
+        series = self.values.get(labels)
+        if series is None:
+            series = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, (counts, total) in sorted(self.values.copy().items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts, strict=True):
+                cumulative += count
+                bucket_labels = _format_labels(
+                    (*self.label_names, "le"), (*labels, _format_value(bound))
+                )
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            formatted = _format_labels(self.label_names, labels)
+            yield f"{self.name}_sum{formatted} {_format_value(total)}"
+            yield f"{self.name}_count{formatted} {cumulative}"
+
+
+def _format_value(value: float | str) -> str:
+    if isinstance(value, str):
+        return value
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    escaped = (
+        str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        for value in values
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+
+requests_total = Counter(
+    "http_requests_total", "HTTP requests handled.", ("method", "route", "status")
+)
+request_duration = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency in seconds.",
+    ("method", "route"),
+    LATENCY_BUCKETS,
+)
+response_size = Histogram(
+    "http_response_size_bytes",
+    "HTTP response body size in bytes.",
+    ("method", "route"),
+    SIZE_BUCKETS,
+)
+request_queries = Histogram(
+    "http_request_db_queries",
+    "Database queries issued per HTTP request.",
+    ("method", "route"),
+    QUERY_COUNT_BUCKETS,
+)
+db_queries_total = Counter("db_queries_total", "Database queries executed.", ("route",))
+db_duration_total = Counter(
+    "db_query_duration_seconds_total", "Time spent executing database queries.", ("route",)
+)
+_in_flight = 0
+
+_METRICS = (
+    requests_total,
+    request_duration,
+    response_size,
+    request_queries,
+    db_queries_total,
+    db_duration_total,
+)
+
+
+@dataclass
+class _RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+_current_request: ContextVar[_RequestStats | None] = ContextVar("current_request", default=None)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route HTTP metrics."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        global _in_flight
+        stats = _RequestStats()
+        token = _current_request.set(stats)
+        status_code = 500
+        body_size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, body_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                body_size += len(message.get("body", b""))
+            await send(message)
+
+        _in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _in_flight -= 1
+            _current_request.reset(token)
+
+            # The router stores the matched route in the scope
+            route = scope.get("route")
+            labels = (scope["method"], getattr(route, "path", UNMATCHED_ROUTE))
+            requests_total.inc((*labels, str(status_code)))
+            request_duration.observe(labels, elapsed)
+            response_size.observe(labels, body_size)
+            request_queries.observe(labels, stats.queries)
+            if stats.queries:
+                db_queries_total.inc(labels[1:], stats.queries)
+                db_duration_total.inc(labels[1:], stats.db_seconds)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - context._metrics_started
+    stats = _current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+    else:
+        with _background_lock:
+            db_queries_total.inc((BACKGROUND_ROUTE,))
+            db_duration_total.inc((BACKGROUND_ROUTE,), elapsed)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attribute the queries executed on ``engine`` to the current request's route."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _render_pools(pools: dict[str, PoolMetrics]) -> Iterable[str]:
+    gauges = {
+        "checked_out": "Connections currently checked out of the pool.",
+        "overflow": "Overflow connections currently open beyond pool_size.",
+    }
+    counters = {
+        "checkouts": "Connections checked out of the pool.",
+        "overflow_checkouts": "Checkouts served by an overflow connection.",
+        "timeouts": "Checkouts that timed out waiting for a connection.",
+    }
+    snapshots = {name: metrics.snapshot() for name, metrics in pools.items()}
+    for key, help_text in gauges.items():
+        yield f"# HELP db_pool_{key} {help_text}"
+        yield f"# TYPE db_pool_{key} gauge"
+        for name, snapshot in snapshots.items():
+            yield f'db_pool_{key}{{engine="{name}"}} {snapshot[key]}'
+    for key, help_text in counters.items():
+        yield f"# HELP db_pool_{key}_total {help_text}"
+        yield f"# TYPE db_pool_{key}_total counter"
+        for name, snapshot in snapshots.items():
+            yield f'db_pool_{key}_total{{engine="{name}"}} {snapshot[key]}'
+    yield "# HELP db_pool_wait_seconds Time spent waiting to check out a connection."
+    yield "# TYPE db_pool_wait_seconds histogram"
+    for name, snapshot in snapshots.items():
+        for bound, count in snapshot["wait_seconds_buckets"].items():
+            yield f'db_pool_wait_seconds_bucket{{engine="{name}",le="{bound}"}} {count}'
+        yield f'db_pool_wait_seconds_sum{{engine="{name}"}} {snapshot["wait_seconds_total"]!r}'
+        waits = snapshot["wait_seconds_buckets"]["+Inf"]
+        yield f'db_pool_wait_seconds_count{{engine="{name}"}} {waits}'
+
+
+def render(pools: dict[str, PoolMetrics] | None = None) -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines = [
+        "# HELP http_requests_in_flight HTTP requests currently being handled.",
+        "# TYPE http_requests_in_flight gauge",
+        f"http_requests_in_flight {_in_flight}",
+    ]
+    for metric in _METRICS:
+        lines.extend(metric.render())
+    if pools:
+        lines.extend(_render_pools(pools))
+    return "\n".join(lines) + "\n"
+
+
+def reset() -> None:
+    """Drop every recorded series (used by tests and benchmarks)."""
+    for metric in _METRICS:
+        metric.values.clear()
@@ -0,0 +1,141 @@
+"""
+Cache of rendered response bodies, in process or shared through a backend.
+
+Keys embed the data version the body was computed from (see
+``app.versioning``), so a write makes every older entry unreachable for
+all workers at once; mutation handlers additionally ``invalidate`` to drop
+them early from memory, while Redis leaves them to its TTL. Concurrent
+misses for the same key in one process share a single computation.
+"""
+
+import importlib.util
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Protocol
+
+from app.config import settings
+from app.inflight import InflightTasks
+
+Compute = Callable[[], Awaitable[bytes]]
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    async def clear(self) -> None: ...
+
+
+class MemoryBackend:
+    """Per-process backend with expiry and least-recently-used eviction."""
+
+    def __init__(self, max_entries: int, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if self._clock() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._entries[key] = (value, self._clock() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+
+class RedisBackend:
+    """Backend shared by every worker through Redis (needs the optional ``redis`` package)."""
+
+    def __init__(self, url: str, namespace: str):
+        import redis.asyncio
+
+        self._redis = redis.asyncio.from_url(url)
+        self._prefix = f"{namespace}:"
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._redis.get(self._prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._redis.set(self._prefix + key, value, px=int(ttl * 1000))
+
+    async def clear(self) -> None:
+        # A write bumps the data version every key embeds, so older entries are
+        # already unreachable; scanning for them on each write would cost more
+        # than letting them expire
+        return None
+
+
+class ResponseCache:
+    """Get-or-compute cache over a backend, with miss coalescing and counters."""
+
+    def __init__(self, backend: CacheBackend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self._inflight = InflightTasks()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    async def get(self, key: str, compute: Compute) -> bytes:
+        """Return the body cached under ``key``, computing it at most once per process."""
+        value = await self.backend.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = self._inflight.start(key, lambda: self._compute_and_store(key, compute))
+        else:
+            self.coalesced += 1
+        return await InflightTasks.join(task)
+
+    async def _compute_and_store(self, key: str, compute: Compute) -> bytes:
+        value = await compute()
+        await self.backend.set(key, value, self.ttl)
+        return value
+
+    async def invalidate(self) -> None:
+        """Drop every cached body (called after writes)."""
+        self.invalidations += 1
+        await self.backend.clear()
+
+    def reset_stats(self) -> None:
+        self.hits = self.misses = self.coalesced = self.invalidations = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+        }
+
+
+def _create_backend(namespace: str) -> CacheBackend:
+    if settings.DASHBOARD_CACHE_BACKEND == "redis":
+        if importlib.util.find_spec("redis") is None:
+            raise RuntimeError("DASHBOARD_CACHE_BACKEND=redis needs the redis package installed")
+        return RedisBackend(settings.DASHBOARD_CACHE_REDIS_URL, namespace)
+    return MemoryBackend(settings.DASHBOARD_CACHE_MAX_ENTRIES)
+
+
+dashboard_cache = ResponseCache(
+    _create_backend("expense-tracker:dashboard"), ttl=settings.DASHBOARD_CACHE_TTL_SECONDS
+)
@@ -0,0 +1,204 @@
+"""
+Incrementally maintained rollup tables backing the dashboard.
+
+The expense write path calls ``apply_changes`` inside its own transaction so the
+rollups always commit (or roll back) together with the raw rows.
+
+Usage:
+    python -m app.rollups verify   # report drift between rollups and raw rows
+    python -m app.rollups rebuild  # recompute rollups from raw rows, then verify
+"""
+
+import argparse
+import sys
+from collections.abc import Iterable
+from datetime import date
+
+from sqlalchemy import Row, delete, extract, func, insert, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app import models, money, schemas
+
+# (category, expense_date, amount delta in cents, count delta)
+RollupChange = tuple[models.ExpenseCategory, date, int, int]
+
+_UPSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def change_for(
+    expense: models.Expense | schemas.ExpenseCreate | Row, sign: int = 1
+) -> RollupChange:
+    """Rollup change for adding (sign=1) or removing (sign=-1) an expense or RETURNING row."""
+    return (expense.category, expense.expense_date, sign * money.to_cents(expense.amount), sign)
+
+
+def _upsert(db: Session, model: type, rows: list[dict], key_columns: list[str]) -> None:
+    """Add row totals and counts onto existing rollup rows, inserting missing keys."""
+    upsert = _UPSERTS[db.get_bind().dialect.name]
+    stmt = upsert(model).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={
+            "total": model.total + stmt.excluded.total,
+            "count": model.count + stmt.excluded.count,
+        },
+    )
+    db.execute(stmt)
+
+
+def apply_changes(db: Session, changes: Iterable[RollupChange]) -> None:
+    """
+    Fold expense changes into the rollup tables.
+
+    Changes are pre-aggregated per key so each table gets a single multi-row
+    upsert, and keys are written in sorted order so concurrent writers lock
+    rollup rows in the same order.
+    """
+    monthly: dict[tuple[int, int, models.ExpenseCategory], list] = {}
+    for category, expense_date, amount, count in changes:
+        bucket = monthly.setdefault((expense_date.year, expense_date.month, category), [0, 0])
+        bucket[0] += amount
+        bucket[1] += count
+    if not monthly:
+        return
+
+    by_category: dict[models.ExpenseCategory, list] = {}
+    for (_, _, category), (total, count) in monthly.items():
+        bucket = by_category.setdefault(category, [0, 0])
+        bucket[0] += total
+        bucket[1] += count
+
+    _upsert(
+        db,
+        models.MonthlyRollup,
+        [
+            {"year": year, "month": month, "category": category, "total": total, "count": count}
+            for (year, month, category), (total, count) in sorted(monthly.items())
+        ],
+        ["year", "month", "category"],
+    )
+    _upsert(
+        db,
+        models.CategoryRollup,
+        [
+            {"category": category, "total": total, "count": count}
+            for category, (total, count) in sorted(by_category.items())
+        ],
+        ["category"],
+    )
+
+
+def _scan_expenses():
+    """Per (year, month, category) totals computed from the raw expense rows."""
+    year = extract("year", models.Expense.expense_date)
+    month = extract("month", models.Expense.expense_date)
+    return select(
+        year,
+        month,
+        models.Expense.category,
+        func.sum(money.raw(models.Expense.amount)),
+        func.count(models.Expense.id),
+    ).group_by(year, month, models.Expense.category)
+
+
+def rebuild_statements(dialect: str) -> list:
+    """Statements recomputing both rollup tables from the raw expense rows, in order."""
+    statements = []
+    if dialect == "postgresql":
+        # Block concurrent writers so no change lands between the scan and the commit
+        statements.append(text("LOCK TABLE expenses IN SHARE MODE"))
+    return statements + [
+        delete(models.MonthlyRollup),
+        delete(models.CategoryRollup),
+        insert(models.MonthlyRollup).from_select(
+            ["year", "month", "category", "total", "count"], _scan_expenses()
+        ),
+        insert(models.CategoryRollup).from_select(
+            ["category", "total", "count"],
+            select(
+                models.MonthlyRollup.category,
+                func.sum(models.MonthlyRollup.total),
+                func.sum(models.MonthlyRollup.count),
+            ).group_by(models.MonthlyRollup.category),
+        ),
+    ]
+
+
+def rebuild(db: Session) -> None:
+    """Recompute both rollup tables from the raw expense rows (caller commits)."""
+    for statement in rebuild_statements(db.get_bind().dialect.name):
+        db.execute(statement)
+
+
+def _diff(table: str, expected: dict, actual: dict) -> list[str]:
+    drift = []
+    for key in sorted(expected.keys() | actual.keys(), key=str):
+        exp_total, exp_count = expected.get(key, (0, 0))
+        act_total, act_count = actual.get(key, (0, 0))
+        # Totals are integer cents, so any difference is real drift
+        if (exp_total, exp_count) != (act_total, act_count):
+            drift.append(
+                f"{table} {key}: expected total={money.from_cents(exp_total):.2f} "
+                f"count={exp_count}, found total={money.from_cents(act_total):.2f} "
+                f"count={act_count}"
+            )
+    return drift
+
+
+def verify(db: Session) -> list[str]:
+    """Compare the rollup tables against the raw rows and describe any drift."""
+    expected_monthly: dict[tuple, tuple[int, int]] = {}
+    expected_category: dict[tuple, tuple[int, int]] = {}
+    for year, month, category, total, count in db.execute(_scan_expenses()):
+        expected_monthly[(int(year), int(month), category.value)] = (int(total), count)
+        cat_total, cat_count = expected_category.get((category.value,), (0, 0))
+        expected_category[(category.value,)] = (cat_total + int(total), cat_count + count)
+
+    # Rows whose count dropped to zero are equivalent to missing rows
+    actual_monthly = {
+        (row.year, row.month, row.category.value): (row.total, row.count)
+        for row in db.query(models.MonthlyRollup)
+        if row.count or row.total
+    }
+    actual_category = {
+        (row.category.value,): (row.total, row.count)
+        for row in db.query(models.CategoryRollup)
+        if row.count or row.total
+    }
+
+    return _diff(models.MonthlyRollup.__tablename__, expected_monthly, actual_monthly) + _diff(
+        models.CategoryRollup.__tablename__, expected_category, actual_category
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Verify or rebuild dashboard rollup tables.")
+    parser.add_argument("command", choices=["verify", "rebuild"])
+    args = parser.parse_args(argv)
+
+    from app.database import Base, SessionLocal, engine
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        if args.command == "rebuild":
+            rebuild(db)
+            db.commit()
+            print("✅ Rollups rebuilt from raw expense rows")
+
+        drift = verify(db)
+
+    if drift:
+        print(f"⚠️  Found {len(drift)} drifted rollup rows:")
+        for line in drift:
+            print(f"   {line}")
+        return 1
+    print("✅ Rollups match raw expense rows")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
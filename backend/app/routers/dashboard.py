@@ -1,84 +1,116 @@
-from datetime import date, timedelta
+from datetime import date
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import extract, func
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
-from app import models, schemas
-from app.database import get_db
+from app import models, schemas, versioning
+from app.aggregation import Granularity, bucket_count, compute_dashboard_stats, compute_trends
+from app.config import settings
+from app.currency import convert_dashboard_stats
+from app.database import SessionFactory, get_async_db, get_session_factory, run_sync
+from app.response_cache import dashboard_cache
+from app.routers.exchange_rate import get_rate_snapshot
 
 router = APIRouter()
 
 
 @router.get("/stats", response_model=schemas.DashboardStats)
-def get_dashboard_stats(
-    db: Session = Depends(get_db),
+async def get_dashboard_stats(
+    request: Request,
+    response: Response,
+    currency: str | None = Query(
+        None,
+        min_length=3,
+        max_length=3,
+        description="Currency to report amounts in (defaults to the recorded currency)",
+    ),
+    db: Session = Depends(get_async_db),
+    open_session: SessionFactory = Depends(get_session_factory),
 ) -> schemas.DashboardStats:
-    """Get dashboard statistics including totals, category breakdown, and monthly trends."""
+    """
+    Get dashboard statistics including totals, category breakdown, and monthly trends.
 
-    # Total expenses
-    total_result = db.query(func.sum(models.Expense.amount)).scalar()
-    total_expenses = float(total_result) if total_result is not None else 0.0
+    Responses carry an ETag; a matching ``If-None-Match`` gets a 304 without
+    computing the statistics. Rendered bodies are cached under that same tag,
+    so other clients polling unchanged data skip the computation too.
+    """
+    version = await run_sync(db, versioning.current)
 
-    # Total count
-    total_count: int = db.query(func.count(models.Expense.id)).scalar() or 0
+    rate = None
+    # The trend window moves daily and conversions follow the rates
+    variant: tuple = (date.today().isoformat(),)
+    if currency is not None and currency.upper() != settings.EXPENSE_CURRENCY.upper():
+        snapshot = await get_rate_snapshot()
+        if currency not in snapshot:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Currency {currency} not found in exchange rates",
+            )
+        rate = snapshot.rate(settings.EXPENSE_CURRENCY, currency)
+        variant += (currency.upper(), rate)
 
-    # Average expense
-    avg_result = db.query(func.avg(models.Expense.amount)).scalar()
-    average_expense = float(avg_result) if avg_result is not None else 0.0
+    not_modified = versioning.check(request, response, version, *variant)
+    if not_modified is not None:
+        return not_modified
 
-    # Category breakdown
-    category_results = (
-        db.query(
-            models.Expense.category,
-            func.sum(models.Expense.amount).label("total"),
-        )
-        .group_by(models.Expense.category)
-        .all()
-    )
+    async def compute() -> bytes:
+        # Shared with concurrent requests and shielded from cancellation, so
+        # it may outlive this request and the session closed along with it
+        async with open_session() as session:
+            stats = await run_sync(session, compute_dashboard_stats)
+        if rate is not None:
+            stats = convert_dashboard_stats(stats, rate)
+        return JSONResponse(stats.model_dump(mode="json")).body
 
-    category_breakdown: dict[str, float] = {
-        category.value: float(total) if total is not None else 0.0
-        for category, total in category_results
-    }
+    if version is None:
+        return Response(await compute(), media_type="application/json")
+    tag = versioning.etag(version, *variant)
+    body = await dashboard_cache.get(tag, compute)
+    cached = Response(body, media_type="application/json")
+    versioning.set_headers(cached, tag)
+    return cached
 
-    # Monthly trends (last 6 months)
-    six_months_ago: date = date.today() - timedelta(days=180)
-    monthly_results = (
-        db.query(
-            extract("year", models.Expense.expense_date).label("year"),
-            extract("month", models.Expense.expense_date).label("month"),
-            func.sum(models.Expense.amount).label("total"),
-            func.count(models.Expense.id).label("count"),
-        )
-        .filter(
-            models.Expense.expense_date >= six_months_ago,
-        )
-        .group_by(
-            extract("year", models.Expense.expense_date),
-            extract("month", models.Expense.expense_date),
-        )
-        .order_by(
-            extract("year", models.Expense.expense_date),
-            extract("month", models.Expense.expense_date),
-        )
-        .all()
-    )
 
-    monthly_trends: list[schemas.MonthlyTrend] = [
-        schemas.MonthlyTrend(
-            year=int(year),
-            month=int(month),
-            total=float(total) if total is not None else 0.0,
-            count=int(count),
+@router.get("/trends", response_model=schemas.ExpenseTrends)
+async def get_expense_trends(
+    request: Request,
+    response: Response,
+    granularity: Granularity = Query("month", description="Bucket size"),
+    date_from: date = Query(..., description="Earliest expense_date (inclusive)"),
+    date_to: date | None = Query(
+        None, description="Latest expense_date (inclusive), default today"
+    ),
+    category: list[models.ExpenseCategory] = Query(
+        [], description="Only these categories (repeat for several; default all)"
+    ),
+    db: Session = Depends(get_async_db),
+) -> schemas.ExpenseTrends:
+    """
+    Get expense totals per day, week, month, quarter or year between two dates.
+
+    Every bucket in the range is listed, zero-filled where nothing was spent.
+    Responses carry an ETag; a matching ``If-None-Match`` gets a 304 without
+    running the query.
+    """
+    date_to = date_to or date.today()
+    if date_from > date_to:
+        raise HTTPException(
+            status_code=400,
+            detail="date_from must not be after date_to",
         )
-        for year, month, total, count in monthly_results
-    ]
+    if bucket_count(date_from, date_to, granularity) > settings.TRENDS_MAX_BUCKETS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range spans more than {settings.TRENDS_MAX_BUCKETS} {granularity} buckets",
+        )
+    categories = sorted(set(category), key=list(models.ExpenseCategory).index)
 
-    return schemas.DashboardStats(
-        total_expenses=total_expenses,
-        category_breakdown=category_breakdown,
-        monthly_trends=monthly_trends,
-        average_expense=average_expense,
-        total_count=total_count,
+    # date_to may be implied by today's date
+    not_modified = versioning.check(
+        request, response, await run_sync(db, versioning.current), date_to.isoformat()
     )
+    if not_modified is not None:
+        return not_modified
+
+    return await run_sync(db, compute_trends, granularity, date_from, date_to, categories)
@@ -2,13 +2,20 @@ from typing import Any
 
 import httpx
 from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
+from app import http_client
 from app.config import settings
+from app.currency import RateSnapshot
+from app.rate_cache import RateCache
 
 router = APIRouter()
 
-TIMEOUT_SECONDS = 10.0
+_rate_cache = RateCache(
+    ttl=settings.EXCHANGE_RATE_CACHE_TTL_SECONDS,
+    stale_ttl=settings.EXCHANGE_RATE_CACHE_STALE_SECONDS,
+    max_entries=settings.EXCHANGE_RATE_CACHE_MAX_ENTRIES,
+)
 
 
 class ExchangeRateResponse(BaseModel):
@@ -19,30 +26,40 @@ class ExchangeRateResponse(BaseModel):
     converted_amount: float
 
 
+class ConversionRequest(BaseModel):
+    amount: float = Field(..., gt=0)
+    from_currency: str = "USD"
+    to_currency: str = "EUR"
+
+
+class BatchConversionRequest(BaseModel):
+    conversions: list[ConversionRequest] = Field(..., max_length=settings.CONVERT_BATCH_MAX_ITEMS)
+
+
 async def _fetch_exchange_rates(base_currency: str) -> dict[str, Any]:
     """Fetch exchange rates from external API."""
     url = f"{settings.EXCHANGE_RATE_API_URL}/{base_currency.upper()}"
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, timeout=TIMEOUT_SECONDS)
-        response.raise_for_status()
-        return response.json()
+    response = await http_client.get_client().get(url)
+    response.raise_for_status()
+    return response.json()
 
 
-@router.get("/rates/{base_currency}")
-async def get_exchange_rates(
-    base_currency: str = "USD",
-) -> dict[str, Any]:
+async def _fetch_rate_snapshot(base_currency: str) -> RateSnapshot:
+    """Fetch one upstream rate table and parse it into a snapshot."""
+    return RateSnapshot.from_payload(await _fetch_exchange_rates(base_currency), base_currency)
+
+
+async def get_rate_snapshot() -> RateSnapshot:
     """
-    Get exchange rates for a base currency.
-    This integrates with exchangerate-api.com (free tier, no API key required).
+    Get the in-memory rate snapshot for the canonical base currency.
+
+    Every conversion triangulates through this one cached table, so a single
+    upstream fetch serves all currency pairs.
     """
     try:
-        data = await _fetch_exchange_rates(base_currency)
-        return {
-            "base": data.get("base", base_currency.upper()),
-            "date": data.get("date"),
-            "rates": data.get("rates", {}),
-        }
+        return await _rate_cache.get(
+            settings.EXCHANGE_RATE_BASE_CURRENCY.upper(), _fetch_rate_snapshot
+        )
     except httpx.HTTPStatusError as e:
         raise HTTPException(
             status_code=e.response.status_code,
@@ -53,6 +70,33 @@ async def get_exchange_rates(
             status_code=503,
             detail=f"Service unavailable: {str(e)}",
         )
+    except (ValueError, KeyError) as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Invalid response from exchange rate API: {str(e)}",
+        )
+
+
+@router.get("/rates/{base_currency}")
+async def get_exchange_rates(
+    base_currency: str = "USD",
+) -> dict[str, Any]:
+    """
+    Get exchange rates for a base currency.
+    This integrates with exchangerate-api.com (free tier, no API key required);
+    tables for every base are derived from one cached snapshot.
+    """
+    snapshot = await get_rate_snapshot()
+    if base_currency not in snapshot:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Currency {base_currency} not found in exchange rates",
+        )
+    return {
+        "base": base_currency.upper(),
+        "date": snapshot.date,
+        "rates": snapshot.table(base_currency),
+    }
 
 
 @router.get("/convert")
@@ -74,39 +118,61 @@ async def convert_currency(
             converted_amount=round(amount, 2),
         )
 
-    try:
-        data = await _fetch_exchange_rates(from_currency)
-        rates = data.get("rates", {})
-        target_upper = to_currency.upper()
-
-        if target_upper not in rates:
+    snapshot = await get_rate_snapshot()
+    for currency in (from_currency, to_currency):
+        if currency not in snapshot:
             raise HTTPException(
                 status_code=400,
-                detail=f"Currency {to_currency} not found in exchange rates",
+                detail=f"Currency {currency} not found in exchange rates",
             )
 
-        rate = float(rates[target_upper])
-        converted_amount = round(amount * rate, 2)
+    rate = snapshot.rate(from_currency, to_currency)
+    return ExchangeRateResponse(
+        base_currency=from_currency.upper(),
+        target_currency=to_currency.upper(),
+        rate=rate,
+        amount=amount,
+        converted_amount=round(amount * rate, 2),
+    )
 
-        return ExchangeRateResponse(
-            base_currency=from_currency.upper(),
-            target_currency=target_upper,
-            rate=rate,
-            amount=amount,
-            converted_amount=converted_amount,
-        )
-    except httpx.HTTPStatusError as e:
-        raise HTTPException(
-            status_code=e.response.status_code,
-            detail=f"Failed to fetch exchange rates: {e.response.text}",
-        )
-    except httpx.RequestError as e:
+
+@router.post("/convert/batch")
+async def convert_currency_batch(
+    request: BatchConversionRequest,
+) -> list[ExchangeRateResponse]:
+    """
+    Convert many amounts in one request.
+
+    All conversions are computed against the same in-memory rate snapshot, so
+    the whole batch costs at most one upstream fetch. Results follow the input
+    order.
+    """
+    snapshot = await get_rate_snapshot()
+    unknown = sorted(
+        {
+            currency.upper()
+            for conversion in request.conversions
+            for currency in (conversion.from_currency, conversion.to_currency)
+            if currency not in snapshot
+        }
+    )
+    if unknown:
         raise HTTPException(
-            status_code=503,
-            detail=f"Service unavailable: {str(e)}",
+            status_code=400,
+            detail=f"Currencies not found in exchange rates: {', '.join(unknown)}",
         )
-    except (ValueError, KeyError) as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Invalid response from exchange rate API: {str(e)}",
+
+    results = snapshot.convert_many(
+        (conversion.amount, conversion.from_currency, conversion.to_currency)
+        for conversion in request.conversions
+    )
+    return [
+        ExchangeRateResponse(
+            base_currency=conversion.from_currency.upper(),
+            target_currency=conversion.to_currency.upper(),
+            rate=rate,
+            amount=conversion.amount,
+            converted_amount=converted_amount,
         )
+        for conversion, (rate, converted_amount) in zip(request.conversions, results, strict=True)
+    ]
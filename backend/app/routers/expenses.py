@@ -1,75 +1,456 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import base64
+import binascii
+import decimal
+import json
+import math
+from datetime import date, datetime
+from typing import Any, Literal
+
+import anyio
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row, and_, asc, delete, desc, insert, literal, select, tuple_, update
 from sqlalchemy.orm import Session
 
-from app import models, schemas
-from app.database import get_db
+from app import export, fast_json, ingest, models, money, rollups, schemas, search, versioning
+from app.config import settings
+from app.database import get_async_db, get_db, run_sync
+from app.response_cache import dashboard_cache
 
 router = APIRouter()
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+SortKey = Literal["created_at", "expense_date", "amount"]
+SortOrder = Literal["asc", "desc"]
+
+_SORT_COLUMNS = {
+    "created_at": models.Expense.created_at,
+    "expense_date": models.Expense.expense_date,
+    "amount": models.Expense.amount,
+}
+
+
+_expenses = models.Expense.__table__
+
+# Columns the rollups are keyed and summed on
+_ROLLUP_COLUMNS = (_expenses.c.category, _expenses.c.expense_date, _expenses.c.amount)
 
-def _get_expense_or_404(expense_id: int, db: Session) -> models.Expense:
+# Bounds of the INTEGER ids and BIGINT cents a cursor position is bound as
+_MAX_ID = 2**31 - 1
+_MAX_CENTS = 2**63 - 1
+
+
+def _not_found(expense_id: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Expense with id {expense_id} not found",
+    )
+
+
+def _get_expense_or_404(db: Session, expense_id: int) -> models.Expense:
     """Helper function to get expense or raise 404."""
     expense = db.query(models.Expense).filter(models.Expense.id == expense_id).first()
     if expense is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Expense with id {expense_id} not found",
-        )
+        raise _not_found(expense_id)
     return expense
 
 
+def _encode_cursor(expense: Row, sort_by: str) -> str:
+    """Encode the (sort key, id) keyset position after an expense as an opaque token."""
+    value = getattr(expense, sort_by)
+    if isinstance(value, date):
+        value = value.isoformat()
+    payload = json.dumps([sort_by, value, expense.id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort_by: str) -> tuple[Any, int]:
+    """Decode a cursor produced by ``_encode_cursor`` for the same sort key or raise 400."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort_by, value, expense_id = json.loads(base64.urlsafe_b64decode(padded))
+        if cursor_sort_by != sort_by:
+            raise ValueError(f"cursor was issued for sort_by={cursor_sort_by}")
+        if sort_by == "created_at":
+            value = datetime.fromisoformat(value)
+        elif sort_by == "expense_date":
+            value = date.fromisoformat(value)
+        else:
+            value = float(value)
+            if not math.isfinite(value):
+                raise ValueError("cursor value is not finite")
+            if sort_by == "amount" and abs(money.to_cents(value)) > _MAX_CENTS:
+                raise ValueError("cursor amount is out of range")
+        # bool is an int subclass, and floats would be truncated
+        if type(expense_id) is not int or abs(expense_id) > _MAX_ID:
+            raise ValueError("cursor id is not an expense id")
+        return value, expense_id
+    except (binascii.Error, ValueError, TypeError, decimal.InvalidOperation, OverflowError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        ) from e
+
+
+def expense_filters(
+    category: models.ExpenseCategory | None = Query(None, description="Only this category"),
+    date_from: date | None = Query(None, description="Earliest expense_date (inclusive)"),
+    date_to: date | None = Query(None, description="Latest expense_date (inclusive)"),
+    min_amount: float | None = Query(
+        None, ge=0, le=money.MAX_AMOUNT, description="Minimum amount (inclusive)"
+    ),
+    max_amount: float | None = Query(
+        None, ge=0, le=money.MAX_AMOUNT, description="Maximum amount (inclusive)"
+    ),
+    title_prefix: str | None = Query(
+        None, min_length=1, max_length=200, description="Case-sensitive title prefix"
+    ),
+) -> schemas.ExpenseFilters:
+    """Dependency collecting the expense filter query parameters."""
+    return schemas.ExpenseFilters(
+        category=category,
+        date_from=date_from,
+        date_to=date_to,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        title_prefix=title_prefix,
+    )
+
+
+def _prefix_successor(prefix: str) -> str:
+    """Smallest string greater than every string starting with ``prefix``."""
+    while prefix and ord(prefix[-1]) == 0x10FFFF:
+        prefix = prefix[:-1]
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1) if prefix else ""
+
+
+def _filter_conditions(filters: schemas.ExpenseFilters, db: Session) -> list:
+    """
+    Translate filters into sargable predicates.
+
+    Every predicate is an equality or range on an indexed column, so each
+    combination is served by one of the composite indexes on ``models.Expense``.
+    """
+    conditions = []
+    if filters.category is not None:
+        conditions.append(models.Expense.category == filters.category)
+    if filters.date_from is not None:
+        conditions.append(models.Expense.expense_date >= filters.date_from)
+    if filters.date_to is not None:
+        conditions.append(models.Expense.expense_date <= filters.date_to)
+    if filters.min_amount is not None:
+        conditions.append(models.Expense.amount >= filters.min_amount)
+    if filters.max_amount is not None:
+        conditions.append(models.Expense.amount <= filters.max_amount)
+    if filters.title_prefix is not None:
+        if db.get_bind().dialect.name == "postgresql":
+            # Served by ix_expenses_title_pattern; a range under a linguistic
+            # collation could miss matches
+            conditions.append(
+                models.Expense.title.startswith(filters.title_prefix, autoescape=True)
+            )
+        else:
+            # Under binary collation the prefix is exactly a range on ix_expenses_title
+            successor = _prefix_successor(filters.title_prefix)
+            prefix_range = models.Expense.title >= filters.title_prefix
+            if successor:
+                prefix_range = and_(prefix_range, models.Expense.title < successor)
+            conditions.append(prefix_range)
+    return conditions
+
+
+def _create_expense(db: Session, expense: schemas.ExpenseCreate) -> Row:
+    # RETURNING hands back the server-generated id and created_at, so no refresh SELECT
+    row = db.execute(insert(_expenses).values(**expense.model_dump()).returning(*_expenses.c)).one()
+    rollups.apply_changes(db, [rollups.change_for(row)])
+    versioning.bump(db)
+    db.commit()
+    return row
+
+
 @router.post(
     "/",
     response_model=schemas.ExpenseResponse,
     status_code=status.HTTP_201_CREATED,
 )
-def create_expense(
+async def create_expense(
     expense: schemas.ExpenseCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_async_db),
 ) -> schemas.ExpenseResponse:
     """Create a new expense."""
-    db_expense = models.Expense(**expense.model_dump())
-    db.add(db_expense)
+    row = await run_sync(db, _create_expense, expense)
+    await dashboard_cache.invalidate()
+    return row
+
+
+@router.post("/bulk", response_model=schemas.BulkCreateResponse)
+def create_expenses_bulk(
+    items: list[Any] = Body(..., description="Expenses to create, same shape as POST /"),
+    chunk_size: int | None = Query(
+        None, ge=1, le=10000, description="Rows per INSERT statement (defaults to settings)"
+    ),
+    db: Session = Depends(get_db),
+) -> schemas.BulkCreateResponse:
+    """
+    Create many expenses in one request.
+
+    Items are validated in a single pass; invalid ones are reported by index
+    while the valid ones are inserted in chunked multi-row INSERTs within one
+    transaction.
+    """
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.BULK_MAX_ITEMS} expenses can be created per request",
+        )
+
+    expenses, errors = ingest.validate_items(items)
+    ids = ingest.insert_expenses(db, expenses, chunk_size=chunk_size)
     db.commit()
-    db.refresh(db_expense)
-    return db_expense
+    anyio.from_thread.run(dashboard_cache.invalidate)
+    return schemas.BulkCreateResponse(created=len(ids), ids=ids, errors=errors)
+
+
+@router.post("/import", response_model=schemas.ImportProgress)
+def import_expenses(
+    file: UploadFile = File(..., description="CSV (with header row) or NDJSON file of expenses"),
+    import_format: Literal["csv", "ndjson"] | None = Query(
+        None, alias="format", description="File format (inferred from the file name if omitted)"
+    ),
+    import_id: str | None = Query(
+        None, max_length=64, description="Client-chosen id for polling progress"
+    ),
+    db: Session = Depends(get_db),
+) -> schemas.ImportProgress:
+    """
+    Import a large CSV or NDJSON file of expenses.
+
+    Rows are parsed, validated and inserted as a stream in bounded batches, each
+    committed as it is flushed. Progress can be polled from
+    ``GET /api/expenses/import/{import_id}`` while the upload is processed; the
+    response is the final summary of accepted and rejected rows.
+    """
+    if import_format is None:
+        filename = (file.filename or "").lower()
+        if filename.endswith(".csv"):
+            import_format = "csv"
+        elif filename.endswith((".ndjson", ".jsonl")):
+            import_format = "ndjson"
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Could not infer the file format; pass format=csv or format=ndjson",
+            )
+    if import_id is not None and ingest.get_import(import_id) is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Import {import_id} already exists",
+        )
+
+    progress = ingest.start_import(import_format, import_id)
+    try:
+        return ingest.run_import(db, file.file, progress)
+    finally:
+        # Batches commit as they go, so even a failed import may have written rows
+        anyio.from_thread.run(dashboard_cache.invalidate)
+
+
+@router.get("/import/{import_id}", response_model=schemas.ImportProgress)
+def get_import_progress(import_id: str) -> schemas.ImportProgress:
+    """Get the progress counters of a running or recently finished import."""
+    progress = ingest.get_import(import_id)
+    if progress is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Import {import_id} not found",
+        )
+    return progress
+
+
+def _list_expenses(
+    db: Session,
+    filters: schemas.ExpenseFilters,
+    skip: int,
+    limit: int,
+    position: tuple[Any, int] | None,
+    sort_by: SortKey,
+    order: SortOrder,
+) -> list[Row]:
+    """
+    One page of expenses plus one extra row telling whether another page exists.
+
+    Rows are plain column tuples for ``fast_json``; no ORM objects are built.
+    """
+    sort_column = _SORT_COLUMNS[sort_by]
+    query = select(*fast_json.EXPENSE_COLUMNS).where(*_filter_conditions(filters, db))
+    if position is not None:
+        value, expense_id = position
+        keyset = tuple_(sort_column, models.Expense.id)
+        boundary = tuple_(literal(value, sort_column.type), expense_id)
+        query = query.where(keyset < boundary if order == "desc" else keyset > boundary)
+        if sort_by == "expense_date":
+            # Implied by the row comparison, but only a plain bound lets
+            # PostgreSQL prune partitions (see app.partitioning)
+            query = query.where(sort_column <= value if order == "desc" else sort_column >= value)
+
+    direction = desc if order == "desc" else asc
+    query = query.order_by(direction(sort_column), direction(models.Expense.id))
+    return db.execute(query.offset(skip).limit(limit + 1)).all()
 
 
 @router.get("/", response_model=list[schemas.ExpenseResponse])
-def get_expenses(
+async def get_expenses(
+    request: Request,
+    response: Response,
+    filters: schemas.ExpenseFilters = Depends(expense_filters),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
-    db: Session = Depends(get_db),
+    cursor: str | None = Query(
+        None, description=f"Opaque cursor from a previous page's {NEXT_CURSOR_HEADER} header"
+    ),
+    sort_by: SortKey = Query("created_at", description="Column to sort by"),
+    order: SortOrder = Query("desc", description="Sort direction"),
+    db: Session = Depends(get_async_db),
+) -> list[schemas.ExpenseResponse]:
+    """
+    Get expenses matching the filters, newest first by default.
+
+    Pages can be walked with ``skip``/``limit`` or, preferably, by passing the
+    ``X-Next-Cursor`` response header back as ``cursor`` (with the same
+    filters and sort). Cursor pages seek straight to their position on the
+    (sort key, id) index, so deep pages cost the same as the first one and
+    concurrent inserts do not shift them.
+
+    Responses carry an ETag; a matching ``If-None-Match`` gets a 304 without
+    running the query.
+    """
+    position = None
+    if cursor is not None:
+        if skip:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="skip cannot be combined with cursor",
+            )
+        position = _decode_cursor(cursor, sort_by)
+
+    not_modified = versioning.check(request, response, await run_sync(db, versioning.current))
+    if not_modified is not None:
+        return not_modified
+
+    rows = await run_sync(db, _list_expenses, filters, skip, limit, position, sort_by, order)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = _encode_cursor(rows[-1], sort_by)
+    # Rendered straight from the rows, skipping per-row response_model validation
+    return fast_json.ExpenseRowsResponse(rows, headers=response.headers)
+
+
+def _search_expenses(
+    db: Session,
+    query: str,
+    filters: schemas.ExpenseFilters,
+    limit: int,
+    position: tuple[float, int] | None,
+) -> list[Row]:
+    return search.search_expenses(db, query, _filter_conditions(filters, db), limit, position)
+
+
+@router.get("/search", response_model=list[schemas.ExpenseResponse])
+async def search_expenses(
+    request: Request,
+    response: Response,
+    q: str = Query(
+        ..., min_length=1, max_length=200, description="Words to find in titles and descriptions"
+    ),
+    filters: schemas.ExpenseFilters = Depends(expense_filters),
+    limit: int = Query(50, ge=1, le=1000, description="Maximum number of records to return"),
+    cursor: str | None = Query(
+        None, description=f"Opaque cursor from a previous page's {NEXT_CURSOR_HEADER} header"
+    ),
+    db: Session = Depends(get_async_db),
 ) -> list[schemas.ExpenseResponse]:
-    """Get all expenses with pagination."""
-    expenses = (
-        db.query(models.Expense)
-        .order_by(models.Expense.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    """
+    Full-text search over titles and descriptions, best match first.
+
+    Every word of ``q`` must match, with English stemming ("groceries" finds
+    "grocery"). The list filters narrow the matches further. Walk further
+    pages by passing the ``X-Next-Cursor`` response header back as ``cursor``
+    with the same ``q`` and filters.
+    """
+    position = _decode_cursor(cursor, "rank") if cursor is not None else None
+
+    not_modified = versioning.check(request, response, await run_sync(db, versioning.current))
+    if not_modified is not None:
+        return not_modified
+
+    rows = await run_sync(db, _search_expenses, q, filters, limit, position)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = _encode_cursor(rows[-1], "rank")
+    return fast_json.ExpenseRowsResponse(rows, headers=response.headers)
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_expenses(
+    filters: schemas.ExpenseFilters = Depends(expense_filters),
+    export_format: Literal["csv", "ndjson"] = Query(
+        "csv", alias="format", description="Output format"
+    ),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """
+    Stream every expense matching the filters as CSV or NDJSON, ordered by id.
+
+    Unlike ``GET /`` there is no row limit; rows are read through a server-side
+    cursor and written out batch by batch.
+    """
+    batches = export.stream_rows(db, _filter_conditions(filters, db))
+    return StreamingResponse(
+        export.WRITERS[export_format](batches),
+        media_type=export.MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="expenses.{export_format}"'},
     )
-    return expenses
 
 
 @router.get("/{expense_id}", response_model=schemas.ExpenseResponse)
-def get_expense(
+async def get_expense(
     expense_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_async_db),
 ) -> schemas.ExpenseResponse:
-    """Get a specific expense by ID."""
-    return _get_expense_or_404(expense_id, db)
+    """Get a specific expense by ID (with ETag / ``If-None-Match`` support)."""
+    version = await run_sync(db, versioning.current)
+    # Looked up before answering 304, which ``If-None-Match: *`` would otherwise
+    # get for an expense that does not exist
+    expense = await run_sync(db, _get_expense_or_404, expense_id)
+    not_modified = versioning.check(request, response, version)
+    if not_modified is not None:
+        return not_modified
+    return expense
 
 
-@router.put("/{expense_id}", response_model=schemas.ExpenseResponse)
-def update_expense(
-    expense_id: int,
-    expense: schemas.ExpenseUpdate,
-    db: Session = Depends(get_db),
-) -> schemas.ExpenseResponse:
-    """Update an existing expense (full update)."""
-    db_expense = _get_expense_or_404(expense_id, db)
+def _update_expense(db: Session, expense_id: int, expense: schemas.ExpenseUpdate) -> Row:
+    """
+    Apply an update in one UPDATE ... RETURNING round trip.
 
+    The rollups need the values being replaced. On PostgreSQL they come back
+    from the same statement, joined from a row-locked sub-select so a
+    concurrent update cannot slip in between. SQLite's RETURNING cannot see
+    joined tables, so it reads them with a SELECT first.
+    """
     update_data = expense.model_dump(exclude_unset=True)
     if not update_data:
         raise HTTPException(
@@ -77,31 +458,85 @@ def update_expense(
             detail="No fields provided for update",
         )
 
-    for field, value in update_data.items():
-        setattr(db_expense, field, value)
+    if db.get_bind().dialect.name == "postgresql":
+        old = (
+            select(_expenses.c.id, *_ROLLUP_COLUMNS)
+            .where(_expenses.c.id == expense_id)
+            .with_for_update()
+            .subquery("old")
+        )
+        row = db.execute(
+            update(_expenses)
+            .where(_expenses.c.id == old.c.id)
+            .values(**update_data)
+            .returning(*_expenses.c, *(old.c[column.name] for column in _ROLLUP_COLUMNS))
+        ).one_or_none()
+        old_values = row[-len(_ROLLUP_COLUMNS) :] if row is not None else None
+    else:
+        old_values = db.execute(
+            select(*_ROLLUP_COLUMNS).where(_expenses.c.id == expense_id)
+        ).one_or_none()
+        row = (
+            db.execute(
+                update(_expenses)
+                .where(_expenses.c.id == expense_id)
+                .values(**update_data)
+                .returning(*_expenses.c)
+            ).one()
+            if old_values is not None
+            else None
+        )
+    if row is None:
+        raise _not_found(expense_id)
 
+    old_category, old_date, old_amount = old_values
+    removed = (old_category, old_date, -money.to_cents(old_amount), -1)
+    rollups.apply_changes(db, [removed, rollups.change_for(row)])
+    versioning.bump(db)
     db.commit()
-    db.refresh(db_expense)
-    return db_expense
+    return row
+
+
+@router.put("/{expense_id}", response_model=schemas.ExpenseResponse)
+async def update_expense(
+    expense_id: int,
+    expense: schemas.ExpenseUpdate,
+    db: Session = Depends(get_async_db),
+) -> schemas.ExpenseResponse:
+    """Update an existing expense (full update)."""
+    row = await run_sync(db, _update_expense, expense_id, expense)
+    await dashboard_cache.invalidate()
+    return row
 
 
 @router.patch("/{expense_id}", response_model=schemas.ExpenseResponse)
-def patch_expense(
+async def patch_expense(
     expense_id: int,
     expense: schemas.ExpenseUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_async_db),
 ) -> schemas.ExpenseResponse:
     """Partially update an existing expense."""
-    return update_expense(expense_id, expense, db)
+    return await update_expense(expense_id, expense, db)
+
+
+def _delete_expense(db: Session, expense_id: int) -> None:
+    # RETURNING tells whether the row existed and what to take off the rollups
+    row = db.execute(
+        delete(_expenses).where(_expenses.c.id == expense_id).returning(*_ROLLUP_COLUMNS)
+    ).one_or_none()
+    if row is None:
+        raise _not_found(expense_id)
+    rollups.apply_changes(db, [rollups.change_for(row, sign=-1)])
+    versioning.bump(db)
+    db.commit()
 
 
 @router.delete("/{expense_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_expense(
+async def delete_expense(
     expense_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_async_db),
 ) -> None:
     """Delete an expense."""
-    db_expense = _get_expense_or_404(expense_id, db)
-    db.delete(db_expense)
-    db.commit()
+    await run_sync(db, _delete_expense, expense_id)
+    await dashboard_cache.invalidate()
     return None
@@ -0,0 +1,47 @@
+from typing import Any
+
+from fastapi import APIRouter, Query
+from fastapi.responses import PlainTextResponse
+
+from app import diagnostics, request_metrics
+from app.database import pool_metrics
+from app.response_cache import dashboard_cache
+from app.routers.exchange_rate import _rate_cache
+
+router = APIRouter()
+
+
+@router.get("", response_class=PlainTextResponse)
+def get_metrics() -> PlainTextResponse:
+    """Request, database and pool metrics in the Prometheus text exposition format."""
+    return PlainTextResponse(
+        request_metrics.render(pool_metrics), media_type=request_metrics.CONTENT_TYPE
+    )
+
+
+@router.get("/pool")
+def get_pool_metrics() -> dict[str, dict[str, Any]]:
+    """Connection pool saturation per engine (checkout waits, connections in use, overflow)."""
+    return {name: metrics.snapshot() for name, metrics in pool_metrics.items()}
+
+
+@router.get("/diagnostics")
+def get_diagnostics(
+    limit: int = Query(10, ge=1, le=100, description="Offenders to list per category"),
+) -> dict[str, Any]:
+    """Top slow statements and routes issuing too many queries (needs DIAGNOSTICS_ENABLED)."""
+    return diagnostics.top_offenders(limit)
+
+
+@router.get("/cache")
+def get_cache_metrics() -> dict[str, dict[str, int]]:
+    """Hit/miss counters of the dashboard response cache and the exchange rate cache."""
+    return {
+        "dashboard": dashboard_cache.stats(),
+        "exchange_rates": {
+            "hits": _rate_cache.hits,
+            "stale_hits": _rate_cache.stale_hits,
+            "misses": _rate_cache.misses,
+            "refreshes": _rate_cache.refreshes,
+        },
+    }
@@ -0,0 +1,111 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import delete, update
+from sqlalchemy.orm import Session
+
+from app import models, recurring, schemas, versioning
+from app.database import get_async_db, run_sync
+from app.response_cache import dashboard_cache
+
+router = APIRouter()
+
+
+def _get_rule_or_404(db: Session, rule_id: int) -> models.RecurringExpense:
+    rule = db.get(models.RecurringExpense, rule_id)
+    if rule is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Recurring expense with id {rule_id} not found",
+        )
+    return rule
+
+
+def _create_rule(
+    db: Session, rule_data: schemas.RecurringExpenseCreate
+) -> tuple[models.RecurringExpense, int]:
+    rule = models.RecurringExpense(**rule_data.model_dump(), next_index=0)
+    rule.next_date = recurring.occurrence_date(rule, 0)
+    db.add(rule)
+    db.commit()
+    # Post the occurrences already due (a past start_date) right away, up to
+    # RECURRING_MAX_OCCURRENCES of them; the scheduler catches up on the rest
+    created = recurring.materialize_due(db, date.today(), rule_ids=[rule.id], max_batches=1)
+    db.refresh(rule)
+    return rule, created
+
+
+@router.post(
+    "/",
+    response_model=schemas.RecurringExpenseResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_recurring_expense(
+    rule_data: schemas.RecurringExpenseCreate,
+    db: Session = Depends(get_async_db),
+) -> schemas.RecurringExpenseResponse:
+    """
+    Create a recurring expense rule.
+
+    Occurrences from ``start_date`` up to today are posted immediately, up to
+    ``RECURRING_MAX_OCCURRENCES`` of them; the background scheduler posts any
+    further past ones, and later ones as they fall due.
+    """
+    rule, created = await run_sync(db, _create_rule, rule_data)
+    if created:
+        await dashboard_cache.invalidate()
+    return rule
+
+
+def _list_rules(db: Session, skip: int, limit: int) -> list[models.RecurringExpense]:
+    return (
+        db.query(models.RecurringExpense)
+        .order_by(models.RecurringExpense.id)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
+@router.get("/", response_model=list[schemas.RecurringExpenseResponse])
+async def get_recurring_expenses(
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
+    db: Session = Depends(get_async_db),
+) -> list[schemas.RecurringExpenseResponse]:
+    """Get recurring expense rules, oldest first."""
+    return await run_sync(db, _list_rules, skip, limit)
+
+
+@router.get("/{rule_id}", response_model=schemas.RecurringExpenseResponse)
+async def get_recurring_expense(
+    rule_id: int,
+    db: Session = Depends(get_async_db),
+) -> schemas.RecurringExpenseResponse:
+    """Get a specific recurring expense rule by ID."""
+    return await run_sync(db, _get_rule_or_404, rule_id)
+
+
+def _delete_rule(db: Session, rule_id: int) -> None:
+    _get_rule_or_404(db, rule_id)
+    # Posted occurrences stay as ordinary expenses. Detach them explicitly, as
+    # SQLite does not enforce ON DELETE SET NULL unless foreign keys are enabled
+    detached = db.execute(
+        update(models.Expense)
+        .where(models.Expense.recurring_expense_id == rule_id)
+        .values(recurring_expense_id=None)
+    )
+    if detached.rowcount:
+        versioning.bump(db)
+    db.execute(delete(models.RecurringExpense).where(models.RecurringExpense.id == rule_id))
+    db.commit()
+
+
+@router.delete("/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_recurring_expense(
+    rule_id: int,
+    db: Session = Depends(get_async_db),
+) -> None:
+    """Delete a recurring expense rule; expenses it already posted are kept."""
+    await run_sync(db, _delete_rule, rule_id)
+    return None
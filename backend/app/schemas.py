@@ -1,15 +1,21 @@
 from datetime import date, datetime
+from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
-from app.models import ExpenseCategory
+from app.models import ExpenseCategory, RecurrenceFrequency
+from app.money import MAX_AMOUNT
 
 
-class ExpenseBase(BaseModel):
+class ExpenseDetails(BaseModel):
     title: str = Field(..., min_length=1, max_length=200)
-    amount: float = Field(..., gt=0)
+    # Stored as whole cents (see app.money), so one cent is the smallest amount
+    amount: float = Field(..., ge=0.01, le=MAX_AMOUNT)
     category: ExpenseCategory
     description: str | None = Field(None, max_length=1000)
+
+
+class ExpenseBase(ExpenseDetails):
     expense_date: date
 
 
@@ -19,20 +25,81 @@ class ExpenseCreate(ExpenseBase):
 
 class ExpenseUpdate(BaseModel):
     title: str | None = Field(None, min_length=1, max_length=200)
-    amount: float | None = Field(None, gt=0)
+    amount: float | None = Field(None, ge=0.01, le=MAX_AMOUNT)
     category: ExpenseCategory | None = None
     description: str | None = Field(None, max_length=1000)
     expense_date: date | None = None
 
 
 class ExpenseResponse(ExpenseBase):
+    # Stored amounts are reported as they are; the bounds apply to input
+    amount: float
     id: int
     created_at: datetime
     updated_at: datetime | None = None
+    recurring_expense_id: int | None = None
 
     model_config = {"from_attributes": True}
 
 
+class RecurringExpenseCreate(ExpenseDetails):
+    """Expense template plus an RRULE-style schedule; the first occurrence is ``start_date``."""
+
+    frequency: RecurrenceFrequency
+    interval: int = Field(1, ge=1, le=1000)
+    start_date: date
+    end_date: date | None = None
+    count: int | None = Field(None, ge=1)
+
+    @model_validator(mode="after")
+    def check_end_date(self) -> "RecurringExpenseCreate":
+        if self.end_date is not None and self.end_date < self.start_date:
+            raise ValueError("end_date must not be before start_date")
+        return self
+
+
+class RecurringExpenseResponse(RecurringExpenseCreate):
+    id: int
+    next_date: date | None
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class BulkItemError(BaseModel):
+    index: int
+    errors: list[dict[str, Any]]
+
+
+class BulkCreateResponse(BaseModel):
+    created: int
+    ids: list[int]
+    errors: list[BulkItemError]
+
+
+class ImportProgress(BaseModel):
+    id: str
+    format: str
+    status: str = "running"
+    rows_read: int = 0
+    accepted: int = 0
+    rejected: int = 0
+    errors: list[BulkItemError] = []
+    started_at: datetime
+    finished_at: datetime | None = None
+
+
+class ExpenseFilters(BaseModel):
+    """Filters for listing expenses; all bounds are inclusive."""
+
+    category: ExpenseCategory | None = None
+    date_from: date | None = None
+    date_to: date | None = None
+    min_amount: float | None = Field(None, ge=0, le=MAX_AMOUNT)
+    max_amount: float | None = Field(None, ge=0, le=MAX_AMOUNT)
+    title_prefix: str | None = None
+
+
 class MonthlyTrend(BaseModel):
     year: int
     month: int
@@ -46,3 +113,19 @@ class DashboardStats(BaseModel):
     monthly_trends: list[MonthlyTrend]
     average_expense: float
     total_count: int
+
+
+class TrendBucket(BaseModel):
+    start: date
+    total: float
+    count: int
+
+
+class ExpenseTrends(BaseModel):
+    """Expense totals per time bucket, with empty buckets reported as zero."""
+
+    granularity: str
+    date_from: date
+    date_to: date
+    categories: list[ExpenseCategory]
+    buckets: list[TrendBucket]
@@ -0,0 +1,77 @@
+"""
+Full-text search over expense titles and descriptions.
+
+PostgreSQL matches against the stored ``search_vector`` column through its
+GIN index (``plainto_tsquery``) and ranks with ``ts_rank``; SQLite, used by
+the tests, matches the ``expenses_fts`` FTS5 index and ranks with ``bm25``.
+Both use English stemming and require every search term to match. Ranks are
+higher-is-better on both, and pages are keyset-paginated on (rank, id), so
+the cost of a page depends on the number of matches, never on table size.
+"""
+
+import re
+
+from sqlalchemy import Float, Row, cast, desc, func, literal_column, select, table, tuple_
+from sqlalchemy.orm import Session
+
+from app import fast_json, models
+
+_expenses = models.Expense.__table__
+_search_vector = literal_column("expenses.search_vector")
+_config = literal_column(f"'{models.SEARCH_CONFIG}'")
+_fts = table("expenses_fts")
+_fts_table = literal_column("expenses_fts")
+
+_TERM = re.compile(r"\w+")
+
+
+def terms(query: str) -> list[str]:
+    """The words of a search query; punctuation and operators are ignored."""
+    return _TERM.findall(query)
+
+
+def _fts_match(words: list[str]) -> str:
+    # Quoting makes every term a plain string in the FTS5 query syntax
+    return " ".join(f'"{word}"' for word in words)
+
+
+def search_expenses(
+    db: Session,
+    query: str,
+    conditions: list,
+    limit: int,
+    position: tuple[float, int] | None,
+) -> list[Row]:
+    """
+    One page of expenses matching every term of ``query``, best match first.
+
+    Rows hold ``fast_json.EXPENSE_COLUMNS`` followed by ``rank``; one extra row
+    is fetched to tell whether another page exists.
+    """
+    words = terms(query)
+    if not words:
+        return []
+
+    if db.get_bind().dialect.name == "postgresql":
+        tsquery = func.plainto_tsquery(_config, " ".join(words))
+        # ts_rank is a float4; as float8 the rank a cursor carries back (a
+        # Python float) compares equal to the one the page was ordered by
+        rank = cast(func.ts_rank(_search_vector, tsquery), Float(53))
+        statement = select(*fast_json.EXPENSE_COLUMNS, rank.label("rank")).where(
+            _search_vector.op("@@")(tsquery)
+        )
+    else:
+        rank = -func.bm25(_fts_table)
+        statement = (
+            select(*fast_json.EXPENSE_COLUMNS, rank.label("rank"))
+            .select_from(
+                _expenses.join(_fts, literal_column("expenses_fts.rowid") == _expenses.c.id)
+            )
+            .where(_fts_table.match(_fts_match(words)))
+        )
+
+    statement = statement.where(*conditions)
+    if position is not None:
+        statement = statement.where(tuple_(rank, _expenses.c.id) < tuple_(*position))
+    statement = statement.order_by(desc("rank"), _expenses.c.id.desc()).limit(limit + 1)
+    return db.execute(statement).all()
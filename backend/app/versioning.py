@@ -0,0 +1,83 @@
+"""
+Data version counters and the ETags derived from them.
+
+Every write to the expenses table bumps one counter row in the same
+transaction, so reading the counter is a primary-key lookup that tells
+whether anything served by the expense and dashboard endpoints may have
+changed. Read endpoints tag responses with it and answer ``If-None-Match``
+with 304 before doing any of the real work.
+"""
+
+from fastapi import Request, Response, status
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app import models
+
+EXPENSES = "expenses"
+
+# Clients must revalidate, but may keep the body around for a 304
+CACHE_CONTROL = "no-cache"
+
+
+def bump(db: Session, name: str = EXPENSES) -> None:
+    """Mark ``name`` as changed (caller commits together with the change itself)."""
+    db.execute(
+        update(models.DataVersion)
+        .where(models.DataVersion.name == name)
+        .values(version=models.DataVersion.version + 1)
+    )
+
+
+def current(db: Session, name: str = EXPENSES) -> int | None:
+    """Current version of ``name``, or None when its counter row is missing."""
+    return db.execute(
+        select(models.DataVersion.version).where(models.DataVersion.name == name)
+    ).scalar_one_or_none()
+
+
+def etag(version: int, *variant: object) -> str:
+    """Strong ETag for a version, plus anything else the representation depends on."""
+    return '"' + "-".join(str(part) for part in (version, *variant)) + '"'
+
+
+def if_none_match(request: Request, tag: str) -> bool:
+    """Whether the request's If-None-Match already names ``tag`` (weak comparison, RFC 9110)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == tag for candidate in header.split(","))
+
+
+def not_modified(tag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": tag, "Cache-Control": CACHE_CONTROL},
+    )
+
+
+def set_headers(response: Response, tag: str) -> None:
+    response.headers["ETag"] = tag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def check(
+    request: Request, response: Response, version: int | None, *variant: object
+) -> Response | None:
+    """
+    Tag ``response`` with the ETag for ``version``, or return a 304 to send
+    instead when the client already holds that representation.
+
+    Read the version before the data: a write landing in between then only
+    makes the tag older than the body, which costs one extra full response
+    on the next poll, never a stale 304.
+    """
+    if version is None:
+        return None
+    tag = etag(version, *variant)
+    if if_none_match(request, tag):
+        return not_modified(tag)
+    set_headers(response, tag)
+    return None
@@ -0,0 +1,93 @@
+"""
+Rows per second serialized for a ``GET /api/expenses`` page.
+
+Loads a page of expenses from an in-memory SQLite database and renders it
+both ways: the previous path (ORM objects validated into ``ExpenseResponse``
+then ``jsonable_encoder`` and ``JSONResponse``) and the column-tuple orjson
+path now used by the endpoint. Checks the bodies are identical first:
+
+    python benchmarks/list_serialization.py --rows 1000 --iterations 200
+"""
+
+import argparse
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import fast_json, models, schemas  # noqa: E402
+from app.database import Base  # noqa: E402
+
+
+def _seed(session: Session, rows: int) -> None:
+    categories = list(models.ExpenseCategory)
+    session.execute(
+        insert(models.Expense),
+        [
+            {
+                "title": f"Expense {i}",
+                "amount": round(1 + (i * 7.31) % 500, 2),
+                "category": categories[i % len(categories)],
+                "description": "Benchmark row" if i % 2 else None,
+                "expense_date": date(2024, 1, 1) + timedelta(days=i % 365),
+            }
+            for i in range(rows)
+        ],
+    )
+    session.commit()
+
+
+def _orm_page(session: Session, rows: int) -> bytes:
+    expenses = session.query(models.Expense).order_by(models.Expense.id).limit(rows).all()
+    validated = [schemas.ExpenseResponse.model_validate(expense) for expense in expenses]
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def _rows_page(session: Session, rows: int) -> bytes:
+    page = session.execute(
+        select(*fast_json.EXPENSE_COLUMNS).order_by(models.Expense.id).limit(rows)
+    ).all()
+    return fast_json.ExpenseRowsResponse(page).body
+
+
+def _rate(render, session: Session, rows: int, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        # Fresh identity map each time, as every request gets its own session
+        session.expunge_all()
+        render(session, rows)
+    return rows * iterations / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare list serialization throughput.")
+    parser.add_argument("--rows", type=int, default=1000, help="Rows per page")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        _seed(session, args.rows)
+        if _orm_page(session, args.rows) != _rows_page(session, args.rows):
+            sys.exit("❌ Renderings differ")
+
+        before = _rate(_orm_page, session, args.rows, args.iterations)
+        after = _rate(_rows_page, session, args.rows, args.iterations)
+
+    print(f"📊 {args.iterations} pages of {args.rows} rows (identical bodies)")
+    print(f"   ORM + ExpenseResponse + jsonable_encoder: {before:>10,.0f} rows/s")
+    print(f"   column tuples + orjson:                   {after:>10,.0f} rows/s")
+    print(f"   speedup:                                  {after / before:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Concurrent request throughput against a running API.
+
+Start the API with a fixed worker count, once per database mode, and run the
+same load against each:
+
+    DATABASE_ASYNC=false uvicorn app.main:app --workers 1 --port 8000
+    python benchmarks/load_test.py --concurrency 200 --requests 20000
+
+    DATABASE_ASYNC=true uvicorn app.main:app --workers 1 --port 8000
+    python benchmarks/load_test.py --concurrency 200 --requests 20000
+
+Sync handlers are capped by the threadpool (40 threads by default), so once
+concurrency exceeds it requests queue for a worker; async handlers keep
+issuing queries until the connection pool is the limit.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+DEFAULT_PATHS = ["/api/expenses/?limit=20", "/api/dashboard/stats"]
+
+
+async def _worker(
+    client: httpx.AsyncClient,
+    paths: list[str],
+    remaining: list[int],
+    latencies: list[float],
+    errors: list[int],
+) -> None:
+    while remaining[0] > 0:
+        remaining[0] -= 1
+        path = paths[remaining[0] % len(paths)]
+        started = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code >= 400:
+                errors[0] += 1
+        except httpx.HTTPError:
+            errors[0] += 1
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(base_url: str, paths: list[str], concurrency: int, requests: int) -> None:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        # Warm up connections and caches before measuring
+        await asyncio.gather(*(client.get(path) for path in paths))
+
+        remaining, latencies, errors = [requests], [], [0]
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(_worker(client, paths, remaining, latencies, errors) for _ in range(concurrency))
+        )
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"📊 {len(latencies)} requests, concurrency {concurrency}, {elapsed:.2f}s")
+    print(f"   throughput: {len(latencies) / elapsed:.1f} req/s")
+    print(f"   latency p50: {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"   latency p99: {latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f} ms")
+    if errors[0]:
+        print(f"⚠️  {errors[0]} failed requests")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure concurrent request throughput.")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument(
+        "--path", action="append", dest="paths", help="Path to request (repeatable)"
+    )
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.paths or DEFAULT_PATHS, args.concurrency, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Per-request overhead of the request metrics middleware and query hooks.
+
+Drives a trivial ASGI endpoint directly (no server or HTTP client in the way)
+with and without ``MetricsMiddleware``, and runs ``SELECT 1`` on an in-memory
+SQLite engine with and without the cursor hooks, reporting the added cost in
+microseconds:
+
+    python benchmarks/metrics_overhead.py --iterations 100000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import request_metrics  # noqa: E402
+
+
+class _Route:
+    path = "/api/expenses/{expense_id}"
+
+
+async def _endpoint(scope, receive, send) -> None:
+    scope["route"] = _Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b'{"id": 1}'})
+
+
+async def _drive(app, iterations: int) -> float:
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        scope = {"type": "http", "method": "GET", "path": "/api/expenses/1"}
+        await app(scope, receive, send)
+    return time.perf_counter() - started
+
+
+def _queries(iterations: int, instrumented: bool) -> float:
+    engine = create_engine("sqlite://")
+    if instrumented:
+        request_metrics.instrument_engine(engine)
+    with engine.connect() as conn:
+        statement = text("SELECT 1")
+        started = time.perf_counter()
+        for _ in range(iterations):
+            conn.execute(statement)
+        return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure request metrics overhead.")
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+    n = args.iterations
+
+    bare = asyncio.run(_drive(_endpoint, n))
+    wrapped = asyncio.run(_drive(request_metrics.MetricsMiddleware(_endpoint), n))
+    plain_queries = _queries(n, instrumented=False)
+    hooked_queries = _queries(n, instrumented=True)
+
+    print(f"📊 {n} iterations")
+    print(f"   request without middleware: {bare / n * 1e6:.2f} µs")
+    print(f"   request with middleware:    {wrapped / n * 1e6:.2f} µs")
+    print(f"   middleware overhead:        {(wrapped - bare) / n * 1e6:.2f} µs/request")
+    print(f"   query without hooks:        {plain_queries / n * 1e6:.2f} µs")
+    print(f"   query with hooks:           {hooked_queries / n * 1e6:.2f} µs")
+    print(
+        f"   hook overhead:              {(hooked_queries - plain_queries) / n * 1e6:.2f} µs/query"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Pruned against unpruned scans of a monthly-partitioned expenses table.
+
+Creates two copies of an expenses-shaped table in a scratch schema on a
+PostgreSQL server, one plain and one partitioned by month as
+``EXPENSE_PARTITION_INTERVAL=month`` does, seeds both with the same rows,
+then times the month-bounded queries the app issues (a month's totals as
+in the dashboard and trends, a date-filtered listing page) with a plain
+range predicate, which prunes to one partition, and with the same month
+written as ``date_trunc(...) = ...``, which scans every partition:
+
+    python benchmarks/partitioning.py --database-url postgresql://... --rows 5000000
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from sqlalchemy import create_engine, text
+
+SCHEMA = "partition_benchmark"
+FIRST_MONTH = "2019-01-01"
+
+TABLE = """
+    CREATE TABLE {schema}.{name} (
+        id bigint NOT NULL,
+        title text NOT NULL,
+        amount bigint NOT NULL,
+        category text NOT NULL,
+        expense_date date NOT NULL,
+        PRIMARY KEY (id, expense_date)
+    ) {partition_by}
+"""
+
+QUERIES = {
+    "month totals": (
+        "SELECT category, sum(amount), count(*) FROM {table} WHERE {month} GROUP BY category"
+    ),
+    "listing page": (
+        "SELECT id, title, amount, expense_date FROM {table} WHERE {month} "
+        "ORDER BY expense_date DESC, id DESC LIMIT 100"
+    ),
+}
+MONTH_PREDICATES = {
+    "range": "expense_date >= '{month}' AND expense_date < date '{month}' + interval '1 month'",
+    "date_trunc": "date_trunc('month', expense_date) = '{month}'",
+}
+
+
+def _setup(conn, rows: int, months: int) -> None:
+    conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    conn.execute(text(TABLE.format(schema=SCHEMA, name="plain", partition_by="")))
+    conn.execute(
+        text(
+            TABLE.format(
+                schema=SCHEMA, name="partitioned", partition_by="PARTITION BY RANGE (expense_date)"
+            )
+        )
+    )
+    for month in range(months):
+        conn.execute(
+            text(
+                f"CREATE TABLE {SCHEMA}.partitioned_{month} PARTITION OF {SCHEMA}.partitioned "
+                f"FOR VALUES FROM (date '{FIRST_MONTH}' + interval '{month} months') "
+                f"TO (date '{FIRST_MONTH}' + interval '{month + 1} months')"
+            )
+        )
+    conn.execute(
+        text(f"CREATE TABLE {SCHEMA}.partitioned_default PARTITION OF {SCHEMA}.partitioned DEFAULT")
+    )
+
+    started = time.perf_counter()
+    for name in ("plain", "partitioned"):
+        conn.execute(
+            text(
+                f"INSERT INTO {SCHEMA}.{name} "
+                "SELECT i, 'expense ' || i, (random() * 50000)::bigint, "
+                "(ARRAY['food','transport','bills','shopping'])[1 + i % 4], "
+                f"date '{FIRST_MONTH}' + (i % (:days))::int "
+                "FROM generate_series(1, :rows) AS i"
+            ),
+            {"rows": rows, "days": months * 30},
+        )
+        conn.execute(text(f"CREATE INDEX ON {SCHEMA}.{name} (expense_date, id)"))
+        conn.execute(text(f"ANALYZE {SCHEMA}.{name}"))
+    print(f"🌱 Seeded {rows} rows into each table in {time.perf_counter() - started:.1f}s")
+
+
+def _partitions_scanned(conn, sql: str) -> int:
+    plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    def relations(node):
+        yield node.get("Relation Name")
+        for child in node.get("Plans", []):
+            yield from relations(child)
+
+    return len({name for name in relations(plan[0]["Plan"]) if name})
+
+
+def _time(conn, sql: str, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(text(sql)).all()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark partition pruning.")
+    parser.add_argument("--database-url", required=True, help="PostgreSQL URL")
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument(
+        "--months", type=int, default=60, help="Months of data (one partition each)"
+    )
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch schema afterwards")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    with engine.begin() as conn:
+        _setup(conn, args.rows, args.months)
+
+    # A month in the middle of the data
+    middle = args.months // 2
+    month = f"{2019 + middle // 12}-{middle % 12 + 1:02d}-01"
+    print(f"📊 {args.rows} rows over {args.months} months, querying {month}")
+    with engine.connect() as conn:
+        for query_name, query in QUERIES.items():
+            for table in ("plain", "partitioned"):
+                for predicate_name, predicate in MONTH_PREDICATES.items():
+                    sql = query.format(
+                        table=f"{SCHEMA}.{table}", month=predicate.format(month=month)
+                    )
+                    ms = _time(conn, sql, args.repeat)
+                    scanned = _partitions_scanned(conn, sql)
+                    label = f"{query_name}, {table}, {predicate_name}"
+                    print(f"   {label:<40} {ms:>9.2f} ms  ({scanned} relations scanned)")
+
+    if not args.keep:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+
+
+if __name__ == "__main__":
+    main()
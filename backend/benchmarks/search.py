@@ -0,0 +1,141 @@
+"""
+Full-text search latency against a ``LIKE '%term%'`` scan.
+
+Seeds a database with synthetic expenses (once; reruns reuse it), then times
+the first page of ``GET /api/expenses/search`` for a rare, a common and an
+absent term, a deep page reached through the keyset cursor, and the
+equivalent substring scan over title and description:
+
+    python benchmarks/search.py --rows 1000000
+    python benchmarks/search.py --rows 1000000 --database-url postgresql://...
+
+Defaults to a SQLite file (FTS5); pass a PostgreSQL URL to measure the GIN index.
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, func, insert, or_, select
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import fast_json, models, search  # noqa: E402
+from app.database import Base  # noqa: E402
+
+COMMON_WORDS = ["grocery", "coffee", "taxi", "lunch", "ticket", "subscription", "pharmacy"]
+# Filler vocabulary; each filler word appears in roughly 1 in 2,500 rows
+FILLER_WORDS = [f"item{n}" for n in range(5000)]
+RARE_TERM = "item4242"
+COMMON_TERM = "grocery"
+# Matches nothing, so a substring scan has to read every row
+MISSING_TERM = "parking"
+
+
+def _seed(engine, rows: int, chunk: int = 10_000) -> None:
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        existing = session.scalar(select(func.count(models.Expense.id)))
+        if existing >= rows:
+            return
+        rng = random.Random(42)
+        categories = list(models.ExpenseCategory)
+        started = time.perf_counter()
+        for offset in range(existing, rows, chunk):
+            session.execute(
+                insert(models.Expense),
+                [
+                    {
+                        "title": f"{rng.choice(COMMON_WORDS)} {rng.choice(FILLER_WORDS)}",
+                        "amount": round(rng.uniform(1, 500), 2),
+                        "category": rng.choice(categories),
+                        "description": " ".join(rng.choices(FILLER_WORDS, k=3)),
+                        "expense_date": date(2020, 1, 1) + timedelta(days=i % 2000),
+                    }
+                    for i in range(offset, min(offset + chunk, rows))
+                ],
+            )
+            session.commit()
+        print(f"🌱 Seeded {rows - existing} rows in {time.perf_counter() - started:.1f}s")
+
+
+def _time(fn, repeat: int) -> float:
+    """Median milliseconds of ``fn`` over ``repeat`` runs."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def _like_scan(session: Session, term: str, limit: int):
+    pattern = f"%{term}%"
+    return session.execute(
+        select(*fast_json.EXPENSE_COLUMNS)
+        .where(or_(models.Expense.title.like(pattern), models.Expense.description.like(pattern)))
+        .order_by(models.Expense.id.desc())
+        .limit(limit)
+    ).all()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark full-text search.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--database-url", default="sqlite:///benchmark_search.db")
+    parser.add_argument("--limit", type=int, default=50, help="Page size")
+    parser.add_argument("--pages", type=int, default=20, help="Depth of the deep-page timing")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    _seed(engine, args.rows)
+
+    with Session(engine) as session:
+
+        def first_page(term: str):
+            return search.search_expenses(session, term, [], args.limit, None)
+
+        def deep_page():
+            rows = first_page(COMMON_TERM)
+            for _ in range(args.pages - 1):
+                last = rows[args.limit - 1]
+                rows = search.search_expenses(
+                    session, COMMON_TERM, [], args.limit, (last.rank, last.id)
+                )
+
+        matches = {
+            term: len(search.search_expenses(session, term, [], args.rows, None))
+            for term in (RARE_TERM, COMMON_TERM)
+        }
+        results = {
+            f"search '{RARE_TERM}' (first page)": _time(lambda: first_page(RARE_TERM), args.repeat),
+            f"search '{COMMON_TERM}' (first page)": _time(
+                lambda: first_page(COMMON_TERM), args.repeat
+            ),
+            f"search '{COMMON_TERM}' ({args.pages} pages by cursor)": _time(
+                deep_page, max(1, args.repeat // 4)
+            ),
+            f"search '{MISSING_TERM}'": _time(lambda: first_page(MISSING_TERM), args.repeat),
+            f"LIKE '%{RARE_TERM}%' scan": _time(
+                lambda: _like_scan(session, RARE_TERM, args.limit), max(1, args.repeat // 4)
+            ),
+            f"LIKE '%{MISSING_TERM}%' scan": _time(
+                lambda: _like_scan(session, MISSING_TERM, args.limit), max(1, args.repeat // 4)
+            ),
+        }
+
+    print(f"📊 {args.rows} rows on {engine.dialect.name}, page size {args.limit}")
+    for term, count in matches.items():
+        print(f"   '{term}' matches {count} rows")
+    for name, ms in results.items():
+        print(f"   {name:<45} {ms:>9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,16 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.database import Base, get_db
+from app.database import Base, get_async_db, get_db, get_session_factory
 from app.main import app
+from app.response_cache import dashboard_cache
+from app.routers import exchange_rate
 
 # Use in-memory SQLite for testing
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -18,6 +23,22 @@ engine = create_engine(
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def clear_rate_cache():
+    """Start every test with an empty exchange rate cache."""
+    exchange_rate._rate_cache.clear()
+    yield
+    exchange_rate._rate_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_dashboard_cache():
+    """Start every test with an empty dashboard cache (versions restart with each database)."""
+    asyncio.run(dashboard_cache.invalidate())
+    dashboard_cache.reset_stats()
+    yield
+
+
 @pytest.fixture(scope="function")
 def db_session():
     """Create a fresh database for each test."""
@@ -40,6 +61,12 @@ def client(db_session):
         finally:
             pass
 
+    @asynccontextmanager
+    async def override_session():
+        yield db_session
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: override_session
     yield TestClient(app)
     app.dependency_overrides.clear()
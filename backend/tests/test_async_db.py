@@ -0,0 +1,97 @@
+import threading
+from datetime import date
+
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.config import Settings
+from app.database import Base, get_async_db, get_session_factory, run_sync
+from app.main import app
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest.fixture
+async def async_session_factory():
+    """In-memory SQLite behind the aiosqlite driver, i.e. the real AsyncSession path."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+async def async_client(async_session_factory):
+    """Client whose async handlers get an AsyncSession."""
+
+    async def override_get_async_db():
+        async with async_session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_session_factory] = lambda: async_session_factory
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+def test_async_database_url():
+    """Test the sync DATABASE_URL is mapped onto the matching asyncio driver."""
+    url = "postgresql://user:pw@db:5432/expenses"
+    assert Settings(DATABASE_URL=url).async_database_url == (
+        "postgresql+asyncpg://user:pw@db:5432/expenses"
+    )
+    assert Settings(DATABASE_URL="postgresql+psycopg2://db/x").async_database_url == (
+        "postgresql+asyncpg://db/x"
+    )
+    assert Settings(DATABASE_URL="sqlite:///./app.db").async_database_url == (
+        "sqlite+aiosqlite:///./app.db"
+    )
+
+
+async def test_run_sync_stays_on_event_loop_thread(async_session_factory):
+    """Test an AsyncSession runs the shared sync code without a worker thread."""
+    loop_thread = threading.get_ident()
+
+    def work(session):
+        return threading.get_ident(), session.execute(Base.metadata.tables["expenses"].select())
+
+    async with async_session_factory() as session:
+        thread, _ = await run_sync(session, work)
+
+    assert thread == loop_thread
+
+
+async def test_crud_over_async_session(async_client):
+    """Test the CRUD handlers end to end on the async driver."""
+    response = await async_client.post(
+        "/api/expenses/",
+        json={
+            "title": "Lunch",
+            "amount": 12.5,
+            "category": "food",
+            "expense_date": str(date.today()),
+        },
+    )
+    assert response.status_code == 201
+    expense_id = response.json()["id"]
+
+    response = await async_client.patch(f"/api/expenses/{expense_id}", json={"amount": 20.0})
+    assert response.status_code == 200
+    assert response.json()["amount"] == 20.0
+
+    response = await async_client.get("/api/expenses/?limit=1")
+    assert [expense["id"] for expense in response.json()] == [expense_id]
+
+    stats = (await async_client.get("/api/dashboard/stats")).json()
+    assert stats["total_expenses"] == 20.0
+    assert stats["total_count"] == 1
+
+    response = await async_client.delete(f"/api/expenses/{expense_id}")
+    assert response.status_code == 204
+    response = await async_client.get(f"/api/expenses/{expense_id}")
+    assert response.status_code == 404
@@ -0,0 +1,90 @@
+from datetime import date
+
+from sqlalchemy import event
+
+from app import rollups
+
+
+def _expense(i, **overrides):
+    expense = {
+        "title": f"Imported {i}",
+        "amount": 1.00 + i,
+        "category": "bills",
+        "expense_date": str(date.today()),
+    }
+    expense.update(overrides)
+    return expense
+
+
+def test_bulk_create(client, db_session):
+    """Test creating many expenses in one request."""
+    items = [_expense(i) for i in range(25)]
+    response = client.post("/api/expenses/bulk", json=items)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 25
+    assert data["errors"] == []
+    assert len(set(data["ids"])) == 25
+
+    # Ids follow input order
+    created = client.get(f"/api/expenses/{data['ids'][3]}").json()
+    assert created["title"] == "Imported 3"
+
+    stats = client.get("/api/dashboard/stats").json()
+    assert stats["total_count"] == 25
+    assert rollups.verify(db_session) == []
+
+
+def test_bulk_create_reports_item_errors(client):
+    """Test invalid items are reported by index without aborting valid ones."""
+    items = [
+        _expense(0),
+        _expense(1, amount=-5),
+        _expense(2),
+        {"title": "Missing fields"},
+        "not an object",
+    ]
+    response = client.post("/api/expenses/bulk", json=items)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 2
+    assert [error["index"] for error in data["errors"]] == [1, 3, 4]
+    assert data["errors"][0]["errors"][0]["loc"] == ["amount"]
+    assert len(client.get("/api/expenses/").json()) == 2
+
+
+def test_bulk_create_uses_chunked_inserts(client, db_session):
+    """Test rows are inserted with one multi-row INSERT per chunk where ids can be ordered."""
+    inserts = []
+    rollup_upserts = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO expenses"):
+            inserts.append(statement)
+        elif statement.startswith("INSERT INTO expense_monthly_rollups"):
+            rollup_upserts.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        response = client.post(
+            "/api/expenses/bulk?chunk_size=10", json=[_expense(i) for i in range(25)]
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert response.json()["created"] == 25
+    # Without insert sentinels (SQLite) ordered RETURNING takes one row per statement
+    assert len(inserts) == (25 if engine.dialect.name == "sqlite" else 3)
+    assert all("RETURNING" in statement for statement in inserts)
+    # Rollups are written once per transaction, so their rows are locked in one sorted order
+    assert len(rollup_upserts) == 1
+
+
+def test_bulk_create_too_many_items(client, monkeypatch):
+    """Test oversized batches are rejected."""
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "BULK_MAX_ITEMS", 3)
+    response = client.post("/api/expenses/bulk", json=[_expense(i) for i in range(4)])
+    assert response.status_code == 400
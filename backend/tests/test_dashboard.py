@@ -1,5 +1,7 @@
 from datetime import date, timedelta
 
+import pytest
+
 
 def test_dashboard_stats_empty(client):
     """Test dashboard stats with no expenses."""
@@ -121,3 +123,205 @@ def test_dashboard_reflects_changes(client):
     response = client.get("/api/dashboard/stats")
     assert response.json()["total_expenses"] == 0.0
     assert response.json()["total_count"] == 0
+
+
+def test_dashboard_stats_reads_rollups(client, db_session):
+    """Test dashboard stats read the rollup tables instead of scanning expenses."""
+    from sqlalchemy import event
+
+    client.post(
+        "/api/expenses/",
+        json={
+            "title": "Food",
+            "amount": 10.00,
+            "category": "food",
+            "expense_date": str(date.today()),
+        },
+    )
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        response = client.get("/api/dashboard/stats")
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+
+    assert response.status_code == 200
+    # ETag version lookup plus at most three rollup/partial-month queries
+    assert len(statements) <= 4
+    # Only the partial month at the start of the trend window touches raw rows
+    raw_scans = [s for s in statements if "FROM expenses" in s]
+    assert all("expenses.expense_date >=" in s for s in raw_scans)
+
+
+def test_dashboard_trends_exclude_old_expenses(client):
+    """Test old expenses count towards totals but not the monthly trends."""
+    today = date.today()
+    expenses = [
+        {"title": "Recent", "amount": 40.00, "category": "food", "expense_date": str(today)},
+        {
+            "title": "Old",
+            "amount": 60.00,
+            "category": "bills",
+            "expense_date": str(today - timedelta(days=400)),
+        },
+    ]
+    for expense in expenses:
+        client.post("/api/expenses/", json=expense)
+
+    data = client.get("/api/dashboard/stats").json()
+    assert data["total_expenses"] == 100.00
+    assert data["total_count"] == 2
+    assert data["average_expense"] == 50.00
+    assert data["category_breakdown"] == {"food": 40.00, "bills": 60.00}
+    assert data["monthly_trends"] == [
+        {"year": today.year, "month": today.month, "total": 40.00, "count": 1}
+    ]
+
+
+def test_dashboard_stats_in_other_currency(client):
+    """Test dashboard amounts can be reported already converted to another currency."""
+    from unittest.mock import AsyncMock, patch
+
+    today = date.today()
+    expenses = [
+        {"title": "Food", "amount": 50.00, "category": "food", "expense_date": str(today)},
+        {"title": "Bills", "amount": 150.00, "category": "bills", "expense_date": str(today)},
+    ]
+    for expense in expenses:
+        client.post("/api/expenses/", json=expense)
+
+    with patch(
+        "app.routers.exchange_rate._fetch_exchange_rates", new_callable=AsyncMock
+    ) as mock_fetch:
+        mock_fetch.return_value = {"base": "USD", "rates": {"EUR": 0.8}}
+        response = client.get("/api/dashboard/stats?currency=EUR")
+        unknown = client.get("/api/dashboard/stats?currency=XYZ")
+        same = client.get("/api/dashboard/stats?currency=usd")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_expenses"] == 160.00
+    assert data["average_expense"] == 80.00
+    assert data["category_breakdown"] == {"food": 40.00, "bills": 120.00}
+    assert data["monthly_trends"][-1]["total"] == 160.00
+    assert data["total_count"] == 2
+    assert unknown.status_code == 400
+    assert same.json()["total_expenses"] == 200.00
+    mock_fetch.assert_awaited_once_with("USD")
+
+
+def _post_expenses(client, *expenses):
+    for title, amount, category, expense_date in expenses:
+        response = client.post(
+            "/api/expenses/",
+            json={
+                "title": title,
+                "amount": amount,
+                "category": category,
+                "expense_date": expense_date,
+            },
+        )
+        assert response.status_code == 201
+
+
+def test_expense_trends_zero_fill_months(client):
+    """Test monthly trends list every month in the range, zero-filled, counting only in-range rows."""
+    _post_expenses(
+        client,
+        ("Before", 99.00, "food", "2024-01-14"),
+        ("January", 10.00, "food", "2024-01-15"),
+        ("March", 20.00, "bills", "2024-03-01"),
+        ("March again", 5.50, "food", "2024-03-31"),
+        ("After", 99.00, "food", "2024-04-02"),
+    )
+
+    response = client.get("/api/dashboard/trends?date_from=2024-01-15&date_to=2024-04-01")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["granularity"] == "month"
+    assert data["categories"] == []
+    assert data["buckets"] == [
+        {"start": "2024-01-01", "total": 10.00, "count": 1},
+        {"start": "2024-02-01", "total": 0.0, "count": 0},
+        {"start": "2024-03-01", "total": 25.50, "count": 2},
+        {"start": "2024-04-01", "total": 0.0, "count": 0},
+    ]
+
+
+@pytest.mark.parametrize(
+    ("granularity", "starts"),
+    [
+        ("day", ["2023-12-30", "2023-12-31", "2024-01-01"]),
+        # 2023-12-31 is a Sunday, so it belongs to the week starting Monday the 25th
+        ("week", ["2023-12-25", "2024-01-01"]),
+        ("quarter", ["2023-10-01", "2024-01-01"]),
+        ("year", ["2023-01-01", "2024-01-01"]),
+    ],
+)
+def test_expense_trends_granularities(client, granularity, starts):
+    """Test the database buckets expenses the same way the zero-filled bucket list is built."""
+    _post_expenses(
+        client,
+        ("Saturday", 1.00, "food", "2023-12-30"),
+        ("Sunday", 2.00, "food", "2023-12-31"),
+        ("Monday", 4.00, "food", "2024-01-01"),
+    )
+
+    response = client.get(
+        f"/api/dashboard/trends?granularity={granularity}&date_from=2023-12-30&date_to=2024-01-01"
+    )
+    assert response.status_code == 200
+    buckets = response.json()["buckets"]
+    assert [bucket["start"] for bucket in buckets] == starts
+    assert sum(bucket["count"] for bucket in buckets) == 3
+    assert all(bucket["count"] for bucket in buckets)
+
+
+def test_expense_trends_category_filter(client):
+    """Test trends can be limited to several categories."""
+    _post_expenses(
+        client,
+        ("Food", 10.00, "food", "2024-05-02"),
+        ("Bills", 20.00, "bills", "2024-05-03"),
+        ("Transport", 40.00, "transport", "2024-05-04"),
+    )
+
+    response = client.get(
+        "/api/dashboard/trends?granularity=year&date_from=2024-01-01&date_to=2024-12-31"
+        "&category=transport&category=food"
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["categories"] == ["food", "transport"]
+    assert data["buckets"] == [{"start": "2024-01-01", "total": 50.00, "count": 2}]
+
+
+def test_expense_trends_default_to_today(client):
+    """Test date_to defaults to today."""
+    today = date.today()
+    _post_expenses(client, ("Today", 12.00, "food", str(today)))
+
+    response = client.get(f"/api/dashboard/trends?granularity=day&date_from={today}")
+    assert response.status_code == 200
+    assert response.json()["buckets"] == [{"start": str(today), "total": 12.00, "count": 1}]
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "date_from=2024-02-01&date_to=2024-01-01",
+        "granularity=day&date_from=2000-01-01&date_to=2024-01-01",
+        "granularity=hour&date_from=2024-01-01",
+        "date_to=2024-01-01",
+    ],
+)
+def test_expense_trends_invalid_ranges(client, query):
+    """Test reversed ranges, too many buckets, unknown granularities and missing bounds are rejected."""
+    response = client.get(f"/api/dashboard/trends?{query}")
+    assert response.status_code in (400, 422)
@@ -0,0 +1,92 @@
+import json
+import logging
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app import diagnostics
+from app.config import settings
+from app.main import app
+from tests.conftest import engine
+
+
+@pytest.fixture
+def diagnostics_client(client, monkeypatch):
+    """Client running through the diagnostics middleware with hooks on the test engine."""
+    monkeypatch.setattr(settings, "DIAGNOSTICS_ENABLED", True)
+    diagnostics.reset()
+    diagnostics.instrument_engine(engine)
+    yield TestClient(diagnostics.DiagnosticsMiddleware(app))
+    event.remove(engine, "before_cursor_execute", diagnostics._before_cursor_execute)
+    event.remove(engine, "after_cursor_execute", diagnostics._after_cursor_execute)
+    diagnostics.reset()
+
+
+def _events(caplog, name: str) -> list[dict]:
+    records = [json.loads(record.getMessage()) for record in caplog.records]
+    return [record for record in records if record["event"] == name]
+
+
+def test_slow_queries_are_logged_with_route(diagnostics_client, monkeypatch, caplog):
+    """Test statements over the threshold are logged with parameters and route."""
+    monkeypatch.setattr(settings, "DIAGNOSTICS_SLOW_QUERY_MS", 0.0)
+
+    with caplog.at_level(logging.WARNING, logger="app.diagnostics"):
+        diagnostics_client.get("/api/expenses/42")
+
+    slow = _events(caplog, "slow_query")
+    lookup = next(e for e in slow if e["statement"].startswith("SELECT expenses.id"))
+    assert lookup["route"] == "/api/expenses/{expense_id}"
+    assert "42" in lookup["parameters"]
+
+    offenders = diagnostics_client.get("/metrics/diagnostics").json()
+    assert offenders["enabled"] is True
+    assert {entry["route"] for entry in offenders["slow_queries"]} == {"/api/expenses/{expense_id}"}
+    assert all(entry["count"] == 1 for entry in offenders["slow_queries"])
+
+
+def test_fast_queries_are_not_logged(diagnostics_client, caplog):
+    """Test statements under the threshold produce no log lines."""
+    with caplog.at_level(logging.WARNING, logger="app.diagnostics"):
+        diagnostics_client.get("/api/expenses/")
+
+    assert _events(caplog, "slow_query") == []
+    assert diagnostics_client.get("/metrics/diagnostics").json()["slow_queries"] == []
+
+
+def test_requests_with_too_many_queries_are_flagged(diagnostics_client, monkeypatch, caplog):
+    """Test requests over the statement budget are flagged with repeated statements."""
+    monkeypatch.setattr(settings, "DIAGNOSTICS_MAX_QUERIES_PER_REQUEST", 2)
+    expense = {
+        "title": "Taxi",
+        "amount": 20,
+        "category": "transport",
+        "expense_date": str(date.today()),
+    }
+    expense_id = diagnostics_client.post("/api/expenses/", json=expense).json()["id"]
+
+    with caplog.at_level(logging.WARNING, logger="app.diagnostics"):
+        diagnostics_client.put(f"/api/expenses/{expense_id}", json={"amount": 25})
+
+    flagged = [event for event in _events(caplog, "too_many_queries") if event["method"] == "PUT"]
+    assert flagged[0]["route"] == "/api/expenses/{expense_id}"
+    assert flagged[0]["queries"] > 2
+
+    chatty = diagnostics_client.get("/metrics/diagnostics").json()["chatty_routes"]
+    assert {entry["route"] for entry in chatty} == {"/api/expenses/", "/api/expenses/{expense_id}"}
+
+
+def test_repeated_statements_are_reported_as_n_plus_one(diagnostics_client, caplog):
+    """Test the same statement issued many times in a request is listed with its count."""
+    statements = ["SELECT 1"] + ["SELECT * FROM expenses WHERE id = ?"] * 12
+
+    with caplog.at_level(logging.WARNING, logger="app.diagnostics"):
+        diagnostics._record_chatty_request("/api/things", "GET", statements)
+
+    flagged = _events(caplog, "too_many_queries")[0]
+    assert flagged["repeated_statements"] == {"SELECT * FROM expenses WHERE id = ?": 12}
+    chatty = diagnostics.top_offenders()["chatty_routes"]
+    assert chatty[0]["route"] == "/api/things"
+    assert chatty[0]["max_queries"] == 13
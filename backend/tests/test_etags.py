@@ -0,0 +1,84 @@
+from datetime import date
+from unittest.mock import AsyncMock, patch
+
+EXPENSE = {"title": "Lunch", "amount": 10.0, "category": "food", "expense_date": str(date.today())}
+
+
+def test_list_returns_304_for_current_etag(client):
+    """Test an unchanged expense list is answered with 304 and no body."""
+    client.post("/api/expenses/", json=EXPENSE)
+    first = client.get("/api/expenses/")
+    tag = first.headers["ETag"]
+
+    response = client.get("/api/expenses/", headers={"If-None-Match": tag})
+
+    assert tag.startswith('"') and tag.endswith('"')
+    assert first.headers["Cache-Control"] == "no-cache"
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == tag
+
+
+def test_writes_change_the_etag(client):
+    """Test create, update, delete and bulk inserts each invalidate cached reads."""
+    tags = [client.get("/api/expenses/").headers["ETag"]]
+    expense_id = client.post("/api/expenses/", json=EXPENSE).json()["id"]
+    tags.append(client.get("/api/expenses/").headers["ETag"])
+    client.patch(f"/api/expenses/{expense_id}", json={"title": "Dinner"})
+    tags.append(client.get("/api/expenses/").headers["ETag"])
+    client.post("/api/expenses/bulk", json=[EXPENSE, EXPENSE])
+    tags.append(client.get("/api/expenses/").headers["ETag"])
+    client.delete(f"/api/expenses/{expense_id}")
+    tags.append(client.get("/api/expenses/").headers["ETag"])
+
+    assert len(set(tags)) == len(tags)
+    response = client.get("/api/expenses/", headers={"If-None-Match": tags[0]})
+    assert response.status_code == 200
+
+
+def test_get_expense_conditional(client):
+    """Test single-expense reads honour If-None-Match, including weak and list forms."""
+    expense_id = client.post("/api/expenses/", json=EXPENSE).json()["id"]
+    tag = client.get(f"/api/expenses/{expense_id}").headers["ETag"]
+
+    weak = client.get(f"/api/expenses/{expense_id}", headers={"If-None-Match": f"W/{tag}"})
+    listed = client.get(f"/api/expenses/{expense_id}", headers={"If-None-Match": f'"x", {tag}'})
+    other = client.get(f"/api/expenses/{expense_id}", headers={"If-None-Match": '"other"'})
+
+    assert weak.status_code == 304
+    assert listed.status_code == 304
+    assert other.status_code == 200
+
+
+def test_get_missing_expense_is_not_modified_by_wildcard(client):
+    """Test If-None-Match: * only matches expenses that exist."""
+    expense_id = client.post("/api/expenses/", json=EXPENSE).json()["id"]
+    headers = {"If-None-Match": "*"}
+
+    assert client.get(f"/api/expenses/{expense_id}", headers=headers).status_code == 304
+    assert client.get(f"/api/expenses/{expense_id + 1}", headers=headers).status_code == 404
+
+
+def test_dashboard_304_skips_aggregation(client):
+    """Test a current dashboard ETag is answered without computing the statistics."""
+    client.post("/api/expenses/", json=EXPENSE)
+    tag = client.get("/api/dashboard/stats").headers["ETag"]
+
+    with patch("app.routers.dashboard.compute_dashboard_stats") as compute:
+        response = client.get("/api/dashboard/stats", headers={"If-None-Match": tag})
+
+    assert response.status_code == 304
+    compute.assert_not_called()
+
+
+def test_dashboard_etag_depends_on_currency(client):
+    """Test converted dashboards are tagged separately from the base currency one."""
+    with patch(
+        "app.routers.exchange_rate._fetch_exchange_rates", new_callable=AsyncMock
+    ) as mock_fetch:
+        mock_fetch.return_value = {"base": "USD", "rates": {"EUR": 0.8}}
+        base = client.get("/api/dashboard/stats").headers["ETag"]
+        euro = client.get("/api/dashboard/stats?currency=EUR")
+
+    assert euro.headers["ETag"] != base
+    assert euro.status_code == 200
@@ -100,3 +100,116 @@ def test_exchange_rate_api_error(client):
         )
         response = client.get("/api/exchange/rates/USD")
         assert response.status_code in [404, 500, 503]
+
+
+def test_convert_currency_triangulates_from_one_snapshot(client):
+    """Test every currency pair is derived from the single canonical base table."""
+    mock_response = {
+        "base": "USD",
+        "date": "2024-01-01",
+        "rates": {"USD": 1.0, "EUR": 0.8, "GBP": 0.5, "JPY": 100.0},
+    }
+
+    with patch(
+        "app.routers.exchange_rate._fetch_exchange_rates", new_callable=AsyncMock
+    ) as mock_fetch:
+        mock_fetch.return_value = mock_response
+        eur_gbp = client.get("/api/exchange/convert?amount=100&from_currency=EUR&to_currency=GBP")
+        gbp_jpy = client.get("/api/exchange/convert?amount=10&from_currency=gbp&to_currency=JPY")
+        jpy_usd = client.get("/api/exchange/convert?amount=250&from_currency=JPY&to_currency=USD")
+
+    assert eur_gbp.json()["rate"] == 0.625
+    assert eur_gbp.json()["converted_amount"] == 62.5
+    assert gbp_jpy.json()["base_currency"] == "GBP"
+    assert gbp_jpy.json()["converted_amount"] == 2000.0
+    assert jpy_usd.json()["converted_amount"] == 2.5
+    mock_fetch.assert_awaited_once_with("USD")
+
+
+def test_get_exchange_rates_for_other_base(client):
+    """Test rate tables for any base are built from the canonical snapshot."""
+    mock_response = {"base": "USD", "date": "2024-01-01", "rates": {"EUR": 0.8, "GBP": 0.5}}
+
+    with patch(
+        "app.routers.exchange_rate._fetch_exchange_rates", new_callable=AsyncMock
+    ) as mock_fetch:
+        mock_fetch.return_value = mock_response
+        response = client.get("/api/exchange/rates/gbp")
+        missing = client.get("/api/exchange/rates/XYZ")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["base"] == "GBP"
+    assert data["date"] == "2024-01-01"
+    assert data["rates"] == {"EUR": 1.6, "GBP": 1.0, "USD": 2.0}
+    assert missing.status_code == 404
+    mock_fetch.assert_awaited_once_with("USD")
+
+
+def test_convert_currency_invalid_source(client):
+    """Test conversion from a currency missing in the snapshot."""
+    mock_response = {"base": "USD", "date": "2024-01-01", "rates": {"EUR": 0.85}}
+
+    with patch(
+        "app.routers.exchange_rate._fetch_exchange_rates", new_callable=AsyncMock
+    ) as mock_fetch:
+        mock_fetch.return_value = mock_response
+        response = client.get(
+            "/api/exchange/convert?amount=100&from_currency=INVALID&to_currency=EUR"
+        )
+        assert response.status_code == 400
+        assert "INVALID" in response.json()["detail"]
+
+
+def test_invalid_upstream_rates(client):
+    """Test malformed upstream rate tables are reported as server errors."""
+    mock_response = {"base": "USD", "rates": {"EUR": "not-a-number"}}
+
+    with patch(
+        "app.routers.exchange_rate._fetch_exchange_rates", new_callable=AsyncMock
+    ) as mock_fetch:
+        mock_fetch.return_value = mock_response
+        response = client.get("/api/exchange/rates/USD")
+        assert response.status_code == 500
+
+
+def test_convert_currency_batch(client):
+    """Test converting many amounts against one snapshot in a single request."""
+    mock_response = {"base": "USD", "date": "2024-01-01", "rates": {"EUR": 0.8, "GBP": 0.5}}
+    conversions = [
+        {"amount": 10, "from_currency": "USD", "to_currency": "EUR"},
+        {"amount": 20, "from_currency": "eur", "to_currency": "gbp"},
+        {"amount": 5, "from_currency": "GBP", "to_currency": "GBP"},
+        {"amount": 30, "from_currency": "USD", "to_currency": "EUR"},
+    ]
+
+    with patch(
+        "app.routers.exchange_rate._fetch_exchange_rates", new_callable=AsyncMock
+    ) as mock_fetch:
+        mock_fetch.return_value = mock_response
+        response = client.post("/api/exchange/convert/batch", json={"conversions": conversions})
+
+    assert response.status_code == 200
+    results = response.json()
+    assert [result["converted_amount"] for result in results] == [8.0, 12.5, 5.0, 24.0]
+    assert results[1]["base_currency"] == "EUR"
+    assert results[1]["target_currency"] == "GBP"
+    mock_fetch.assert_awaited_once_with("USD")
+
+
+def test_convert_currency_batch_unknown_currency(client):
+    """Test batches naming unknown currencies are rejected."""
+    mock_response = {"base": "USD", "date": "2024-01-01", "rates": {"EUR": 0.8}}
+    conversions = [
+        {"amount": 10, "from_currency": "USD", "to_currency": "EUR"},
+        {"amount": 10, "from_currency": "ABC", "to_currency": "XYZ"},
+    ]
+
+    with patch(
+        "app.routers.exchange_rate._fetch_exchange_rates", new_callable=AsyncMock
+    ) as mock_fetch:
+        mock_fetch.return_value = mock_response
+        response = client.post("/api/exchange/convert/batch", json={"conversions": conversions})
+
+    assert response.status_code == 400
+    assert "ABC, XYZ" in response.json()["detail"]
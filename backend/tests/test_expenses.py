@@ -1,5 +1,9 @@
+import base64
+import json
 from datetime import date, timedelta
 
+import pytest
+
 
 def test_create_expense(client):
     """Test creating a new expense."""
@@ -217,3 +221,288 @@ def test_expense_categories(client):
         response = client.post("/api/expenses/", json=expense_data)
         assert response.status_code == 201
         assert response.json()["category"] == category
+
+
+def test_get_expenses_cursor_pagination(client):
+    """Test walking all expenses with the keyset cursor."""
+    for i in range(7):
+        expense_data = {
+            "title": f"Expense {i}",
+            "amount": 10.00,
+            "category": "food",
+            "expense_date": str(date.today()),
+        }
+        client.post("/api/expenses/", json=expense_data)
+
+    seen = []
+    response = client.get("/api/expenses/?limit=3")
+    while True:
+        assert response.status_code == 200
+        seen.extend(expense["id"] for expense in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        response = client.get(f"/api/expenses/?limit=3&cursor={cursor}")
+
+    # Newest first, every expense exactly once
+    assert seen == sorted(seen, reverse=True)
+    assert len(seen) == len(set(seen)) == 7
+
+
+def test_get_expenses_cursor_stable_under_inserts(client):
+    """Test rows inserted mid-scroll do not shift cursor pages."""
+    for i in range(4):
+        expense_data = {
+            "title": f"Expense {i}",
+            "amount": 10.00,
+            "category": "food",
+            "expense_date": str(date.today()),
+        }
+        client.post("/api/expenses/", json=expense_data)
+
+    first_page = client.get("/api/expenses/?limit=2")
+    cursor = first_page.headers["X-Next-Cursor"]
+    client.post(
+        "/api/expenses/",
+        json={
+            "title": "Inserted",
+            "amount": 5.00,
+            "category": "food",
+            "expense_date": str(date.today()),
+        },
+    )
+
+    second_page = client.get(f"/api/expenses/?limit=2&cursor={cursor}")
+    first_ids = [expense["id"] for expense in first_page.json()]
+    second_ids = [expense["id"] for expense in second_page.json()]
+    assert second_ids == [first_ids[-1] - 1, first_ids[-1] - 2]
+    assert "X-Next-Cursor" not in second_page.headers
+
+
+def test_get_expenses_invalid_cursor(client):
+    """Test malformed cursors and cursor/skip combinations are rejected."""
+    response = client.get("/api/expenses/?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+    response = client.get("/api/expenses/?skip=5&cursor=WyIyMDI0LTAxLTAxIiwgMV0")
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize(
+    ("sort_by", "position"),
+    [
+        ("amount", ["amount", "nan", 1]),
+        ("amount", ["amount", 1e300, 1]),
+        ("amount", ["amount", "Infinity", 1]),
+        ("amount", ["amount", 5.0, 1e30]),
+        ("amount", ["amount", 5.0, 2**64]),
+        ("expense_date", ["expense_date", "2024-01-01", True]),
+    ],
+)
+def test_get_expenses_rejects_out_of_range_cursor(client, sort_by, position):
+    """Test crafted cursor values that cannot be bound as a position are rejected."""
+    cursor = base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+    response = client.get(f"/api/expenses/?sort_by={sort_by}&cursor={cursor}")
+    assert response.status_code == 400
+
+
+def _create_filter_fixtures(client):
+    expenses = [
+        {"title": "Groceries", "amount": 45.00, "category": "food", "expense_date": "2024-01-10"},
+        {"title": "Grocery run", "amount": 12.50, "category": "food", "expense_date": "2024-02-03"},
+        {"title": "Restaurant", "amount": 80.00, "category": "food", "expense_date": "2024-02-14"},
+        {
+            "title": "Bus pass",
+            "amount": 30.00,
+            "category": "transport",
+            "expense_date": "2024-02-01",
+        },
+        {"title": "groceries", "amount": 9.99, "category": "food", "expense_date": "2024-03-05"},
+    ]
+    for expense in expenses:
+        client.post("/api/expenses/", json=expense)
+
+
+def test_get_expenses_filters(client):
+    """Test server-side filtering by category, date range, amount range and title prefix."""
+    _create_filter_fixtures(client)
+
+    def titles(query):
+        response = client.get(f"/api/expenses/?{query}")
+        assert response.status_code == 200
+        return sorted(expense["title"] for expense in response.json())
+
+    assert titles("category=transport") == ["Bus pass"]
+    assert titles("date_from=2024-02-01&date_to=2024-02-14") == [
+        "Bus pass",
+        "Grocery run",
+        "Restaurant",
+    ]
+    assert titles("min_amount=12.50&max_amount=45") == ["Bus pass", "Groceries", "Grocery run"]
+    assert titles("title_prefix=Grocer") == ["Groceries", "Grocery run"]
+    assert titles("category=food&date_from=2024-02-01&max_amount=50") == [
+        "Grocery run",
+        "groceries",
+    ]
+
+
+def test_get_expenses_sorting(client):
+    """Test sorting by amount and expense date, with cursors following the sort."""
+    _create_filter_fixtures(client)
+
+    response = client.get("/api/expenses/?sort_by=amount&order=asc")
+    amounts = [expense["amount"] for expense in response.json()]
+    assert amounts == [9.99, 12.50, 30.00, 45.00, 80.00]
+
+    seen = []
+    response = client.get("/api/expenses/?sort_by=expense_date&limit=2")
+    while True:
+        seen.extend(expense["expense_date"] for expense in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        response = client.get(f"/api/expenses/?sort_by=expense_date&limit=2&cursor={cursor}")
+    assert seen == ["2024-03-05", "2024-02-14", "2024-02-03", "2024-02-01", "2024-01-10"]
+
+    # A cursor is only valid for the sort it was issued for
+    cursor = client.get("/api/expenses/?sort_by=amount&limit=2").headers["X-Next-Cursor"]
+    assert client.get(f"/api/expenses/?sort_by=expense_date&cursor={cursor}").status_code == 400
+
+
+def test_get_expenses_invalid_filters(client):
+    """Test invalid filter values are rejected."""
+    assert client.get("/api/expenses/?category=invalid").status_code == 422
+    assert client.get("/api/expenses/?min_amount=-1").status_code == 422
+    assert client.get("/api/expenses/?sort_by=title").status_code == 422
+
+
+def test_writes_issue_one_statement_against_expenses(client):
+    """Test create, update and delete each touch the expenses table exactly once."""
+    from sqlalchemy import event
+
+    from tests.conftest import engine
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "_rollups" not in statement and "data_versions" not in statement:
+            statements.append(statement.split()[0])
+
+    expense_data = {
+        "title": "Lunch",
+        "amount": 10.0,
+        "category": "food",
+        "expense_date": str(date.today()),
+    }
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        created = client.post("/api/expenses/", json=expense_data)
+        expense_id = created.json()["id"]
+        assert statements == ["INSERT"]
+
+        statements.clear()
+        updated = client.patch(f"/api/expenses/{expense_id}", json={"amount": 12.0})
+        # SQLite reads the replaced values first; PostgreSQL returns them from the UPDATE
+        assert statements == ["SELECT", "UPDATE"]
+
+        statements.clear()
+        deleted = client.delete(f"/api/expenses/{expense_id}")
+        assert statements == ["DELETE"]
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert created.json()["created_at"] is not None
+    assert created.json()["updated_at"] is None
+    assert updated.json()["amount"] == 12.0
+    assert updated.json()["created_at"] == created.json()["created_at"]
+    assert updated.json()["updated_at"] is not None
+    assert deleted.status_code == 204
+    stats = client.get("/api/dashboard/stats").json()
+    assert stats["total_count"] == 0
+    assert stats["total_expenses"] == 0
+
+
+def test_get_expenses_body_matches_standard_rendering(client, db_session):
+    """Test the fast list rendering is byte-identical to validating through ExpenseResponse."""
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+
+    from app import models, schemas
+
+    for amount in (12.5, 0.1, 1234567.89, 0.01):
+        created = client.post(
+            "/api/expenses/",
+            json={
+                "title": 'Café ☕ "quoted"\n',
+                "amount": amount,
+                "category": "food",
+                "description": None if amount > 1 else "ünïcode",
+                "expense_date": str(date.today()),
+            },
+        )
+        assert created.status_code == 201
+    # 1e+16 needs an exponent and takes the fallback path; it is above the API's
+    # maximum amount, but may predate it in the database
+    db_session.add(
+        models.Expense(title="Legacy", amount=1e16, category="food", expense_date=date.today())
+    )
+    db_session.commit()
+
+    def standard(expenses):
+        validated = [schemas.ExpenseResponse.model_validate(e) for e in expenses]
+        return JSONResponse(jsonable_encoder(validated)).body
+
+    expenses = db_session.query(models.Expense).order_by(models.Expense.id.desc()).all()
+    full = client.get("/api/expenses/", params={"sort_by": "created_at"})
+    plain = client.get("/api/expenses/", params={"max_amount": 1e6})
+
+    assert full.content == standard(expenses)
+    assert plain.content == standard([e for e in expenses if e.amount <= 1e6])
+    assert plain.headers["content-type"] == "application/json"
+    assert "etag" in plain.headers
+
+
+def test_amounts_are_stored_as_whole_cents(client, db_session):
+    """Test amounts round to cents on write and sub-cent amounts are rejected."""
+    from sqlalchemy import text
+
+    expense_data = {"title": "Coffee", "category": "food", "expense_date": str(date.today())}
+    created = client.post("/api/expenses/", json={**expense_data, "amount": 3.456})
+    too_small = client.post("/api/expenses/", json={**expense_data, "amount": 0.004})
+
+    assert created.json()["amount"] == 3.46
+    assert db_session.execute(text("SELECT amount FROM expenses")).scalar() == 346
+    assert too_small.status_code == 422
+
+
+def test_amounts_beyond_bigint_cents_are_rejected(client):
+    """Test amounts and amount filters too large for BIGINT cents are a 422, not a 500."""
+    expense_data = {"title": "Yacht", "category": "other", "expense_date": str(date.today())}
+    created = client.post("/api/expenses/", json={**expense_data, "amount": 1e17})
+    listed = client.get("/api/expenses/?min_amount=1e300")
+    exported = client.get("/api/expenses/export?max_amount=1e300")
+
+    assert created.status_code == 422
+    assert listed.status_code == 422
+    assert exported.status_code == 422
+
+
+def test_startup_refuses_unconverted_float_amounts():
+    """Test the app does not start on float amount columns that revision 0003 has not converted."""
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.pool import StaticPool
+
+    from app.database import Base
+    from app.main import check_cents_columns
+
+    converted = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(converted)
+    check_cents_columns(converted)
+
+    legacy = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(legacy)
+    with legacy.begin() as conn:
+        conn.execute(text("DROP TABLE expenses"))
+        conn.execute(text("CREATE TABLE expenses (id INTEGER PRIMARY KEY, amount FLOAT NOT NULL)"))
+    with pytest.raises(RuntimeError, match="expenses.amount"):
+        check_cents_columns(legacy)
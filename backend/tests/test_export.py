@@ -0,0 +1,66 @@
+import csv
+import io
+import json
+
+from app import export
+from app.config import settings
+
+
+def _create_expenses(client, count):
+    items = [
+        {
+            "title": f"Export {i}",
+            "amount": 2.50 * (i + 1),
+            "category": "food" if i % 2 else "bills",
+            "expense_date": f"2024-01-{i + 1:02d}",
+        }
+        for i in range(count)
+    ]
+    return client.post("/api/expenses/bulk", json=items).json()["ids"]
+
+
+def test_export_csv(client):
+    """Test exporting all expenses as CSV."""
+    ids = _create_expenses(client, 5)
+
+    response = client.get("/api/expenses/export?format=csv")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "expenses.csv" in response.headers["content-disposition"]
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(row["id"]) for row in rows] == ids
+    assert rows[0]["title"] == "Export 0"
+    assert rows[0]["category"] == "bills"
+    assert rows[0]["expense_date"] == "2024-01-01"
+    assert float(rows[1]["amount"]) == 5.00
+    assert rows[0]["description"] == ""
+
+
+def test_export_ndjson_with_filters(client):
+    """Test exporting a filtered subset as NDJSON."""
+    _create_expenses(client, 6)
+
+    response = client.get("/api/expenses/export?format=ndjson&category=food&min_amount=5")
+    assert response.status_code == 200
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [record["title"] for record in records] == ["Export 1", "Export 3", "Export 5"]
+    assert set(records[0]) == set(export.EXPORT_FIELDS)
+    assert records[0]["category"] == "food"
+
+
+def test_export_empty(client):
+    """Test exporting with no matching rows."""
+    assert client.get("/api/expenses/export").text.strip() == ",".join(export.EXPORT_FIELDS)
+    assert client.get("/api/expenses/export?format=ndjson").text == ""
+
+
+def test_export_streams_in_batches(client, db_session, monkeypatch):
+    """Test rows are streamed in fixed-size batches rather than loaded at once."""
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 4)
+    _create_expenses(client, 10)
+
+    batches = list(export.stream_rows(db_session))
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    # Plain column tuples, not ORM instances
+    assert tuple(batches[0][0]._fields) == tuple(export.EXPORT_FIELDS)
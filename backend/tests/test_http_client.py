@@ -0,0 +1,58 @@
+import httpx
+import pytest
+
+from app import http_client
+from app.config import settings
+from app.routers.exchange_rate import _fetch_exchange_rates
+
+
+@pytest.fixture
+def shared_client(monkeypatch):
+    """Install a shared client backed by a mocked transport."""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"base": "EUR", "rates": {"USD": 1.1}})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(http_client, "_client", client)
+    yield client, requests
+
+
+def test_create_client_uses_settings(monkeypatch):
+    """Test pool limits and per-phase timeouts come from settings."""
+    monkeypatch.setattr(settings, "HTTP_CLIENT_MAX_CONNECTIONS", 7)
+    monkeypatch.setattr(settings, "HTTP_CLIENT_CONNECT_TIMEOUT", 1.5)
+    monkeypatch.setattr(settings, "HTTP_CLIENT_READ_TIMEOUT", 4.0)
+
+    client = http_client.create_client()
+
+    assert client.timeout.connect == 1.5
+    assert client.timeout.read == 4.0
+    assert client.timeout.pool == settings.HTTP_CLIENT_POOL_TIMEOUT
+    assert client._transport._pool._max_connections == 7
+
+
+async def test_fetch_reuses_shared_client(shared_client):
+    """Test upstream fetches go through the one shared client."""
+    client, requests = shared_client
+
+    await _fetch_exchange_rates("eur")
+    await _fetch_exchange_rates("eur")
+
+    assert http_client.get_client() is client
+    assert [str(request.url) for request in requests] == [
+        f"{settings.EXCHANGE_RATE_API_URL}/EUR"
+    ] * 2
+
+
+async def test_close_client():
+    """Test the shared client is closed and released on shutdown."""
+    client = http_client.open_client()
+    assert http_client.get_client() is client
+
+    await http_client.close_client()
+
+    assert client.is_closed
+    assert http_client._client is None
@@ -0,0 +1,107 @@
+import io
+import json
+from datetime import date
+
+from app import ingest, rollups, schemas
+
+CSV_HEADER = "title,amount,category,description,expense_date\n"
+
+
+def test_import_csv(client, db_session):
+    """Test importing a CSV file with a header row."""
+    today = str(date.today())
+    content = CSV_HEADER + "".join(f"Row {i},{i + 1}.25,food,,{today}\n" for i in range(12))
+    response = client.post(
+        "/api/expenses/import",
+        files={"file": ("expenses.csv", content.encode(), "text/csv")},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "completed"
+    assert data["rows_read"] == 12
+    assert data["accepted"] == 12
+    assert data["rejected"] == 0
+
+    expenses = client.get("/api/expenses/?limit=100").json()
+    assert len(expenses) == 12
+    assert all(expense["description"] is None for expense in expenses)
+    assert rollups.verify(db_session) == []
+
+
+def test_import_ndjson_reports_rejected_rows(client):
+    """Test invalid and malformed NDJSON lines are rejected without stopping the import."""
+    lines = [
+        json.dumps({"title": "Ok", "amount": 5, "category": "bills", "expense_date": "2024-05-01"}),
+        json.dumps({"title": "Bad amount", "amount": 0, "category": "bills"}),
+        "{not json",
+        "",
+        json.dumps(
+            {"title": "Ok 2", "amount": 7, "category": "health", "expense_date": "2024-05-02"}
+        ),
+    ]
+    response = client.post(
+        "/api/expenses/import?import_id=nd-1",
+        files={"file": ("expenses.ndjson", "\n".join(lines).encode())},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["rows_read"], data["accepted"], data["rejected"]) == (4, 2, 2)
+    assert [error["index"] for error in data["errors"]] == [1, 2]
+    assert data["errors"][1]["errors"][0]["type"] == "parse_error"
+
+    progress = client.get("/api/expenses/import/nd-1").json()
+    assert progress == data
+
+
+def test_import_csv_reports_unparsable_rows(client):
+    """Test undecodable and malformed CSV rows are rejected with their line numbers."""
+    content = (
+        CSV_HEADER.encode()
+        + b"Ok,5,bills,,2024-05-01\n"
+        + b"Caf\xe9,6,food,,2024-05-01\n"
+        + b'"'
+        + b"x" * 200_000
+        + b'",7,food,,2024-05-01\n'
+        + b"Ok 2,8,health,,2024-05-02\n"
+    )
+    response = client.post(
+        "/api/expenses/import", files={"file": ("expenses.csv", content, "text/csv")}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["rows_read"], data["accepted"], data["rejected"]) == (4, 2, 2)
+    messages = [error["errors"][0]["msg"] for error in data["errors"]]
+    assert messages[0] == "Invalid UTF-8 on line 3"
+    assert messages[1].startswith("Invalid CSV on line 4")
+
+
+def test_import_requires_known_format(client):
+    """Test the file format must be given or inferable."""
+    response = client.post("/api/expenses/import", files={"file": ("expenses.txt", b"")})
+    assert response.status_code == 400
+
+    response = client.post(
+        "/api/expenses/import?format=csv", files={"file": ("expenses.txt", CSV_HEADER.encode())}
+    )
+    assert response.status_code == 200
+    assert client.get("/api/expenses/import/missing").status_code == 404
+
+
+def test_run_import_flushes_bounded_batches(db_session, monkeypatch):
+    """Test the pipeline commits in batches and never holds more than one batch."""
+    rows = "".join(f"Row {i},1.00,food,,2024-01-01\n" for i in range(25))
+    stream = io.BytesIO((CSV_HEADER + rows).encode())
+    flushed = []
+    original_insert = ingest.insert_expenses
+
+    def recording_insert(db, expenses, chunk_size=None):
+        flushed.append(len(expenses))
+        return original_insert(db, expenses, chunk_size)
+
+    monkeypatch.setattr(ingest, "insert_expenses", recording_insert)
+    progress = ingest.start_import("csv")
+    ingest.run_import(db_session, stream, progress, batch_size=10)
+
+    assert flushed == [10, 10, 5]
+    assert progress.accepted == 25
+    assert isinstance(ingest.get_import(progress.id), schemas.ImportProgress)
@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+
+from app.inflight import InflightTasks
+
+
+async def test_cancelled_caller_does_not_cancel_the_shared_task():
+    """Test one waiter giving up leaves the task running for the others, then frees the key."""
+    inflight = InflightTasks()
+    release = asyncio.Event()
+
+    async def run():
+        await release.wait()
+        return "value"
+
+    task = inflight.start("k", run)
+    assert inflight.get("k") is task
+    first = asyncio.ensure_future(InflightTasks.join(task))
+    second = asyncio.ensure_future(InflightTasks.join(inflight.get("k")))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    release.set()
+
+    assert await second == "value"
+    assert "k" not in inflight
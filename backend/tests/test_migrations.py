@@ -0,0 +1,90 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app import models, rollups, versioning
+from app.database import Base
+from app.main import check_cents_columns
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+# The expenses table as the first release created it, before any revision
+BASELINE_SCHEMA = (
+    "CREATE TABLE expenses ("
+    "id INTEGER NOT NULL, title VARCHAR NOT NULL, amount FLOAT NOT NULL, "
+    "category VARCHAR(13) NOT NULL, description VARCHAR, expense_date DATE NOT NULL, "
+    "created_at DATETIME DEFAULT CURRENT_TIMESTAMP, updated_at DATETIME, PRIMARY KEY (id))",
+    "CREATE INDEX ix_expenses_category ON expenses (category)",
+    "CREATE INDEX ix_expenses_id ON expenses (id)",
+    "CREATE INDEX ix_expenses_expense_date ON expenses (expense_date)",
+    "CREATE INDEX ix_expenses_title ON expenses (title)",
+)
+
+
+@pytest.fixture
+def baseline_database(tmp_path):
+    """A SQLite file shaped like a database the first release created, with two expenses."""
+    url = f"sqlite:///{tmp_path / 'expenses.db'}"
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        for statement in BASELINE_SCHEMA:
+            conn.execute(text(statement))
+        conn.execute(
+            text(
+                "INSERT INTO expenses (title, amount, category, expense_date) VALUES "
+                "('Lunch', 1.005, 'FOOD', '2024-01-05'), ('Power', 2.5, 'BILLS', '2024-02-01')"
+            )
+        )
+    yield url, engine
+    engine.dispose()
+
+
+def _alembic(url: str, *args: str) -> None:
+    env = {**os.environ, "DATABASE_URL": url, "DATABASE_ASYNC": "false"}
+    subprocess.run(
+        [sys.executable, "-m", "alembic", *args],
+        cwd=BACKEND,
+        env=env,
+        check=True,
+        capture_output=True,
+    )
+
+
+def test_upgrade_baseline_database_before_first_start(baseline_database):
+    """Test `alembic upgrade head` runs on a baseline database before this version starts."""
+    url, engine = baseline_database
+    _alembic(url, "upgrade", "head")
+
+    with engine.connect() as conn:
+        amounts = conn.execute(text("SELECT amount FROM expenses ORDER BY id")).scalars().all()
+    assert amounts == [101, 250]
+
+    # What startup does next
+    Base.metadata.create_all(engine)
+    check_cents_columns(engine)
+    with Session(engine) as db:
+        assert rollups.verify(db) == []
+        assert db.query(models.CategoryRollup).count() == 2
+        assert versioning.current(db) is not None
+
+
+def test_upgrade_after_refused_start_fills_rollups(baseline_database):
+    """Test the rollup tables a refused start created empty are filled by the upgrade."""
+    url, engine = baseline_database
+    Base.metadata.create_all(engine)
+    with pytest.raises(RuntimeError, match="alembic upgrade head"):
+        check_cents_columns(engine)
+
+    _alembic(url, "upgrade", "head")
+
+    check_cents_columns(engine)
+    with Session(engine) as db:
+        assert rollups.verify(db) == []
+        totals = {row.category: row.total for row in db.query(models.CategoryRollup)}
+        assert totals == {models.ExpenseCategory.FOOD: 101, models.ExpenseCategory.BILLS: 250}
+        assert versioning.current(db) == 1
@@ -0,0 +1,76 @@
+import pytest
+from sqlalchemy import create_engine, exc
+from sqlalchemy.pool import QueuePool
+
+from app.pool_metrics import PoolMetrics
+
+
+@pytest.fixture
+def instrumented_engine(tmp_path):
+    """File-backed SQLite engine with a tiny instrumented pool."""
+    metrics = PoolMetrics()
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=metrics.poolclass(QueuePool),
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    metrics.attach(engine)
+    yield engine, metrics
+    engine.dispose()
+
+
+def test_pool_metrics_record_checkouts_and_overflow(instrumented_engine):
+    """Test checkouts beyond pool_size are counted as overflow hits."""
+    engine, metrics = instrumented_engine
+
+    first = engine.connect()
+    second = engine.connect()
+    stats = metrics.snapshot()
+    first.close()
+    second.close()
+
+    assert stats["checkouts"] == 2
+    assert stats["checked_out"] == 2
+    assert stats["peak_checked_out"] == 2
+    assert stats["overflow_checkouts"] == 1
+    assert stats["wait_seconds_buckets"]["+Inf"] == 2
+    assert metrics.snapshot()["checked_out"] == 0
+
+
+def test_pool_metrics_record_timeouts(instrumented_engine):
+    """Test an exhausted pool records the wait and the timeout."""
+    engine, metrics = instrumented_engine
+
+    held = [engine.connect(), engine.connect()]
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    for connection in held:
+        connection.close()
+
+    stats = metrics.snapshot()
+    assert stats["timeouts"] == 1
+    assert stats["wait_seconds_max"] >= 0.05
+    assert stats["wait_seconds_buckets"]["0.01"] == 2
+
+
+def test_pool_metrics_survive_dispose(instrumented_engine):
+    """Test the recreated pool after dispose() keeps reporting into the same metrics."""
+    engine, metrics = instrumented_engine
+
+    engine.connect().close()
+    engine.dispose()
+    engine.connect().close()
+
+    assert metrics.snapshot()["checkouts"] == 2
+
+
+def test_pool_metrics_endpoint(client):
+    """Test the pool metrics endpoint reports the app engines."""
+    response = client.get("/metrics/pool")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["sync"]["pool_size"] >= 1
+    assert "wait_seconds_buckets" in data["sync"]
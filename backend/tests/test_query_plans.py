@@ -0,0 +1,98 @@
+import pytest
+from sqlalchemy import event
+
+
+@pytest.fixture
+def explain(client, db_session):
+    """Return the SQLite query plan of the last statement issued by a GET request."""
+    engine = db_session.get_bind()
+
+    def _explain(url):
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            response = client.get(url)
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+        assert response.status_code == 200
+
+        statement, parameters = statements[-1]
+        rows = db_session.connection().exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        )
+        return [row[-1] for row in rows]
+
+    return _explain
+
+
+@pytest.mark.parametrize(
+    ("query", "access_path"),
+    [
+        # Unfiltered listings walk the index in sort order
+        ("", "SCAN expenses USING INDEX ix_expenses_created_at_id"),
+        ("sort_by=amount&order=asc", "SCAN expenses USING INDEX ix_expenses_amount_id"),
+        # Filters become a range seek on a matching composite index
+        ("category=food", "SEARCH expenses USING INDEX ix_expenses_category_created_at_id"),
+        (
+            "category=food&date_from=2024-01-01&date_to=2024-02-01&sort_by=expense_date",
+            "SEARCH expenses USING INDEX ix_expenses_category_expense_date_id",
+        ),
+        (
+            "category=food&min_amount=5&sort_by=amount",
+            "SEARCH expenses USING INDEX ix_expenses_category_amount_id",
+        ),
+        (
+            "min_amount=5&max_amount=10&sort_by=amount",
+            "SEARCH expenses USING INDEX ix_expenses_amount_id",
+        ),
+        ("title_prefix=Gro", "SEARCH expenses USING INDEX ix_expenses_title"),
+    ],
+)
+def test_expense_listing_uses_index(explain, query, access_path):
+    """Test each supported filter/sort combination is served by an index, never a table scan."""
+    plan = explain(f"/api/expenses/?{query}")
+
+    access = [step for step in plan if "expenses" in step]
+    assert len(access) == 1
+    assert access[0].startswith(access_path)
+
+
+def test_expense_filtered_sort_avoids_temp_sort(explain):
+    """Test filtering and sorting on the same access path needs no separate sort step."""
+    plan = explain("/api/expenses/?category=food&date_from=2024-01-01&sort_by=expense_date")
+    assert not any("TEMP B-TREE" in step for step in plan)
+
+
+def test_expense_search_uses_full_text_index(explain):
+    """Test search matches through the FTS5 index and joins expenses by primary key."""
+    plan = explain("/api/expenses/search?q=grocery")
+
+    assert any(step.startswith("SCAN expenses_fts VIRTUAL TABLE INDEX") for step in plan)
+    assert any(step.startswith("SEARCH expenses USING INTEGER PRIMARY KEY") for step in plan)
+
+
+@pytest.mark.parametrize(
+    ("query", "access_path"),
+    [
+        # Either expense_date index serves the range
+        ("", "SEARCH expenses USING INDEX ix_expenses_expense_date"),
+        (
+            "&category=food&category=bills",
+            "SEARCH expenses USING INDEX ix_expenses_category_expense_date_id",
+        ),
+    ],
+)
+def test_expense_trends_use_date_range(explain, query, access_path):
+    """Test trend buckets are computed after an index range seek on expense_date."""
+    plan = explain(
+        f"/api/dashboard/trends?granularity=week&date_from=2024-01-01&date_to=2024-06-30{query}"
+    )
+
+    access = [step for step in plan if "expenses" in step]
+    assert len(access) == 1
+    assert access[0].startswith(access_path)
+    assert "expense_date>? AND expense_date<?" in access[0]
@@ -0,0 +1,166 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.rate_cache import RateCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Upstream:
+    """Mocked exchange rate API counting requests per base currency."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.requests = []
+        self.version = 0
+        self.fail = False
+        self.transport = httpx.MockTransport(self.handle)
+
+    async def handle(self, request):
+        base = request.url.path.rsplit("/", 1)[-1]
+        self.requests.append(base)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail:
+            return httpx.Response(503, text="Unavailable")
+        self.version += 1
+        return httpx.Response(200, json={"base": base, "rates": {"EUR": 0.8 + self.version}})
+
+    async def fetch(self, base):
+        async with httpx.AsyncClient(transport=self.transport) as client:
+            response = await client.get(f"https://rates.test/latest/{base}")
+            response.raise_for_status()
+            return response.json()
+
+
+async def _settle(cache):
+    await asyncio.gather(*cache._inflight.tasks(), return_exceptions=True)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+async def test_cache_hit_within_ttl(clock):
+    """Test fresh entries are served without another upstream request."""
+    upstream = Upstream()
+    cache = RateCache(ttl=60, stale_ttl=300, max_entries=8, clock=clock)
+
+    first = await cache.get("USD", upstream.fetch)
+    clock.now += 59
+    second = await cache.get("USD", upstream.fetch)
+
+    assert first == second
+    assert upstream.requests == ["USD"]
+    assert (cache.misses, cache.hits) == (1, 1)
+
+
+async def test_concurrent_misses_share_one_fetch(clock):
+    """Test concurrent misses for the same base collapse into one upstream request."""
+    upstream = Upstream(delay=0.01)
+    cache = RateCache(ttl=60, stale_ttl=300, max_entries=8, clock=clock)
+
+    results = await asyncio.gather(*(cache.get("USD", upstream.fetch) for _ in range(10)))
+
+    assert upstream.requests == ["USD"]
+    assert all(result == results[0] for result in results)
+
+
+async def test_stale_entry_served_while_refreshing(clock):
+    """Test stale entries are returned immediately while one background refresh runs."""
+    upstream = Upstream(delay=0.01)
+    cache = RateCache(ttl=60, stale_ttl=300, max_entries=8, clock=clock)
+    original = await cache.get("USD", upstream.fetch)
+
+    clock.now += 61
+    stale = await asyncio.gather(*(cache.get("USD", upstream.fetch) for _ in range(5)))
+    assert all(result == original for result in stale)
+    assert cache.refreshes == 1
+
+    await _settle(cache)
+    assert upstream.requests == ["USD", "USD"]
+    refreshed = await cache.get("USD", upstream.fetch)
+    assert refreshed["rates"]["EUR"] == pytest.approx(2.8)
+
+
+async def test_expired_entry_fetched_before_returning(clock):
+    """Test entries past the stale window are refetched synchronously."""
+    upstream = Upstream()
+    cache = RateCache(ttl=60, stale_ttl=300, max_entries=8, clock=clock)
+    await cache.get("USD", upstream.fetch)
+
+    clock.now += 361
+    refreshed = await cache.get("USD", upstream.fetch)
+
+    assert refreshed["rates"]["EUR"] == pytest.approx(2.8)
+    assert cache.misses == 2
+
+
+async def test_failed_refresh_keeps_stale_entry(clock):
+    """Test an upstream failure during background refresh keeps serving stale data."""
+    upstream = Upstream()
+    cache = RateCache(ttl=60, stale_ttl=300, max_entries=8, clock=clock)
+    original = await cache.get("USD", upstream.fetch)
+
+    upstream.fail = True
+    clock.now += 61
+    assert await cache.get("USD", upstream.fetch) == original
+    await _settle(cache)
+    assert await cache.get("USD", upstream.fetch) == original
+
+
+async def test_failed_miss_is_not_cached(clock):
+    """Test upstream errors on a miss propagate and are retried on the next call."""
+    upstream = Upstream()
+    upstream.fail = True
+    cache = RateCache(ttl=60, stale_ttl=300, max_entries=8, clock=clock)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await cache.get("USD", upstream.fetch)
+
+    upstream.fail = False
+    assert (await cache.get("USD", upstream.fetch))["base"] == "USD"
+    assert upstream.requests == ["USD", "USD"]
+
+
+async def test_lru_eviction(clock):
+    """Test the least recently used base is evicted past max_entries."""
+    upstream = Upstream()
+    cache = RateCache(ttl=60, stale_ttl=300, max_entries=2, clock=clock)
+
+    await cache.get("USD", upstream.fetch)
+    await cache.get("EUR", upstream.fetch)
+    await cache.get("USD", upstream.fetch)
+    await cache.get("GBP", upstream.fetch)
+    await cache.get("USD", upstream.fetch)
+    await cache.get("EUR", upstream.fetch)
+
+    assert upstream.requests == ["USD", "EUR", "GBP", "EUR"]
+
+
+def test_endpoints_use_cache(client):
+    """Test repeated conversions hit the upstream API once per base currency."""
+    from unittest.mock import AsyncMock, patch
+
+    mock_response = {"base": "USD", "date": "2024-01-01", "rates": {"EUR": 0.85}}
+    with patch(
+        "app.routers.exchange_rate._fetch_exchange_rates", new_callable=AsyncMock
+    ) as mock_fetch:
+        mock_fetch.return_value = mock_response
+        for _ in range(3):
+            response = client.get(
+                "/api/exchange/convert?amount=10&from_currency=usd&to_currency=EUR"
+            )
+            assert response.json()["converted_amount"] == 8.5
+        assert client.get("/api/exchange/rates/USD").status_code == 200
+
+    mock_fetch.assert_awaited_once_with("USD")
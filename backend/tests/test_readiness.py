@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+
+from app import readiness
+from app.config import settings
+from app.readiness import ReadinessProbe
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeCheck:
+    def __init__(self, fail: bool = False, delay: float = 0.0):
+        self.fail = fail
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("connection refused")
+        return {"calls": self.calls}
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _probe(clock, **checks) -> ReadinessProbe:
+    return ReadinessProbe(
+        checks=checks, critical={"database"}, interval=5.0, timeout=0.05, clock=clock
+    )
+
+
+async def test_status_is_served_from_cached_probes(clock):
+    """Test status calls reuse the last probe round until it goes stale."""
+    database = FakeCheck()
+    probe = _probe(clock, database=database)
+
+    await probe.status()
+    clock.now += 10
+    ready, body = await probe.status()
+
+    assert ready is True
+    assert database.calls == 1
+    assert body["checked_seconds_ago"] == 10
+    assert body["checks"]["database"]["ok"] is True
+
+    clock.now += 10
+    await probe.status()
+    assert database.calls == 2
+
+
+async def test_failing_critical_check_is_not_ready(clock):
+    """Test a failing critical dependency makes the instance not ready."""
+    probe = _probe(clock, database=FakeCheck(fail=True), upstream=FakeCheck())
+
+    ready, body = await probe.status()
+
+    assert ready is False
+    assert body["status"] == "not ready"
+    assert body["checks"]["database"] == {
+        "ok": False,
+        "error": "connection refused",
+        "latency_ms": body["checks"]["database"]["latency_ms"],
+    }
+
+
+async def test_failing_optional_check_is_reported_but_ready(clock):
+    """Test non-critical dependencies are reported without failing readiness."""
+    probe = _probe(clock, database=FakeCheck(), upstream=FakeCheck(fail=True))
+
+    ready, body = await probe.status()
+
+    assert ready is True
+    assert body["checks"]["upstream"]["ok"] is False
+
+
+async def test_slow_check_times_out(clock):
+    """Test a hanging dependency is reported as failed after the probe timeout."""
+    probe = _probe(clock, database=FakeCheck(delay=1.0))
+
+    ready, body = await probe.status()
+
+    assert ready is False
+    assert body["checks"]["database"]["error"] == "TimeoutError"
+
+
+async def test_concurrent_callers_share_one_refresh(clock):
+    """Test simultaneous status calls with no results trigger a single probe round."""
+    database = FakeCheck(delay=0.01)
+    probe = _probe(clock, database=database)
+
+    await asyncio.gather(*(probe.status() for _ in range(10)))
+
+    assert database.calls == 1
+
+
+async def test_background_loop_refreshes_results(clock):
+    """Test the background loop keeps probing until stopped."""
+    database = FakeCheck()
+    probe = ReadinessProbe(
+        checks={"database": database}, critical={"database"}, interval=0.01, timeout=1.0
+    )
+
+    probe.start()
+    await asyncio.sleep(0.05)
+    await probe.stop()
+
+    assert database.calls >= 2
+
+
+async def test_pool_check_fails_when_exhausted(monkeypatch):
+    """Test the pool probe fails once every connection is checked out."""
+    assert (await readiness.check_pool())["pools"]["sync"]["checked_out"] == 0
+
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 0)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 0)
+    with pytest.raises(RuntimeError, match="pool exhausted"):
+        await readiness.check_pool()
+
+
+def test_ready_endpoint(client, monkeypatch, clock):
+    """Test /ready maps the probe verdict onto 200/503."""
+    monkeypatch.setattr(readiness, "probe", _probe(clock, database=FakeCheck()))
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+    monkeypatch.setattr(readiness, "probe", _probe(clock, database=FakeCheck(fail=True)))
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["checks"]["database"]["ok"] is False
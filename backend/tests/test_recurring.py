@@ -0,0 +1,163 @@
+import asyncio
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from app import models, rollups
+from app.recurring import RecurringScheduler, materialize_due, occurrence_date
+from tests.conftest import TestingSessionLocal, engine
+
+
+def _rule(**overrides) -> models.RecurringExpense:
+    fields = {
+        "title": "Rent",
+        "amount": 1200.0,
+        "category": models.ExpenseCategory.BILLS,
+        "frequency": models.RecurrenceFrequency.MONTHLY,
+        "interval": 1,
+        "start_date": date(2024, 1, 31),
+        "end_date": None,
+        "count": None,
+    }
+    fields.update(overrides)
+    return models.RecurringExpense(**fields)
+
+
+def _create(client, **overrides):
+    rule_data = {
+        "title": "Gym",
+        "amount": 30.0,
+        "category": "health",
+        "frequency": "weekly",
+        "start_date": str(date.today()),
+    }
+    rule_data.update(overrides)
+    return client.post("/api/recurring-expenses/", json=rule_data)
+
+
+def _posted(db_session, rule_id):
+    return sorted(
+        expense.expense_date
+        for expense in db_session.query(models.Expense).filter(
+            models.Expense.recurring_expense_id == rule_id
+        )
+    )
+
+
+def test_occurrence_dates_follow_the_rule():
+    """Test month-end anchoring, intervals and the UNTIL/COUNT limits."""
+    monthly = _rule()
+    assert [occurrence_date(monthly, i) for i in range(4)] == [
+        date(2024, 1, 31),
+        date(2024, 2, 29),
+        date(2024, 3, 31),
+        date(2024, 4, 30),
+    ]
+    fortnightly = _rule(frequency=models.RecurrenceFrequency.WEEKLY, interval=2)
+    assert occurrence_date(fortnightly, 3) == date(2024, 3, 13)
+    yearly = _rule(frequency=models.RecurrenceFrequency.YEARLY, start_date=date(2024, 2, 29))
+    assert occurrence_date(yearly, 1) == date(2025, 2, 28)
+    assert occurrence_date(_rule(count=2), 2) is None
+    assert occurrence_date(_rule(end_date=date(2024, 3, 30)), 2) is None
+
+
+def test_create_posts_past_occurrences(client, db_session):
+    """Test creating a rule posts every occurrence from start_date up to today."""
+    start = date.today() - timedelta(days=20)
+    response = _create(client, frequency="weekly", start_date=str(start))
+    assert response.status_code == 201
+    rule = response.json()
+
+    assert _posted(db_session, rule["id"]) == [start + timedelta(weeks=i) for i in range(3)]
+    assert rule["next_date"] == str(start + timedelta(weeks=3))
+    listed = client.get("/api/expenses/").json()
+    assert {expense["recurring_expense_id"] for expense in listed} == {rule["id"]}
+    assert client.get("/api/dashboard/stats").json()["total_expenses"] == 90.0
+    assert rollups.verify(db_session) == []
+
+
+def test_create_posts_a_bounded_backfill(client, db_session, monkeypatch):
+    """Test creating a rule far in the past posts a capped number of occurrences right away."""
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "RECURRING_MAX_OCCURRENCES", 10)
+    start = date.today() - timedelta(days=24)
+    rule = _create(client, frequency="daily", start_date=str(start)).json()
+
+    assert _posted(db_session, rule["id"]) == [start + timedelta(days=i) for i in range(10)]
+    assert rule["next_date"] == str(start + timedelta(days=10))
+
+    # The scheduler catches up on the rest, still at most 10 per transaction
+    assert materialize_due(db_session, date.today()) == 15
+    assert len(_posted(db_session, rule["id"])) == 25
+    assert rollups.verify(db_session) == []
+
+
+def test_create_validates_schedule(client):
+    """Test invalid schedules are rejected."""
+    assert _create(client, interval=0).status_code == 422
+    assert _create(client, frequency="hourly").status_code == 422
+    assert _create(client, end_date=str(date.today() - timedelta(days=1))).status_code == 422
+
+
+def test_materialize_is_idempotent_after_a_crash(client, db_session):
+    """Test rerunning after expenses were posted but the rule did not advance adds nothing."""
+    start = date.today() - timedelta(days=3)
+    rule_id = _create(client, frequency="daily", start_date=str(start)).json()["id"]
+    assert len(_posted(db_session, rule_id)) == 4
+
+    # Simulate a run that posted its expenses but lost the rule's progress
+    rule = db_session.get(models.RecurringExpense, rule_id)
+    rule.next_index, rule.next_date = 0, start
+    db_session.commit()
+
+    assert materialize_due(db_session, date.today()) == 0
+    assert len(_posted(db_session, rule_id)) == 4
+    assert db_session.get(models.RecurringExpense, rule_id).next_index == 4
+    assert rollups.verify(db_session) == []
+
+
+def test_scheduler_catches_up_in_one_insert(client, db_session):
+    """Test missed periods of every due rule are posted with a single INSERT."""
+    today = date.today()
+    monthly = _create(client, frequency="monthly", start_date=str(today)).json()["id"]
+    daily = _create(client, frequency="daily", start_date=str(today), count=5).json()["id"]
+    _create(client, frequency="yearly", start_date=str(today))
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO expenses "):
+            statements.append(statement)
+
+    scheduler = RecurringScheduler(
+        interval=60, session_factory=TestingSessionLocal, today=lambda: today + timedelta(days=70)
+    )
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        created = asyncio.run(scheduler.run_once())
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert len(statements) == 1
+    # Two more months and the remaining four days of the count-limited rule
+    assert created == 6
+    db_session.expire_all()
+    assert len(_posted(db_session, monthly)) == 3
+    assert len(_posted(db_session, daily)) == 5
+    assert db_session.get(models.RecurringExpense, daily).next_date is None
+    assert asyncio.run(scheduler.run_once()) == 0
+    assert rollups.verify(db_session) == []
+
+
+def test_delete_rule_keeps_posted_expenses(client, db_session):
+    """Test deleting a rule detaches, but keeps, the expenses it posted."""
+    rule_id = _create(client).json()["id"]
+    assert client.get(f"/api/recurring-expenses/{rule_id}").status_code == 200
+
+    assert client.delete(f"/api/recurring-expenses/{rule_id}").status_code == 204
+    assert client.get(f"/api/recurring-expenses/{rule_id}").status_code == 404
+    assert client.delete(f"/api/recurring-expenses/{rule_id}").status_code == 404
+    listed = client.get("/api/expenses/").json()
+    assert [expense["recurring_expense_id"] for expense in listed] == [None]
+    assert client.get("/api/recurring-expenses/").json() == []
@@ -0,0 +1,109 @@
+import sys
+import threading
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+
+from app import request_metrics
+from tests.conftest import engine
+
+
+@pytest.fixture
+def metrics_client(client):
+    """Client with fresh request metrics and query hooks on the test engine."""
+    request_metrics.reset()
+    request_metrics.instrument_engine(engine)
+    yield client
+    event.remove(engine, "before_cursor_execute", request_metrics._before_cursor_execute)
+    event.remove(engine, "after_cursor_execute", request_metrics._after_cursor_execute)
+    request_metrics.reset()
+
+
+def _samples(text: str) -> dict[str, float]:
+    return {
+        line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+        for line in text.splitlines()
+        if line and not line.startswith("#")
+    }
+
+
+def test_metrics_are_labelled_by_route_template(metrics_client):
+    """Test requests are counted per route template rather than per raw path."""
+    expense = {
+        "title": "Lunch",
+        "amount": 10,
+        "category": "food",
+        "expense_date": str(date.today()),
+    }
+    ids = [metrics_client.post("/api/expenses/", json=expense).json()["id"] for _ in range(2)]
+    for expense_id in ids:
+        metrics_client.get(f"/api/expenses/{expense_id}")
+    metrics_client.get("/api/expenses/999999")
+    metrics_client.get("/no/such/route")
+
+    response = metrics_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = _samples(response.text)
+    route = 'route="/api/expenses/{expense_id}"'
+    assert samples[f'http_requests_total{{method="GET",{route},status="200"}}'] == 2
+    assert samples[f'http_requests_total{{method="GET",{route},status="404"}}'] == 1
+    assert samples[f'http_request_duration_seconds_count{{method="GET",{route}}}'] == 3
+    assert samples[f'http_request_duration_seconds_bucket{{method="GET",{route},le="+Inf"}}'] == 3
+    assert samples[f'http_response_size_bytes_sum{{method="GET",{route}}}'] > 0
+    assert samples['http_requests_total{method="GET",route="unmatched",status="404"}'] == 1
+    assert samples["http_requests_in_flight"] == 1
+
+
+def test_metrics_attribute_queries_to_routes(metrics_client):
+    """Test database queries and time are attributed to the route that issued them."""
+    metrics_client.get("/api/expenses/")
+    metrics_client.get("/api/expenses/")
+
+    samples = _samples(metrics_client.get("/metrics").text)
+
+    # Each request reads the ETag version, then the page
+    assert samples['db_queries_total{route="/api/expenses/"}'] == 4
+    assert samples['db_query_duration_seconds_total{route="/api/expenses/"}'] > 0
+    assert samples['http_request_db_queries_sum{method="GET",route="/api/expenses/"}'] == 4
+    assert (
+        samples['http_request_db_queries_bucket{method="GET",route="/api/expenses/",le="0"}'] == 0
+    )
+
+
+def test_metrics_include_pool_gauges(metrics_client):
+    """Test pool saturation is exported alongside the request metrics."""
+    samples = _samples(metrics_client.get("/metrics").text)
+
+    assert 'db_pool_checked_out{engine="sync"}' in samples
+    assert 'db_pool_wait_seconds_bucket{engine="sync",le="+Inf"}' in samples
+
+
+def test_background_queries_from_worker_threads_are_all_counted():
+    """Test queries outside requests, run on several threads at once, lose no increments."""
+    request_metrics.reset()
+    previous = sys.getswitchinterval()
+    # Switch threads as often as possible to expose unlocked read-modify-writes
+    sys.setswitchinterval(1e-6)
+    context = SimpleNamespace()
+
+    def run_queries():
+        for _ in range(20_000):
+            request_metrics._before_cursor_execute(None, None, "", None, context, False)
+            request_metrics._after_cursor_execute(None, None, "", None, context, False)
+
+    try:
+        threads = [threading.Thread(target=run_queries) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(previous)
+
+    samples = _samples(request_metrics.render())
+    assert samples['db_queries_total{route="background"}'] == 80_000
+    request_metrics.reset()
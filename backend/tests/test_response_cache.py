@@ -0,0 +1,164 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import date
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.aggregation import compute_dashboard_stats
+from app.database import get_session_factory
+from app.main import app
+from app.response_cache import MemoryBackend, ResponseCache
+from tests.conftest import TestingSessionLocal
+
+EXPENSE = {"title": "Lunch", "amount": 10.0, "category": "food", "expense_date": str(date.today())}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _cache(max_entries: int = 8, clock=None) -> ResponseCache:
+    return ResponseCache(MemoryBackend(max_entries, clock or FakeClock()), ttl=60.0)
+
+
+async def test_hit_after_miss():
+    """Test a computed body is served from the cache afterwards."""
+    cache = _cache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return b"body"
+
+    assert await cache.get("k", compute) == b"body"
+    assert await cache.get("k", compute) == b"body"
+    assert len(calls) == 1
+    assert cache.stats() == {"hits": 1, "misses": 1, "coalesced": 0, "invalidations": 0}
+
+
+async def test_entries_expire_after_ttl():
+    """Test the TTL safety net recomputes old entries."""
+    clock = FakeClock()
+    cache = _cache(clock=clock)
+
+    async def compute():
+        return str(clock.now).encode()
+
+    first = await cache.get("k", compute)
+    clock.now += 61
+    assert await cache.get("k", compute) != first
+
+
+async def test_least_recently_used_entries_are_evicted():
+    """Test the memory backend is bounded."""
+    backend = MemoryBackend(max_entries=2)
+    await backend.set("a", b"1", 60)
+    await backend.set("b", b"2", 60)
+    await backend.get("a")
+    await backend.set("c", b"3", 60)
+
+    assert await backend.get("b") is None
+    assert await backend.get("a") == b"1"
+
+
+async def test_concurrent_misses_share_one_computation():
+    """Test simultaneous misses for a key coalesce into a single computation."""
+    cache = _cache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return b"body"
+
+    results = await asyncio.gather(*(cache.get("k", compute) for _ in range(10)))
+
+    assert results == [b"body"] * 10
+    assert len(calls) == 1
+    assert cache.coalesced == 9
+
+
+async def test_computation_in_flight_during_a_write_is_not_served_after_it():
+    """Test a body computed for the old version never answers reads of the new one."""
+    cache = _cache()
+    release = asyncio.Event()
+
+    async def slow_old():
+        await release.wait()
+        return b"old"
+
+    async def fresh():
+        return b"new"
+
+    old_read = asyncio.ensure_future(cache.get('"1"', slow_old))
+    await asyncio.sleep(0)
+    # A write commits (version 1 -> 2) and invalidates while the old read is computing
+    await cache.invalidate()
+    new_read = await cache.get('"2"', fresh)
+    release.set()
+
+    assert await old_read == b"old"
+    assert new_read == b"new"
+    assert await cache.get('"2"', fresh) == b"new"
+
+
+def test_dashboard_is_cached_between_writes(client):
+    """Test repeated dashboard reads are served from the cache until a write."""
+    client.post("/api/expenses/", json=EXPENSE)
+    first = client.get("/api/dashboard/stats")
+    second = client.get("/api/dashboard/stats")
+
+    assert first.content == second.content
+    assert client.get("/metrics/cache").json()["dashboard"]["hits"] == 1
+
+
+def test_write_is_never_followed_by_a_stale_read(client):
+    """Test every write is visible to the very next dashboard read."""
+    expense_id = None
+    for i in range(1, 11):
+        created = client.post("/api/expenses/", json=EXPENSE).json()
+        expense_id = created["id"]
+        assert client.get("/api/dashboard/stats").json()["total_count"] == i
+        client.get("/api/dashboard/stats")
+
+    client.patch(f"/api/expenses/{expense_id}", json={"amount": 110.0})
+    assert client.get("/api/dashboard/stats").json()["total_expenses"] == 200.0
+
+    client.delete(f"/api/expenses/{expense_id}")
+    assert client.get("/api/dashboard/stats").json()["total_count"] == 9
+
+    client.post("/api/expenses/bulk", json=[EXPENSE] * 3)
+    assert client.get("/api/dashboard/stats").json()["total_count"] == 12
+
+
+def test_cached_body_matches_uncached_serialization(client):
+    """Test cached bodies are byte-identical to FastAPI's default response rendering."""
+    client.post("/api/expenses/", json=EXPENSE)
+    body = client.get("/api/dashboard/stats").content
+
+    with TestingSessionLocal() as db:
+        stats = compute_dashboard_stats(db)
+    assert body == JSONResponse(jsonable_encoder(stats)).body
+
+
+def test_shared_computation_uses_a_session_of_its_own(client):
+    """Test the coalesced dashboard computation does not borrow the request's session."""
+    client.post("/api/expenses/", json=EXPENSE)
+    opened = []
+
+    @asynccontextmanager
+    async def own_session():
+        with TestingSessionLocal() as db:
+            opened.append(db)
+            yield db
+
+    app.dependency_overrides[get_session_factory] = lambda: own_session
+    assert client.get("/api/dashboard/stats").json()["total_count"] == 1
+    assert len(opened) == 1
+    assert client.get("/api/dashboard/stats").status_code == 200
+    assert len(opened) == 1
@@ -0,0 +1,117 @@
+from datetime import date, timedelta
+
+from app import models, rollups
+
+
+def _create(client, **overrides):
+    expense_data = {
+        "title": "Rollup Expense",
+        "amount": 10.00,
+        "category": "food",
+        "expense_date": str(date.today()),
+    }
+    expense_data.update(overrides)
+    return client.post("/api/expenses/", json=expense_data).json()["id"]
+
+
+def _monthly(db_session):
+    """Monthly rollup rows as {(year, month, category): (total in cents, count)}."""
+    return {
+        (row.year, row.month, row.category.value): (row.total, row.count)
+        for row in db_session.query(models.MonthlyRollup)
+        if row.count
+    }
+
+
+def test_rollups_track_create(client, db_session):
+    """Test creating expenses updates the rollup tables."""
+    today = date.today()
+    _create(client, amount=10.00)
+    _create(client, amount=15.00)
+    _create(client, amount=5.00, category="bills")
+
+    assert _monthly(db_session) == {
+        (today.year, today.month, "food"): (2500, 2),
+        (today.year, today.month, "bills"): (500, 1),
+    }
+    assert rollups.verify(db_session) == []
+
+
+def test_rollups_track_category_and_date_moves(client, db_session):
+    """Test updates moving an expense between categories and months."""
+    today = date.today()
+    moved_to = today.replace(day=1) - timedelta(days=1)
+    expense_id = _create(client, amount=20.00)
+
+    client.put(
+        f"/api/expenses/{expense_id}",
+        json={"category": "transport", "expense_date": str(moved_to), "amount": 30.00},
+    )
+
+    assert _monthly(db_session) == {(moved_to.year, moved_to.month, "transport"): (3000, 1)}
+    assert rollups.verify(db_session) == []
+
+
+def test_rollups_track_delete(client, db_session):
+    """Test deleting an expense removes it from the rollups."""
+    expense_id = _create(client, amount=20.00)
+    _create(client, amount=5.00)
+
+    client.delete(f"/api/expenses/{expense_id}")
+
+    today = date.today()
+    assert _monthly(db_session) == {(today.year, today.month, "food"): (500, 1)}
+    assert rollups.verify(db_session) == []
+
+
+def test_verify_reports_drift_and_rebuild_fixes_it(client, db_session):
+    """Test verify detects drifted rollups and rebuild recomputes them."""
+    _create(client, amount=10.00)
+    _create(client, amount=7.50, category="health", expense_date="2024-03-15")
+
+    db_session.query(models.CategoryRollup).filter(
+        models.CategoryRollup.category == models.ExpenseCategory.FOOD
+    ).update({"total": 9900})
+    db_session.query(models.MonthlyRollup).filter(models.MonthlyRollup.year == 2024).delete()
+    db_session.commit()
+
+    drift = rollups.verify(db_session)
+    assert len(drift) == 2
+    assert any("food" in line and "found total=99.00" in line for line in drift)
+
+    rollups.rebuild(db_session)
+    db_session.commit()
+
+    assert rollups.verify(db_session) == []
+    stats = client.get("/api/dashboard/stats").json()
+    assert stats["total_expenses"] == 17.50
+    assert stats["category_breakdown"] == {"food": 10.00, "health": 7.50}
+
+
+def test_dashboard_trends_include_partial_cutoff_month(client):
+    """Test the partially covered first month of the trend window is counted exactly."""
+    today = date.today()
+    cutoff = today - timedelta(days=180)
+    if cutoff.day == 1:
+        return
+    _create(client, amount=12.00, expense_date=str(cutoff))
+    _create(client, amount=99.00, expense_date=str(cutoff - timedelta(days=1)))
+
+    trends = client.get("/api/dashboard/stats").json()["monthly_trends"]
+    assert trends[0] == {"year": cutoff.year, "month": cutoff.month, "total": 12.00, "count": 1}
+
+
+def test_totals_are_exact_integer_cents(client, db_session):
+    """Test amounts that drift as float sums add up exactly through the cents columns."""
+    for _ in range(10):
+        _create(client, amount=0.10)
+    _create(client, amount=0.20, category="bills")
+    _create(client, amount=1.005, category="bills")
+
+    assert sum([0.10] * 10) != 1.0
+    stats = client.get("/api/dashboard/stats").json()
+    assert stats["category_breakdown"] == {"food": 1.0, "bills": 1.21}
+    assert stats["total_expenses"] == 2.21
+    today = date.today()
+    assert _monthly(db_session)[(today.year, today.month, "food")] == (100, 10)
+    assert rollups.verify(db_session) == []
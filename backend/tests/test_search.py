@@ -0,0 +1,91 @@
+from datetime import date
+
+
+def _create(client, title, description=None, **overrides):
+    expense_data = {
+        "title": title,
+        "description": description,
+        "amount": 10.0,
+        "category": "food",
+        "expense_date": str(date.today()),
+    }
+    expense_data.update(overrides)
+    return client.post("/api/expenses/", json=expense_data).json()["id"]
+
+
+def _search(client, q, **params):
+    response = client.get("/api/expenses/search", params={"q": q, **params})
+    assert response.status_code == 200
+    return response
+
+
+def _ids(response):
+    return [expense["id"] for expense in response.json()]
+
+
+def test_search_matches_titles_and_descriptions(client):
+    """Test every term must match somewhere in the title or description, with stemming."""
+    groceries = _create(client, "Groceries", "weekly shop at the market")
+    market = _create(client, "Market lunch", "street food")
+    _create(client, "Rent")
+
+    assert set(_ids(_search(client, "grocery"))) == {groceries}
+    assert set(_ids(_search(client, "market"))) == {groceries, market}
+    assert _ids(_search(client, "market shop")) == [groceries]
+    # Punctuation and query operators are treated as plain text
+    assert _ids(_search(client, 'market" OR "rent')) == []
+    assert _search(client, "!!!").json() == []
+
+
+def test_search_ranks_better_matches_first(client):
+    """Test results are ordered by relevance rather than recency."""
+    strong = _create(client, "Coffee beans", "coffee coffee for the coffee machine")
+    _create(client, "Stationery", "pens, paper and a coffee mug")
+
+    assert _ids(_search(client, "coffee"))[0] == strong
+
+
+def test_search_pages_with_cursor(client):
+    """Test cursor pages walk every match exactly once, in rank order."""
+    for i in range(7):
+        _create(client, f"Taxi ride {i}", "taxi " * (i % 3 + 1))
+    _create(client, "Bus ticket")
+
+    first = _search(client, "taxi")
+    ids, cursor = [], None
+    while True:
+        params = {"limit": 3} if cursor is None else {"limit": 3, "cursor": cursor}
+        page = _search(client, "taxi", **params)
+        ids.extend(_ids(page))
+        cursor = page.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+
+    assert ids == _ids(first)
+    assert len(set(ids)) == 7
+
+
+def test_search_combines_with_filters(client):
+    """Test list filters narrow the search matches."""
+    _create(client, "Train ticket", category="transport")
+    food = _create(client, "Train station sandwich", category="food")
+
+    assert _ids(_search(client, "train", category="food")) == [food]
+
+
+def test_search_follows_updates_and_deletes(client):
+    """Test the full-text index is kept in sync with the expense rows."""
+    expense_id = _create(client, "Cinema")
+    client.patch(f"/api/expenses/{expense_id}", json={"title": "Theatre"})
+    assert _search(client, "cinema").json() == []
+    assert _ids(_search(client, "theatre")) == [expense_id]
+
+    client.delete(f"/api/expenses/{expense_id}")
+    assert _search(client, "theatre").json() == []
+
+
+def test_search_validates_input(client):
+    """Test missing queries and foreign cursors are rejected."""
+    assert client.get("/api/expenses/search").status_code == 422
+    list_cursor_response = client.get("/api/expenses/search?q=x&cursor=not-a-cursor")
+    assert list_cursor_response.status_code == 400